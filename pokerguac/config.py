@@ -1,14 +1,14 @@
 from typing import Union, Literal, TypedDict, Mapping, Sequence
-from .poker import PokerGameType
+from .poker.components.constants import PokerGameType
 
 BlindManagerType = Literal["hand", "time"]
 
 
 class TableGameConfig(TypedDict):
-    big_blind: float
-    small_blind: float
-    min_buy_in: float
-    max_buy_in: float
+    big_blind: int
+    small_blind: int
+    min_buy_in: int
+    max_buy_in: int
     game_type: PokerGameType
 
 
@@ -7,6 +7,7 @@ from ..poker import (
     MAX_NUM_PLAYERS,
     MIN_BLIND_LEVELS,
 )
+from ..poker.components.chips import Chips
 from ..config import BlindManagerType, TournamentConfig
 
 __all__ = [
@@ -19,6 +20,8 @@ __all__ = [
 
 
 class BlindManager(ABC):
+    blind: Chips
+
     def __init__(
         self,
         target_duration: float,
@@ -89,8 +92,7 @@ class BlindManager(ABC):
 
     def init_blind(self):
         blind = self.starting_stack / self.start_effective_stack
-        num_digits = max(int(math.floor(math.log10(self.blind))) - 1, 0)
-        start_blind = round(blind / (10**num_digits)) * (10**num_digits)
+        start_blind = self._round_blind(blind)
         num_target_levels = math.ceil(self.target_duration / self.blind_period)
         # Rule of thumb is that tournament will end when BB = 7% of chips in play
         target_final_blind = self.starting_stack * self.target_num_entries * 0.07
@@ -100,15 +102,19 @@ class BlindManager(ABC):
         )
         self.blind = start_blind
 
+    @staticmethod
+    def _round_blind(blind: float) -> Chips:
+        """
+        Round a blind to its two leading digits in whole chips
+        """
+        num_digits = max(int(math.floor(math.log10(blind))) - 1, 0)
+        return round(blind / (10**num_digits)) * (10**num_digits)
+
     def update_blind(self):
-        num_digits = max(int(math.floor(math.log10(self.blind))) - 1, 0)
-        self.blind = round(self.blind * self.ratio / (10**num_digits)) * (
-            10**num_digits
-        )
+        self.blind = self._round_blind(self.blind * self.ratio)
 
-    def next_blind(self) -> Tuple[float, float]:
-        num_digits = max(int(math.floor(math.log10(self.blind))) - 1, 0)
-        blind = round(self.blind * self.ratio / (10**num_digits)) * (10**num_digits)
+    def next_blind(self) -> Tuple[Chips, Chips]:
+        blind = self._round_blind(self.blind * self.ratio)
         return blind, blind // 2
 
 
@@ -1,4 +1,7 @@
 import math
+from typing import List
+
+from ..poker.components.chips import Chips
 
 
 def gamma_fn(x: int):
@@ -33,8 +36,32 @@ def chi_square_pdf(k: int, x: float):
         return x ** (k / 2 - 1) * math.exp(-x / 2) / 2 ** (k / 2) / gamma_out
 
 
-def get_prize_pool(total_prize_pool: float, buy_in: float, num_players: int):
-    allocated_prize_pool = []
+def split_by_largest_remainder(total: Chips, weights: List[float]) -> List[Chips]:
+    """
+    Split total chips proportionally to weights. Every share gets the floor of its
+    exact quota and the chips left over go one each to the largest remainders
+    (earlier shares first on ties), so the shares sum to total exactly.
+    """
+    total_weight = sum(weights)
+    assert total_weight > 0, weights
+    quotas = [total * weight / total_weight for weight in weights]
+    shares = [math.floor(quota) for quota in quotas]
+    # sorted is stable, so ties keep the earlier share first
+    by_remainder = sorted(range(len(quotas)), key=lambda i: shares[i] - quotas[i])
+    for i in by_remainder[: total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def get_prize_pool(
+    total_prize_pool: Chips, buy_in: Chips, num_players: int
+) -> List[Chips]:
+    """
+    Prizes of the paid ranks (first place first). Ranks are paid while their
+    chi square share of the prize pool is at least a buy in, and the rest of the
+    pool is spread over the paid ranks in proportion to their prizes.
+    """
+    allocated_prize_pool: List[float] = []
     rank = 1
     k = 3
 
@@ -53,9 +80,12 @@ def get_prize_pool(total_prize_pool: float, buy_in: float, num_players: int):
     left_prize_pool = total_prize_pool - sum(allocated_prize_pool)
     ratios = [prize / total_prize_pool for prize in allocated_prize_pool]
     ratios[0] += 1 - sum(ratios)
-    allocated_prize_pool = [
-        ratio * left_prize_pool + prize
-        for ratio, prize in zip(ratios, allocated_prize_pool)
-    ]
-    assert sum(allocated_prize_pool) == total_prize_pool
-    return allocated_prize_pool
+    prizes = split_by_largest_remainder(
+        total_prize_pool,
+        [
+            ratio * left_prize_pool + prize
+            for ratio, prize in zip(ratios, allocated_prize_pool)
+        ],
+    )
+    assert sum(prizes) == total_prize_pool
+    return prizes
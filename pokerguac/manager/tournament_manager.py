@@ -1,3 +1,4 @@
+import math
 import time
 
 from ..poker import (
@@ -7,6 +8,7 @@ from ..poker import (
     MAX_NUM_PLAYERS,
     MIN_BLIND_LEVELS,
 )
+from ..poker.components.chips import Chips
 from typing import List, Dict, Optional, Tuple, TypedDict
 from .prize_pool import get_prize_pool
 from .poker_manager import PokerGameManager, GameConfig
@@ -26,9 +28,9 @@ class TournamentGameStatus(TypedDict):
     cfg: TableGameConfig
     num_entries: int
     num_players: int
-    average_stack: float
+    average_stack: Chips  # rounded down
     chip_leader: PokerPlayer
-    next_blind: Tuple[float, float]  # Bigblind, Smallblind
+    next_blind: Tuple[Chips, Chips]  # Bigblind, Smallblind
     until_next_blind: Tuple[float, str]  # numeric value, unit
 
 
@@ -39,6 +41,7 @@ class TournamentManager(PokerGameManager):
     waitlist: Dict[TableGameConfig, List[PokerPlayer]]
     blind_manager: Optional[BlindManager]
     player_ranks: List[PokerPlayer]
+    prize_pool: List[Chips]
     cfg: TournamentConfig
     table_cfg: TableGameConfig
 
@@ -95,8 +98,12 @@ class TournamentManager(PokerGameManager):
         del self.waitlist[old_blind]
 
     def compute_prize_pool(self) -> None:
+        # Whole chips of the pool, the fraction stays with the house
+        total_prize_pool = math.floor(
+            self.buy_in * self.num_entries * self.cfg["prize_pool_ratio"]
+        )
         self.prize_pool = get_prize_pool(
-            self.buy_in * self.num_entries * self.cfg["prize_pool_ratio"],
+            total_prize_pool,
             self.buy_in,
             len(self.player_ranks),
         )
@@ -116,7 +123,7 @@ class TournamentManager(PokerGameManager):
                         chip_leader = player
         assert chip_leader is not None
         assert self.blind_manager is not None
-        average_stack = total_stack / num_players
+        average_stack = total_stack // num_players
         if isinstance(self.blind_manager, HandBlindManager):
             game_progress = self.hand_num
         else:
@@ -1,27 +1,22 @@
-from enum import Enum
 from .agents import PokerAgent, build_action_agent, ALL_AGENT_TYPES, AgentType
 from .poker_player import PokerPlayer
 from .poker_table import PokerTable
 from .components import MIN_NUM_PLAYERS, MAX_NUM_PLAYERS, MIN_BLIND_LEVELS
+from .components.constants import PokerGameType, GAME_TYPE_TO_NUM_PLAYER_CARDS
 
 from typing import List, Optional
 
 
-class PokerGameType(Enum):
-    HOLDEM = 1
-    PLO = 2
-    PLO_HILO = 3
-
-
 def poker_tournament_init(
     player_names: List[str],
     agent_types: List[AgentType],
     num_players: int,
-    small_blind: float = 1,
-    big_blind: float = 3,
+    small_blind: int = 1,
+    big_blind: int = 3,
     max_num_buy_ins: int = 1,
-    tournament_buy_in: float = 300,
+    tournament_buy_in: int = 300,
     time_bank: Optional[float] = None,
+    game_type: PokerGameType = PokerGameType.HOLDEM,
 ):
     """
     Currently only supports one table
@@ -46,6 +41,8 @@ def poker_tournament_init(
         small_blind=small_blind,
         min_buy_in=tournament_buy_in,
         max_buy_in=tournament_buy_in,
+        num_player_cards=GAME_TYPE_TO_NUM_PLAYER_CARDS[game_type],
+        game_type=game_type,
     )
 
     for player in players:
@@ -58,13 +55,14 @@ def poker_tournament_init(
 
 def poker_cache_game_init(
     player_names: List[str],
-    player_bank_rolls: List[float],
+    player_bank_rolls: List[int],
     agent_types: List[AgentType],
     num_players: int,
-    small_blind: float = 1,
-    big_blind: float = 3,
-    min_buy_in: float = 100,
-    max_buy_in: float = 300,
+    small_blind: int = 1,
+    big_blind: int = 3,
+    min_buy_in: int = 100,
+    max_buy_in: int = 300,
+    game_type: PokerGameType = PokerGameType.HOLDEM,
 ):
     """
     Currently only supports one table
@@ -88,6 +86,8 @@ def poker_cache_game_init(
         small_blind=small_blind,
         min_buy_in=min_buy_in,
         max_buy_in=max_buy_in,
+        num_player_cards=GAME_TYPE_TO_NUM_PLAYER_CARDS[game_type],
+        game_type=game_type,
     )
 
     for player in players:
@@ -1,8 +1,9 @@
 import numpy as np
-from typing import Tuple, List, Dict
+from typing import Tuple, List
 
 from .poker_agent import PokerAgent
-from ..components import PlayerAction, PlayerPosition, PokerStage, PokerBoard
+from ..components.action_log import ActionLog
+from ..components import PlayerAction, PlayerPosition, PokerBoard, Chips
 
 
 class AllInAgent(PokerAgent):
@@ -13,13 +14,14 @@ class AllInAgent(PokerAgent):
         self,
         board: PokerBoard,
         per_player_bet: np.ndarray,
-        per_player_action: Dict[PokerStage, List[List[Tuple[PlayerAction, float]]]],
-        player_stacks: List[float],
+        max_bet: Chips,
+        action_log: ActionLog,
+        player_stacks: List[Chips],
         player_pos: PlayerPosition,
         player_idx: int,
-        big_blind: float,
-    ) -> Tuple[float, PlayerAction]:
-        min_bet = np.max(per_player_bet) - per_player_bet[player_idx]
+        big_blind: Chips,
+    ) -> Tuple[Chips, PlayerAction]:
+        min_bet = max_bet - int(per_player_bet[player_idx])
         player_bet = player_stacks[player_idx]
         if min_bet >= player_bet:
             action = PlayerAction.CALL
@@ -1,9 +1,10 @@
 import numpy as np
-from typing import Tuple, List, Dict
+from typing import Tuple, List
 
 from .poker_agent import PokerAgent
 from ..components.card import PokerBoard
-from ..components import PlayerAction, PokerStage, PlayerPosition
+from ..components.action_log import ActionLog
+from ..components import PlayerAction, PlayerPosition, Chips
 
 
 class CallingAgent(PokerAgent):
@@ -14,14 +15,15 @@ class CallingAgent(PokerAgent):
         self,
         board: PokerBoard,
         per_player_bet: np.ndarray,
-        per_player_action: Dict[PokerStage, List[List[Tuple[PlayerAction, float]]]],
-        player_stacks: List[float],
+        max_bet: Chips,
+        action_log: ActionLog,
+        player_stacks: List[Chips],
         player_pos: PlayerPosition,
         player_idx: int,
-        big_blind: float,
-    ) -> Tuple[float, PlayerAction]:
+        big_blind: Chips,
+    ) -> Tuple[Chips, PlayerAction]:
         action = PlayerAction.CALL
-        bet = np.max(per_player_bet) - per_player_bet[player_idx]
+        bet = max_bet - int(per_player_bet[player_idx])
         player_stack = player_stacks[player_idx]
         if player_stack < bet:
             bet = player_stack
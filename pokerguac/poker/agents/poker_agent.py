@@ -1,9 +1,10 @@
 import numpy as np
 
 from abc import ABC, abstractmethod
-from typing import Tuple, List, Dict
+from typing import Tuple, List
 from ..components.card import PokerBoard
-from ..components import PlayerAction, PokerStage, PlayerPosition
+from ..components.action_log import ActionLog
+from ..components import PlayerAction, PlayerPosition, Chips
 
 
 class PokerAgent(ABC):
@@ -14,18 +15,19 @@ class PokerAgent(ABC):
         self,
         board: PokerBoard,
         per_player_bet: np.ndarray,
-        per_player_action: Dict[PokerStage, List[List[Tuple[PlayerAction, float]]]],
-        player_stacks: List[float],
+        max_bet: Chips,
+        action_log: ActionLog,
+        player_stacks: List[Chips],
         player_pos: PlayerPosition,
         player_idx: int,
-        big_blind: float,
-    ) -> Tuple[float, PlayerAction]:
+        big_blind: Chips,
+    ) -> Tuple[Chips, PlayerAction]:
         raise NotImplementedError
 
     def straddle(
-        self, player_stacks: List[float], player_idx: int, big_blind: float
+        self, player_stacks: List[Chips], player_idx: int, big_blind: Chips
     ) -> bool:
         return False
 
-    def is_legal_bet(self, bet: float) -> bool:
+    def is_legal_bet(self, bet: Chips) -> bool:
         return True
@@ -1,4 +1,8 @@
 from .card import PokerCard, PokerSuit, PokerHole, PokerBoard, PokerHand
+from .action_log import ActionLog, Actions
+from .card_mask import CardMask
+from .chips import Chips, to_chips
+from .seat_state import SeatState
 from .constants import (
     PlayerAction,
     PokerSuit,
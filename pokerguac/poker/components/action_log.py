@@ -0,0 +1,138 @@
+import numpy as np
+from typing import NamedTuple, Optional
+
+from .chips import Chips
+from .constants import ALL_POKER_STAGES, PlayerAction, PokerStage
+
+
+__all__ = ["ActionLog", "Actions"]
+
+DEFAULT_CAPACITY = 256
+
+
+class Actions(NamedTuple):
+    """
+    Read-only parallel arrays of logged actions (one entry per action)
+    """
+
+    seats: np.ndarray
+    stages: np.ndarray
+    actions: np.ndarray
+    amounts: np.ndarray
+
+
+class ActionLog:
+    """
+    Preallocated append-only log of the betting actions of a table, stored as
+    parallel integer arrays (seat, stage value, action value and amount).
+
+    Entries from hand_start on are the current hand. Clearing only resets the
+    offsets, so the arrays are reused from hand to hand (they double in size if a
+    hand ever outgrows them). Actions are appended street by street, so every
+    stage of the hand is a contiguous slice.
+    (i.e. log.stage(PokerStage.FLOP).amounts are the flop bets in action order)
+    """
+
+    seats: np.ndarray
+    stages: np.ndarray
+    actions: np.ndarray
+    amounts: np.ndarray
+    size: int
+    hand_start: int
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        assert capacity > 0, capacity
+        self.seats = np.zeros(capacity, dtype=np.int8)
+        self.stages = np.zeros(capacity, dtype=np.int8)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.amounts = np.zeros(capacity, dtype=np.int64)
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.size - self.hand_start
+
+    def clear(self):
+        self.size = 0
+        self.hand_start = 0
+
+    def start_hand(self):
+        """
+        Start a new hand after the logged ones (keeping them in the arrays)
+        """
+        self.hand_start = self.size
+
+    def _grow(self):
+        capacity = 2 * len(self.seats)
+        for name in ["seats", "stages", "actions", "amounts"]:
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[: self.size] = array[: self.size]
+            setattr(self, name, grown)
+
+    def append(self, seat: int, stage: PokerStage, action: PlayerAction, bet: Chips):
+        if self.size == len(self.seats):
+            self._grow()
+        assert self.size == self.hand_start or self.stages[self.size - 1] <= stage.value
+        self.seats[self.size] = seat
+        self.stages[self.size] = stage.value
+        self.actions[self.size] = action.value
+        self.amounts[self.size] = bet
+        self.size += 1
+
+    def _view(self, start: int, end: int) -> Actions:
+        views = []
+        for array in [self.seats, self.stages, self.actions, self.amounts]:
+            view = array[start:end]
+            view.flags.writeable = False
+            views.append(view)
+        return Actions(*views)
+
+    def hand(self) -> Actions:
+        """
+        Every action of the current hand
+        """
+        return self._view(self.hand_start, self.size)
+
+    def stage(self, stage: PokerStage) -> Actions:
+        """
+        Actions of the current hand in stage
+        """
+        stages = self.stages[self.hand_start : self.size]
+        start, end = np.searchsorted(stages, [stage.value, stage.value + 1])
+        return self._view(self.hand_start + int(start), self.hand_start + int(end))
+
+    def seat(self, seat: int, stage: Optional[PokerStage] = None) -> Actions:
+        """
+        Actions of seat in the current hand, or only in stage
+        """
+        actions = self.hand() if stage is None else self.stage(stage)
+        return Actions(*[array[actions.seats == seat] for array in actions])
+
+    def per_player_bet(self, num_seats: int) -> np.ndarray:
+        """
+        Returns
+        -------
+        (num_seats,) total bet of every seat in the current hand
+        """
+        actions = self.hand()
+        return np.bincount(
+            actions.seats, weights=actions.amounts, minlength=num_seats
+        ).astype(np.int64)
+
+    def per_stage_bet(self, num_seats: int) -> np.ndarray:
+        """
+        Returns
+        -------
+        (num_stages, num_seats) total bet of every seat in every stage of the
+        current hand
+        """
+        actions = self.hand()
+        return (
+            np.bincount(
+                actions.stages.astype(np.intp) * num_seats + actions.seats,
+                weights=actions.amounts,
+                minlength=len(ALL_POKER_STAGES) * num_seats,
+            )
+            .astype(np.int64)
+            .reshape(len(ALL_POKER_STAGES), num_seats)
+        )
@@ -1,27 +1,58 @@
-from typing import Tuple, Optional, List
-from .constants import NUMBER_STRING_TO_INT, SUIT_STRING_TO_SUIT, PokerSuit
+from typing import Dict, Tuple, Optional, List
+from .constants import (
+    NUMBER_STRING_TO_INT,
+    SUIT_STRING_TO_SUIT,
+    CARD_RANK_SYMBOLS,
+    CARD_SUIT_SYMBOLS,
+    POKER_CARD_DECK,
+    PokerSuit,
+)
 
 
 __all__ = ["PokerCard", "PokerBoard", "PokerHand", "PokerHole"]
 
 
+# Registry of the 52 shared PokerCard instances
+_CARDS_BY_SYMBOL: Dict[Tuple[str, str], "PokerCard"] = {}
+_CARDS_BY_CODE: List["PokerCard"] = []
+
+
 class PokerCard:
     """
     PokerCard class for Texas Holdem Poker game
     operations like __eq__, __hash__ use only "number" component of card
     for usage in cardops for hand rank computation.
     (i.e. PokerCard.from_symbol('as') == PokerCard.from_symbol('ad'))
+
+    There are only 52 immutable PokerCard instances. PokerCard(number, suit),
+    PokerCard.from_symbol and PokerCard.from_code all return the shared instance,
+    so identical cards can also be compared with `is`.
     """
 
+    __slots__ = ("_name", "_number", "_suit", "_code", "_rank", "_suit_index")
+
     _name: str
     _number: int
     _suit: PokerSuit
-
-    def __init__(self, number: str, suit: str):
-        assert number in NUMBER_STRING_TO_INT and suit in SUIT_STRING_TO_SUIT
-        self._name = f"{number}{suit}"
-        self._number = NUMBER_STRING_TO_INT[number]
-        self._suit = SUIT_STRING_TO_SUIT[suit]
+    _code: int
+    _rank: int
+    _suit_index: int
+
+    def __new__(cls, number: str, suit: str):
+        card = _CARDS_BY_SYMBOL.get((number, suit))
+        if card is None:
+            assert number in NUMBER_STRING_TO_INT and suit in SUIT_STRING_TO_SUIT
+            card = super().__new__(cls)
+            rank = CARD_RANK_SYMBOLS.index(number)
+            suit_index = CARD_SUIT_SYMBOLS.index(suit)
+            object.__setattr__(card, "_name", f"{number}{suit}")
+            object.__setattr__(card, "_number", NUMBER_STRING_TO_INT[number])
+            object.__setattr__(card, "_suit", SUIT_STRING_TO_SUIT[suit])
+            object.__setattr__(card, "_code", rank * 4 + suit_index)
+            object.__setattr__(card, "_rank", rank)
+            object.__setattr__(card, "_suit_index", suit_index)
+            _CARDS_BY_SYMBOL[(number, suit)] = card
+        return card
 
     @classmethod
     def from_symbol(cls, symbol: str):
@@ -32,12 +63,45 @@ class PokerCard:
         suit = symbol[1].lower()
         return cls(number, suit)
 
+    @classmethod
+    def from_code(cls, code: int):
+        assert 0 <= code < 52, f"{code} is invalid. Valid card codes are [0, 52)"
+        return _CARDS_BY_CODE[code]
+
+    @classmethod
+    def deck(cls) -> List["PokerCard"]:
+        """
+        Returns
+        -------
+        New list of the 52 shared cards (in POKER_CARD_DECK order)
+        """
+        return [_CARDS_BY_SYMBOL[(symbol[0], symbol[1])] for symbol in POKER_CARD_DECK]
+
+    @property
+    def code(self) -> int:
+        """
+        Integer card code (rank * 4 + suit) used by the lookup evaluator.
+        Deuce is rank 0 and ace is rank 12.
+        """
+        return self._code
+
+    @property
+    def rank(self) -> int:
+        """
+        Ace high rank of card. Deuce is 0 and ace is 12.
+        """
+        return self._rank
+
+    @property
+    def suit_index(self) -> int:
+        """
+        Suit of card as integer in [0, 4) following CARD_SUIT_SYMBOLS order.
+        """
+        return self._suit_index
+
     def equal(self, other) -> bool:
-        return (
-            self.__class__ == other.__class__
-            and self._number == other._number
-            and self._suit == other._suit
-        )
+        # Cards are interned, same number and suit means same object
+        return self is other
 
     def __lt__(self, other) -> bool:
         if self.__class__ is other.__class__:
@@ -55,6 +119,22 @@ class PokerCard:
     def __hash__(self):
         return self._number
 
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        # Keep cards interned through pickling (e.g. sending to worker processes)
+        return (PokerCard.from_code, (self._code,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __str__(self):
         return self._name
 
@@ -68,6 +148,12 @@ class PokerCard:
         return self._suit == other._suit
 
 
+for _code in range(len(CARD_RANK_SYMBOLS) * len(CARD_SUIT_SYMBOLS)):
+    _CARDS_BY_CODE.append(
+        PokerCard(CARD_RANK_SYMBOLS[_code >> 2], CARD_SUIT_SYMBOLS[_code & 3])
+    )
+
+
 PokerBoard = List[Optional[PokerCard]]
 PokerHand = Tuple[PokerCard, PokerCard, PokerCard, PokerCard, PokerCard]
 PokerHole = Tuple[PokerCard, PokerCard]
@@ -0,0 +1,143 @@
+import itertools
+import numpy as np
+from math import comb
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .card import PokerCard
+
+
+__all__ = ["CardMask"]
+
+NUM_DECK_CARDS = 52
+FULL_DECK_BITS = (1 << NUM_DECK_CARDS) - 1
+
+
+class CardMask:
+    """
+    Immutable set of cards stored as a 52 bit integer where bit i is the card with
+    code i (see PokerCard.code). Union, intersection, difference and membership
+    are single integer operations.
+    (i.e. CardMask.from_cards(dead_cards).complement() is the remaining deck)
+    """
+
+    __slots__ = ("_bits",)
+
+    _bits: int
+
+    def __init__(self, bits: int = 0):
+        assert 0 <= bits <= FULL_DECK_BITS, bits
+        object.__setattr__(self, "_bits", bits)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Optional[PokerCard]]) -> "CardMask":
+        """
+        Empty board slots (None) are skipped.
+        """
+        bits = 0
+        for card in cards:
+            if card is not None:
+                bits |= 1 << card.code
+        return cls(bits)
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[int]) -> "CardMask":
+        bits = 0
+        for code in codes:
+            bits |= 1 << int(code)
+        return cls(bits)
+
+    @classmethod
+    def full(cls) -> "CardMask":
+        return cls(FULL_DECK_BITS)
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    def complement(self) -> "CardMask":
+        return CardMask(FULL_DECK_BITS ^ self._bits)
+
+    def add(self, card: PokerCard) -> "CardMask":
+        return CardMask(self._bits | 1 << card.code)
+
+    def codes(self) -> List[int]:
+        """
+        Returns
+        -------
+        card codes of set bits in ascending order
+        """
+        codes = []
+        bits = self._bits
+        while bits:
+            lowest = bits & -bits
+            codes.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return codes
+
+    def cards(self) -> List[PokerCard]:
+        return [PokerCard.from_code(code) for code in self.codes()]
+
+    def combinations(self, num_cards: int) -> Iterator[Tuple[PokerCard, ...]]:
+        """
+        Enumerate all subsets of num_cards cards in this set.
+        """
+        return itertools.combinations(self.cards(), num_cards)
+
+    def combination_codes(self, num_cards: int) -> np.ndarray:
+        """
+        Returns
+        -------
+        (C(len(self), num_cards), num_cards) array with card codes of every subset
+        of num_cards cards in this set. Rows are in itertools.combinations order.
+        """
+        codes = self.codes()
+        num_combinations = comb(len(codes), num_cards)
+        flat = np.fromiter(
+            itertools.chain.from_iterable(itertools.combinations(codes, num_cards)),
+            dtype=np.int8,
+            count=num_combinations * num_cards,
+        )
+        return flat.reshape(num_combinations, num_cards)
+
+    def __or__(self, other: "CardMask") -> "CardMask":
+        return CardMask(self._bits | other._bits)
+
+    def __and__(self, other: "CardMask") -> "CardMask":
+        return CardMask(self._bits & other._bits)
+
+    def __sub__(self, other: "CardMask") -> "CardMask":
+        return CardMask(self._bits & ~other._bits)
+
+    def __xor__(self, other: "CardMask") -> "CardMask":
+        return CardMask(self._bits ^ other._bits)
+
+    def __contains__(self, card: Union[PokerCard, int]) -> bool:
+        code = card if isinstance(card, int) else card.code
+        return bool(self._bits >> code & 1)
+
+    def __iter__(self) -> Iterator[PokerCard]:
+        return iter(self.cards())
+
+    def __len__(self) -> int:
+        return self._bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CardMask) and self._bits == other._bits
+
+    def __hash__(self):
+        return hash(self._bits)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        return (CardMask, (self._bits,))
+
+    def __str__(self):
+        return "[" + ", ".join(str(card) for card in self.cards()) + "]"
+
+    def __repr__(self):
+        return f"CardMask({self.__str__()})"
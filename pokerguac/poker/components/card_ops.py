@@ -1,17 +1,18 @@
-from typing import List, Sequence
+from typing import List, Sequence, Tuple
 from .card import PokerCard
 
+ACE = PokerCard("a", "s")
+KING = PokerCard("k", "s")
+
 
 def ace_sort(cards: Sequence[PokerCard], straight: bool = False) -> List[PokerCard]:
-    ace = PokerCard("a", "s")
-    king = PokerCard("k", "s")
-    if ace not in cards or (straight and king not in cards):
+    if ACE not in cards or (straight and KING not in cards):
         return sorted(cards)
     else:
         ace_cards = []
         remaining = []
         for card in cards:
-            if card == ace:
+            if card == ACE:
                 ace_cards.append(card)
             else:
                 remaining.append(card)
@@ -59,17 +60,39 @@ def get_remainder_of_pairs(
     return ace_sort(remainder)
 
 
+def get_rank_key(cards: Sequence[PokerCard]) -> Tuple[int, ...]:
+    """
+    Ace high ranks of cards ordered by number of duplicates and then by rank.
+    If you have AATT2 in cards, function will return ranks of (A, A, T, T, 2)
+    and for TTT22 ranks of (T, T, T, 2, 2).
+    """
+    ranks = [card.rank for card in cards]
+    return tuple(
+        sorted(ranks, key=lambda rank: (ranks.count(rank), rank), reverse=True)
+    )
+
+
+def get_straight_high(cards: Sequence[PokerCard]) -> int:
+    """
+    Ace high rank of the highest card of a straight. (5 for A2345)
+    """
+    ranks = sorted(card.rank for card in cards)
+    if ranks[-1] - ranks[0] > len(ranks) - 1:
+        # Ace plays low on a wheel straight
+        return ranks[-2]
+    return ranks[-1]
+
+
 def lt_cards(cards1: Sequence[PokerCard], cards2: Sequence[PokerCard]) -> bool:
     assert len(cards1) == len(cards2)
     remaining1 = ace_sort(cards1)
     remaining2 = ace_sort(cards2)
     remaining1.reverse()
     remaining2.reverse()
-    ace = PokerCard("a", "s")
     for card1, card2 in zip(cards1, cards2):
-        if ace == card1 and ace != card2:
+        if ACE == card1 and ACE != card2:
             return False
-        elif ace != card1 and ace == card2:
+        elif ACE != card1 and ACE == card2:
             return True
         elif card1 == card2:
             continue
@@ -0,0 +1,21 @@
+"""
+Chip amounts (stacks, bets, pots, blinds and bank rolls) are integers counted in
+the smallest chip unit, so chip accounting is exact and needs no float tolerance.
+"""
+import numpy as np
+from typing import Union
+
+
+__all__ = ["Chips", "to_chips"]
+
+Chips = int
+
+
+def to_chips(amount: Union[int, float, np.integer, np.floating]) -> Chips:
+    """
+    Convert a whole chip amount (i.e. an integer valued float or numpy scalar)
+    to a python int
+    """
+    chips = int(amount)
+    assert chips == amount, f"Chip amounts must be whole chips: {amount}"
+    return chips
@@ -34,6 +34,30 @@ class PokerSuit(PrintableEnum):
     SPADE = 4
 
 
+class PokerGameType(Enum):
+    HOLDEM = 1
+    PLO = 2
+    PLO_HILO = 3
+
+
+class HandRanking(Enum):
+    ROYAL = 1
+    STRAIGHTFLUSH = 2
+    QUADS = 3
+    FULLHOUSE = 4
+    FLUSH = 5
+    STRAIGHT = 6
+    TRIPS = 7
+    TWOPAIR = 8
+    PAIR = 9
+    HIGH = 10
+
+    def __lt__(self, other):
+        if self.__class__ is other.__class__:
+            return self.value < other.value
+        return NotImplemented
+
+
 class PlayerAction(PrintableEnum):
     CALL = 0
     RAISE = 1
@@ -135,6 +159,13 @@ NUMBER_STRING_TO_INT = {
     "k": 13,
 }
 
+# Integer card codes used by the lookup evaluator: code = rank * 4 + suit
+# where rank 0 is a deuce and rank 12 is an ace.
+CARD_RANK_SYMBOLS = "23456789tjqka"
+CARD_SUIT_SYMBOLS = "cdhs"
+NUM_CARD_RANKS = 13
+NUM_CARD_SUITS = 4
+
 MAX_NUM_PLAYERS = 9
 MIN_NUM_PLAYERS = 2
 BOARD_NUM_CARDS = 5
@@ -143,6 +174,11 @@ NUM_TURN_CARDS = 1
 NUM_RIVER_CARDS = 1
 HOLDEM_NUM_PLAYER_CARDS = 2
 PLO_NUM_PLAYER_CARDS = 4
+GAME_TYPE_TO_NUM_PLAYER_CARDS = {
+    PokerGameType.HOLDEM: HOLDEM_NUM_PLAYER_CARDS,
+    PokerGameType.PLO: PLO_NUM_PLAYER_CARDS,
+    PokerGameType.PLO_HILO: PLO_NUM_PLAYER_CARDS,
+}
 MIN_BLIND_LEVELS = 5
 
 NUM_PLAYERS_TO_POSITIONS = {
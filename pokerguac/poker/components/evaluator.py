@@ -0,0 +1,610 @@
+"""
+Lookup table hand evaluator.
+
+Every 5, 6 or 7 card set is mapped to a single integer strength where a larger
+strength is a stronger hand. Strengths are dense: the weakest high card (7-5-4-3-2)
+is 1 and a royal flush is 7462, so hands can be compared and tied with plain
+integer comparison.
+
+Cards are integer codes (rank * 4 + suit, see PokerCard.code). A hand is evaluated
+with two table lookups:
+    * unsuited table: indexed by the colex rank of the sorted rank multiset.
+      Holds the best non-flush hand (straight, quads, full house, ...).
+    * flush table: indexed by the 13 bit rank mask of a single suit.
+      Holds the best flush / straight flush for masks with at least 5 ranks.
+The final strength is the maximum of the two.
+
+Tables are generated once into a versioned file under TABLE_DIR and memory mapped,
+so processes share one read-only copy. They are loaded lazily on the first
+evaluation or explicitly with warm_up().
+"""
+import os
+import threading
+import numpy as np
+from math import comb
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .constants import (
+    HandRanking,
+    NUM_CARD_RANKS,
+    NUM_CARD_SUITS,
+    HOLDEM_NUM_PLAYER_CARDS,
+)
+from .table_file import TableFile, TableVersionError, load_table_file, save_table_file
+
+
+__all__ = [
+    "evaluate",
+    "evaluate_batch",
+    "evaluate_holes_batch",
+    "EvaluatorState",
+    "hand_ranking",
+    "hand_ranking_batch",
+    "strengths_to_ranks",
+    "strengths_to_ranks_batch",
+    "warm_up",
+    "MIN_EVAL_CARDS",
+    "MAX_EVAL_CARDS",
+    "NUM_HAND_STRENGTHS",
+]
+
+MIN_EVAL_CARDS = 5
+MAX_EVAL_CARDS = 7
+NUM_HAND_STRENGTHS = 7462
+ACE = NUM_CARD_RANKS - 1
+WHEEL_MASK = (1 << ACE) | 0b1111  # A-2-3-4-5
+
+HandKey = Tuple[int, ...]
+
+
+def _category(ranking: HandRanking) -> int:
+    # HandRanking values are 1 (royal) to 10 (high), flip so that stronger is larger
+    return len(HandRanking) + 1 - ranking.value
+
+
+def _straight_high(rank_mask: int) -> int:
+    """
+    Returns
+    -------
+    rank of highest card of best straight in rank_mask, -1 if there is no straight.
+    (wheel straight A-2-3-4-5 is 5 high)
+    """
+    for high in range(ACE, 3, -1):
+        window = 0b11111 << (high - 4)
+        if rank_mask & window == window:
+            return high
+    if rank_mask & WHEEL_MASK == WHEEL_MASK:
+        return 3
+    return -1
+
+
+def _unsuited_key(counts: Sequence[int]) -> HandKey:
+    """
+    Best 5 card (non-flush) hand key made from rank counts of 5 to 7 cards.
+    """
+    ranks_desc = [rank for rank in range(ACE, -1, -1) if counts[rank]]
+    quads = [rank for rank in ranks_desc if counts[rank] == 4]
+    trips = [rank for rank in ranks_desc if counts[rank] == 3]
+    pairs = [rank for rank in ranks_desc if counts[rank] == 2]
+    if quads:
+        kicker = [rank for rank in ranks_desc if rank != quads[0]][0]
+        return (_category(HandRanking.QUADS), quads[0], kicker)
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return (_category(HandRanking.FULLHOUSE), trips[0], pair)
+
+    rank_mask = 0
+    for rank in ranks_desc:
+        rank_mask |= 1 << rank
+    straight_high = _straight_high(rank_mask)
+    if straight_high >= 0:
+        return (_category(HandRanking.STRAIGHT), straight_high)
+
+    if trips:
+        kickers = [rank for rank in ranks_desc if rank != trips[0]][:2]
+        return (_category(HandRanking.TRIPS), trips[0], *kickers)
+    if len(pairs) >= 2:
+        kicker = [rank for rank in ranks_desc if rank not in pairs[:2]][0]
+        return (_category(HandRanking.TWOPAIR), pairs[0], pairs[1], kicker)
+    if pairs:
+        kickers = [rank for rank in ranks_desc if rank != pairs[0]][:3]
+        return (_category(HandRanking.PAIR), pairs[0], *kickers)
+    return (_category(HandRanking.HIGH), *ranks_desc[:5])
+
+
+def _flush_key(rank_mask: int) -> HandKey:
+    """
+    Best 5 card hand key made from a single suit holding 5 or more ranks.
+    """
+    straight_high = _straight_high(rank_mask)
+    if straight_high == ACE:
+        return (_category(HandRanking.ROYAL),)
+    elif straight_high >= 0:
+        return (_category(HandRanking.STRAIGHTFLUSH), straight_high)
+    ranks_desc = [rank for rank in range(ACE, -1, -1) if rank_mask >> rank & 1]
+    return (_category(HandRanking.FLUSH), *ranks_desc[:5])
+
+
+def _rank_counts(ranks: Sequence[int]) -> List[int]:
+    counts = [0] * NUM_CARD_RANKS
+    for rank in ranks:
+        counts[rank] += 1
+    return counts
+
+
+def _rank_multisets(num_cards: int, max_rank: int = ACE):
+    """
+    Yield all non-decreasing rank sequences of length num_cards in colex order.
+    """
+    if num_cards == 0:
+        yield ()
+        return
+    for last in range(max_rank + 1):
+        for prefix in _rank_multisets(num_cards - 1, last):
+            yield prefix + (last,)
+
+
+# _COLEX[i][rank]: contribution of i-th smallest rank to the colex index of a multiset
+_COLEX: List[List[int]] = [
+    [comb(rank + i, i + 1) for rank in range(NUM_CARD_RANKS)]
+    for i in range(MAX_EVAL_CARDS)
+]
+_SIZE_OFFSET: Dict[int, int] = {}
+_offset = 0
+for _num_cards in range(MIN_EVAL_CARDS, MAX_EVAL_CARDS + 1):
+    _SIZE_OFFSET[_num_cards] = _offset
+    _offset += comb(NUM_CARD_RANKS + _num_cards - 1, _num_cards)
+UNSUITED_TABLE_SIZE = _offset
+FLUSH_TABLE_SIZE = 1 << NUM_CARD_RANKS
+
+
+def multiset_index(sorted_ranks: Sequence[int]) -> int:
+    index = _SIZE_OFFSET[len(sorted_ranks)]
+    for i, rank in enumerate(sorted_ranks):
+        index += _COLEX[i][rank]
+    return index
+
+
+def _build_tables() -> Tuple[List[int], List[int], List[int]]:
+    """
+    Returns
+    -------
+    unsuited table, flush table and the first strength of every HandRanking
+    (ordered from HIGH to ROYAL)
+    """
+    five_card_keys = set()
+    for ranks in _rank_multisets(MIN_EVAL_CARDS):
+        counts = _rank_counts(ranks)
+        if max(counts) <= NUM_CARD_SUITS:
+            five_card_keys.add(_unsuited_key(counts))
+    for rank_mask in range(FLUSH_TABLE_SIZE):
+        if bin(rank_mask).count("1") == MIN_EVAL_CARDS:
+            five_card_keys.add(_flush_key(rank_mask))
+    assert len(five_card_keys) == NUM_HAND_STRENGTHS, len(five_card_keys)
+
+    key_to_strength = {
+        key: strength for strength, key in enumerate(sorted(five_card_keys), 1)
+    }
+    category_starts = [0] * len(HandRanking)
+    for key, strength in key_to_strength.items():
+        if category_starts[key[0] - 1] == 0 or strength < category_starts[key[0] - 1]:
+            category_starts[key[0] - 1] = strength
+
+    unsuited = [0] * UNSUITED_TABLE_SIZE
+    for num_cards in range(MIN_EVAL_CARDS, MAX_EVAL_CARDS + 1):
+        for ranks in _rank_multisets(num_cards):
+            counts = _rank_counts(ranks)
+            if max(counts) <= NUM_CARD_SUITS:
+                unsuited[multiset_index(ranks)] = key_to_strength[_unsuited_key(counts)]
+
+    flush = [0] * FLUSH_TABLE_SIZE
+    for rank_mask in range(FLUSH_TABLE_SIZE):
+        if bin(rank_mask).count("1") >= MIN_EVAL_CARDS:
+            flush[rank_mask] = key_to_strength[_flush_key(rank_mask)]
+    return unsuited, flush, category_starts
+
+
+_COLEX_ARRAY = np.array(_COLEX, dtype=np.intp)
+_SUIT_LANE_BITS = np.array(
+    [(1 << (code >> 2)) << (16 * (code & 3)) for code in range(NUM_CARD_RANKS * 4)],
+    dtype=np.int64,
+)
+# Unordered hole rank pairs (low, high) and index of a pair from its two ranks
+_HOLE_RANK_PAIRS = np.array(
+    [(low, high) for high in range(NUM_CARD_RANKS) for low in range(high + 1)],
+    dtype=np.intp,
+)
+_HOLE_PAIR_INDEX = np.zeros((NUM_CARD_RANKS, NUM_CARD_RANKS), dtype=np.intp)
+_HOLE_PAIR_INDEX[_HOLE_RANK_PAIRS[:, 0], _HOLE_RANK_PAIRS[:, 1]] = np.arange(
+    len(_HOLE_RANK_PAIRS)
+)
+_HOLE_PAIR_INDEX[_HOLE_RANK_PAIRS[:, 1], _HOLE_RANK_PAIRS[:, 0]] = np.arange(
+    len(_HOLE_RANK_PAIRS)
+)
+_HOLE_PAIR_INDEX_LIST: List[List[int]] = _HOLE_PAIR_INDEX.tolist()
+# Boards need this many cards to be scored with a hole and as many cards of a
+# suit to make a flush
+MIN_EVAL_BOARD_CARDS = MIN_EVAL_CARDS - HOLDEM_NUM_PLAYER_CARDS
+
+# Tables are built once, stored in TABLE_DIR and memory mapped on first use
+EVALUATOR_TABLE_NAME = "evaluator"
+EVALUATOR_TABLE_VERSION = 1
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+# Filled by warm_up(). Batches index the shared mapped arrays directly, the scalar
+# path uses list copies since indexing a list is several times faster
+UNSUITED_TABLE: Optional[List[int]] = None
+FLUSH_TABLE: List[int]
+_UNSUITED_ARRAY: np.ndarray
+_FLUSH_ARRAY: np.ndarray
+_CATEGORY_STARTS: List[int]
+_LOAD_LOCK = threading.Lock()
+
+
+def get_table_path(table_dir: Optional[str] = None) -> str:
+    return os.path.join(
+        TABLE_DIR if table_dir is None else table_dir,
+        f"{EVALUATOR_TABLE_NAME}_v{EVALUATOR_TABLE_VERSION}.bin",
+    )
+
+
+def load_tables(table_dir: Optional[str] = None) -> TableFile:
+    """
+    Memory map the evaluator tables, building and saving them first if the file is
+    missing or was written by another table version.
+    """
+    path = get_table_path(table_dir)
+    try:
+        return load_table_file(path, EVALUATOR_TABLE_NAME, EVALUATOR_TABLE_VERSION)
+    except (FileNotFoundError, TableVersionError):
+        pass
+    unsuited, flush, category_starts = _build_tables()
+    arrays = {
+        "unsuited": np.array(unsuited, dtype=np.uint16),
+        "flush": np.array(flush, dtype=np.uint16),
+        "category_starts": np.array(category_starts, dtype=np.uint16),
+    }
+    try:
+        save_table_file(path, EVALUATOR_TABLE_NAME, EVALUATOR_TABLE_VERSION, arrays)
+    except OSError:
+        # Read-only install, keep private in-memory tables for this process
+        return TableFile(
+            None, EVALUATOR_TABLE_NAME, EVALUATOR_TABLE_VERSION, arrays, {}
+        )
+    return load_table_file(path, EVALUATOR_TABLE_NAME, EVALUATOR_TABLE_VERSION)
+
+
+def warm_up(
+    table_dir: Optional[str] = None, background: bool = False
+) -> Optional[threading.Thread]:
+    """
+    Load the evaluator tables. Tables are otherwise loaded lazily by the first
+    evaluation (i.e. first rank_hands call), call this at startup to keep that
+    latency off the first showdown.
+
+    Args
+    ----
+    table_dir (Optional[str]): directory of table files. Defaults to TABLE_DIR
+    background (bool): load in a daemon thread. Evaluations started meanwhile
+        wait for the load to finish.
+    Returns
+    -------
+    loading thread if background else None
+    """
+    if background:
+        thread = threading.Thread(target=warm_up, args=(table_dir,), daemon=True)
+        thread.start()
+        return thread
+
+    global UNSUITED_TABLE, FLUSH_TABLE, _UNSUITED_ARRAY, _FLUSH_ARRAY, _CATEGORY_STARTS
+    with _LOAD_LOCK:
+        if UNSUITED_TABLE is None:
+            tables = load_tables(table_dir)
+            _UNSUITED_ARRAY = tables["unsuited"]
+            _FLUSH_ARRAY = tables["flush"]
+            _CATEGORY_STARTS = tables["category_starts"].tolist()
+            FLUSH_TABLE = _FLUSH_ARRAY.tolist()
+            # Assigned last, other threads treat it as the loaded flag
+            UNSUITED_TABLE = _UNSUITED_ARRAY.tolist()
+    return None
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """
+    Args
+    ----
+    cards (Sequence[int]): 5 to 7 distinct integer card codes
+    Returns
+    -------
+    hand strength in [1, NUM_HAND_STRENGTHS]. Stronger hands are larger.
+    """
+    assert MIN_EVAL_CARDS <= len(cards) <= MAX_EVAL_CARDS, cards
+    if UNSUITED_TABLE is None:
+        warm_up()
+    suit_masks = [0] * NUM_CARD_SUITS
+    index = _SIZE_OFFSET[len(cards)]
+    for i, code in enumerate(sorted(cards)):
+        rank = code >> 2
+        index += _COLEX[i][rank]
+        suit_masks[code & 3] |= 1 << rank
+    return max(
+        UNSUITED_TABLE[index],
+        FLUSH_TABLE[suit_masks[0]],
+        FLUSH_TABLE[suit_masks[1]],
+        FLUSH_TABLE[suit_masks[2]],
+        FLUSH_TABLE[suit_masks[3]],
+    )
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Vectorized version of evaluate.
+
+    Args
+    ----
+    cards (np.ndarray): integer card codes of shape (..., num_cards) where
+        num_cards is between 5 and 7. Cards in the last axis must be distinct.
+    Returns
+    -------
+    hand strengths of shape (...)
+    """
+    if UNSUITED_TABLE is None:
+        warm_up()
+    cards = np.asarray(cards, dtype=np.intp)
+    num_cards = cards.shape[-1]
+    assert MIN_EVAL_CARDS <= num_cards <= MAX_EVAL_CARDS, cards.shape
+    # Sorting codes also sorts ranks since rank is the high part of the code
+    ranks = np.sort(cards, axis=-1) >> 2
+    index = np.full(cards.shape[:-1], _SIZE_OFFSET[num_cards], dtype=np.intp)
+    for i in range(num_cards):
+        index += _COLEX_ARRAY[i, ranks[..., i]]
+    strengths = _UNSUITED_ARRAY[index]
+
+    # Each card sets its rank bit in the 16 bit lane of its suit
+    suit_masks = _SUIT_LANE_BITS[cards].sum(axis=-1)
+    for suit in range(NUM_CARD_SUITS):
+        suit_mask = (suit_masks >> (16 * suit)) & (FLUSH_TABLE_SIZE - 1)
+        np.maximum(strengths, _FLUSH_ARRAY[suit_mask], out=strengths)
+    return strengths
+
+
+def evaluate_holes_batch(boards: np.ndarray, holes: np.ndarray) -> np.ndarray:
+    """
+    Strength of every hole on every board. Work shared by holes on the same board
+    is done once per board: the unsuited part only depends on the board and the
+    two hole ranks, so it is evaluated for the 91 hole rank pairs and gathered,
+    and flush lookups are only done on boards holding enough cards of a suit.
+
+    Args
+    ----
+    boards (np.ndarray): (N, num_board_cards) integer card codes, 3 to 5 cards
+    holes (np.ndarray): (M, 2) integer card codes. Holes sharing a card with a
+        board give meaningless strengths for that board.
+    Returns
+    -------
+    (N, M) hand strengths
+    """
+    if UNSUITED_TABLE is None:
+        warm_up()
+    boards = np.asarray(boards, dtype=np.intp)
+    holes = np.asarray(holes, dtype=np.intp)
+    assert boards.ndim == 2 and holes.ndim == 2, (boards.shape, holes.shape)
+    assert holes.shape[1] == HOLDEM_NUM_PLAYER_CARDS, holes.shape
+    num_boards, num_board_cards = boards.shape
+    num_cards = num_board_cards + HOLDEM_NUM_PLAYER_CARDS
+    assert MIN_EVAL_CARDS <= num_cards <= MAX_EVAL_CARDS, boards.shape
+
+    num_pairs = len(_HOLE_RANK_PAIRS)
+    ranks = np.sort(
+        np.concatenate(
+            [
+                np.broadcast_to(
+                    boards[:, None, :] >> 2, (num_boards, num_pairs, num_board_cards)
+                ),
+                np.broadcast_to(
+                    _HOLE_RANK_PAIRS, (num_boards, num_pairs, HOLDEM_NUM_PLAYER_CARDS)
+                ),
+            ],
+            axis=2,
+        ),
+        axis=2,
+    )
+    index = np.full((num_boards, num_pairs), _SIZE_OFFSET[num_cards], dtype=np.intp)
+    for i in range(num_cards):
+        index += _COLEX_ARRAY[i, ranks[..., i]]
+    pair_strengths = _UNSUITED_ARRAY[index]
+    strengths = pair_strengths[:, _HOLE_PAIR_INDEX[holes[:, 0] >> 2, holes[:, 1] >> 2]]
+
+    board_suit_masks = _SUIT_LANE_BITS[boards].sum(axis=1)
+    hole_suit_masks = _SUIT_LANE_BITS[holes].sum(axis=1)
+    for suit in range(NUM_CARD_SUITS):
+        num_suited = np.count_nonzero((boards & 3) == suit, axis=1)
+        rows = np.flatnonzero(num_suited >= MIN_EVAL_BOARD_CARDS)
+        if len(rows) == 0:
+            continue
+        suit_masks = (
+            (board_suit_masks[rows, None] | hole_suit_masks[None, :]) >> (16 * suit)
+        ) & (FLUSH_TABLE_SIZE - 1)
+        strengths[rows] = np.maximum(strengths[rows], _FLUSH_ARRAY[suit_masks])
+    return strengths
+
+
+class EvaluatorState:
+    """
+    Board evaluated street by street. Absorbs board cards one at a time keeping
+    rank counts, per suit rank bitmasks and suit counts, so scoring a hole is a
+    cached lookup by hole ranks plus a flush lookup for suits the board holds
+    3 or more cards of.
+    (i.e. river_state = EvaluatorState(flop_codes).add(turn_code).add(river_code))
+
+    add() updates a copy of the counts and masks with the new card and leaves the
+    state unchanged, so a flop state can be shared by every turn and river
+    enumerated from it. Only the per hole strength cache is filled in place.
+    """
+
+    __slots__ = (
+        "codes",
+        "rank_counts",
+        "suit_masks",
+        "suit_counts",
+        "_flush_suits",
+        "_pair_strengths",
+    )
+
+    codes: Tuple[int, ...]
+    rank_counts: Tuple[int, ...]
+    suit_masks: Tuple[int, ...]
+    suit_counts: Tuple[int, ...]
+
+    def __init__(self, codes: Sequence[int] = ()):
+        assert len(codes) <= MAX_EVAL_CARDS - HOLDEM_NUM_PLAYER_CARDS, codes
+        self.codes = ()
+        self.rank_counts = (0,) * NUM_CARD_RANKS
+        self.suit_masks = (0,) * NUM_CARD_SUITS
+        self.suit_counts = (0,) * NUM_CARD_SUITS
+        for code in codes:
+            self._absorb(code)
+        self._reset_cache()
+
+    def _absorb(self, code: int):
+        rank, suit = code >> 2, code & 3
+        assert not self.suit_masks[suit] >> rank & 1, f"duplicate card {code}"
+        rank_counts = list(self.rank_counts)
+        suit_masks = list(self.suit_masks)
+        suit_counts = list(self.suit_counts)
+        rank_counts[rank] += 1
+        suit_masks[suit] |= 1 << rank
+        suit_counts[suit] += 1
+        self.codes = self.codes + (code,)
+        self.rank_counts = tuple(rank_counts)
+        self.suit_masks = tuple(suit_masks)
+        self.suit_counts = tuple(suit_counts)
+
+    def _reset_cache(self):
+        self._flush_suits = tuple(
+            suit
+            for suit in range(NUM_CARD_SUITS)
+            if self.suit_counts[suit] >= MIN_EVAL_BOARD_CARDS
+        )
+        # Unsuited strength by hole rank pair (see _HOLE_PAIR_INDEX), 0 if unknown
+        self._pair_strengths = [0] * len(_HOLE_RANK_PAIRS)
+
+    def add(self, code: int) -> "EvaluatorState":
+        assert len(self.codes) < MAX_EVAL_CARDS - HOLDEM_NUM_PLAYER_CARDS, self.codes
+        state = EvaluatorState.__new__(EvaluatorState)
+        state.codes = self.codes
+        state.rank_counts = self.rank_counts
+        state.suit_masks = self.suit_masks
+        state.suit_counts = self.suit_counts
+        state._absorb(code)
+        state._reset_cache()
+        return state
+
+    @property
+    def rank_mask(self) -> int:
+        """
+        13 bit mask of board ranks, used to detect straights
+        """
+        return (
+            self.suit_masks[0]
+            | self.suit_masks[1]
+            | self.suit_masks[2]
+            | self.suit_masks[3]
+        )
+
+    def evaluate(self, hole: Sequence[int]) -> int:
+        """
+        Args
+        ----
+        hole (Sequence[int]): 2 integer card codes not on the board
+        Returns
+        -------
+        strength of the board plus hole, same as evaluate(board + hole)
+        """
+        assert len(hole) == HOLDEM_NUM_PLAYER_CARDS, hole
+        assert len(self.codes) >= MIN_EVAL_BOARD_CARDS, self.codes
+        if UNSUITED_TABLE is None:
+            warm_up()
+        first, second = hole
+        pair = _HOLE_PAIR_INDEX_LIST[first >> 2][second >> 2]
+        strength = self._pair_strengths[pair]
+        if strength == 0:
+            rank_counts = list(self.rank_counts)
+            rank_counts[first >> 2] += 1
+            rank_counts[second >> 2] += 1
+            ranks = [
+                rank for rank, count in enumerate(rank_counts) for _ in range(count)
+            ]
+            strength = UNSUITED_TABLE[multiset_index(ranks)]
+            self._pair_strengths[pair] = strength
+        for suit in self._flush_suits:
+            suit_mask = self.suit_masks[suit]
+            if first & 3 == suit:
+                suit_mask |= 1 << (first >> 2)
+            if second & 3 == suit:
+                suit_mask |= 1 << (second >> 2)
+            strength = max(strength, FLUSH_TABLE[suit_mask])
+        return strength
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __repr__(self):
+        return f"EvaluatorState({list(self.codes)})"
+
+
+def hand_ranking(strength: int) -> HandRanking:
+    assert 1 <= strength <= NUM_HAND_STRENGTHS, strength
+    if UNSUITED_TABLE is None:
+        warm_up()
+    category = len(HandRanking)
+    while _CATEGORY_STARTS[category - 1] > strength:
+        category -= 1
+    return HandRanking(len(HandRanking) + 1 - category)
+
+
+def hand_ranking_batch(strengths: np.ndarray) -> np.ndarray:
+    """
+    Vectorized version of hand_ranking.
+
+    Returns
+    -------
+    HandRanking values (1 is ROYAL, 10 is HIGH) of strengths, same shape
+    """
+    if UNSUITED_TABLE is None:
+        warm_up()
+    categories = np.searchsorted(_CATEGORY_STARTS, strengths, side="right")
+    return len(HandRanking) + 1 - categories
+
+
+def strengths_to_ranks(strengths: Sequence[int]) -> List[int]:
+    """
+    Convert hand strengths to placements. Best hand is ranked 0 and tied hands share
+    the same rank, skipping the following ranks (i.e. [9, 9, 5] -> [0, 0, 2])
+    """
+    ranks = [0] * len(strengths)
+    order = sorted(range(len(strengths)), key=lambda i: strengths[i], reverse=True)
+    for position, i in enumerate(order):
+        if position > 0 and strengths[i] == strengths[order[position - 1]]:
+            ranks[i] = ranks[order[position - 1]]
+        else:
+            ranks[i] = position
+    return ranks
+
+
+def strengths_to_ranks_batch(strengths: np.ndarray) -> np.ndarray:
+    """
+    Vectorized version of strengths_to_ranks over the last axis of a (N, K) array.
+    """
+    strengths = np.asarray(strengths, dtype=np.int64)
+    assert strengths.ndim == 2, strengths.shape
+    num_rows, num_hands = strengths.shape
+    # Offset every row so that a single flat sort keeps rows apart
+    row_offsets = np.arange(num_rows, dtype=np.int64)[:, None] * (
+        NUM_HAND_STRENGTHS + 1
+    )
+    keys = strengths + row_offsets
+    sorted_keys = np.sort(keys, axis=None)
+    num_not_stronger = np.searchsorted(sorted_keys, keys, side="right")
+    num_not_stronger -= np.arange(num_rows)[:, None] * num_hands
+    return num_hands - num_not_stronger
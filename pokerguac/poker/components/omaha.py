@@ -0,0 +1,386 @@
+"""
+Pot-Limit Omaha hand evaluator.
+
+An Omaha hand must use exactly two hole cards and exactly three board cards.
+Non-flush strengths only depend on the ranks of the two hole cards (91 rank pairs)
+and of the three board cards (455 rank triples), so they are precomputed into a
+(91, 455) table from the hold'em evaluator tables. A hole/board combination is then
+a single lookup, and a flush lookup is only needed when both hole cards and all three
+board cards share a suit.
+
+Hi-Lo (eight or better) low hands are scored from 8 bit masks of ace-to-eight ranks:
+a 2 + 3 combination makes a low when the union of its hole pair and board triple
+masks has 5 bits, so every combination is a single or + LOW_TABLE lookup.
+"""
+import itertools
+import threading
+import numpy as np
+from math import comb
+from typing import List, Optional, Sequence, Tuple
+
+from . import evaluator
+from .constants import NUM_CARD_RANKS, NUM_CARD_SUITS, PLO_NUM_PLAYER_CARDS
+from .evaluator import MIN_EVAL_CARDS, strengths_to_ranks, strengths_to_ranks_batch
+
+
+__all__ = [
+    "evaluate_omaha",
+    "evaluate_omaha_batch",
+    "evaluate_omaha_low",
+    "evaluate_omaha_hilo",
+    "evaluate_omaha_hilo_batch",
+    "rank_omaha_hands",
+    "rank_omaha_hands_batch",
+    "OMAHA_NUM_HOLE_CARDS_USED",
+    "OMAHA_NUM_BOARD_CARDS_USED",
+    "NUM_LOW_STRENGTHS",
+]
+
+OMAHA_NUM_HOLE_CARDS_USED = 2
+OMAHA_NUM_BOARD_CARDS_USED = 3
+NUM_RANK_PAIRS = comb(NUM_CARD_RANKS + 1, OMAHA_NUM_HOLE_CARDS_USED)
+NUM_RANK_TRIPLES = comb(NUM_CARD_RANKS + 2, OMAHA_NUM_BOARD_CARDS_USED)
+
+# Index combinations of 2 out of the 4 hole cards and 3 out of 3 to 5 board cards
+_HOLE_COMBINATIONS = np.array(
+    list(itertools.combinations(range(PLO_NUM_PLAYER_CARDS), 2)), dtype=np.intp
+)
+_BOARD_COMBINATIONS = {
+    num_board_cards: np.array(
+        list(itertools.combinations(range(num_board_cards), 3)), dtype=np.intp
+    )
+    for num_board_cards in range(OMAHA_NUM_BOARD_CARDS_USED, MIN_EVAL_CARDS + 1)
+}
+# Ace to eight low: ace is low rank 0, deuce 1, ..., eight 7. Nines and up never play
+NUM_LOW_RANKS = 8
+NUM_LOW_STRENGTHS = comb(NUM_LOW_RANKS, MIN_EVAL_CARDS)
+EIGHT = 6  # rank of the eight, deuce is 0
+
+
+def _low_bit(code: int) -> int:
+    rank = code >> 2
+    if rank == evaluator.ACE:
+        return 1
+    elif rank <= EIGHT:
+        return 1 << (rank + 1)
+    return 0
+
+
+_LOW_BITS = [_low_bit(code) for code in range(NUM_CARD_RANKS * NUM_CARD_SUITS)]
+_LOW_BITS_ARRAY = np.array(_LOW_BITS, dtype=np.intp)
+
+
+def _build_low_table() -> List[int]:
+    """
+    Returns
+    -------
+    low strength of every 8 bit low rank mask, in [1, NUM_LOW_STRENGTHS] for masks of
+    5 ranks (larger is better, 5-4-3-2-A is best) and 0 for everything else
+    """
+    masks = [mask for mask in range(1 << NUM_LOW_RANKS) if mask.bit_count() == 5]
+    # Lows compare from their highest card down, the lower the better
+    masks.sort(
+        key=lambda mask: [
+            rank for rank in range(NUM_LOW_RANKS - 1, -1, -1) if mask >> rank & 1
+        ],
+        reverse=True,
+    )
+    low_table = [0] * (1 << NUM_LOW_RANKS)
+    for strength, mask in enumerate(masks, 1):
+        low_table[mask] = strength
+    return low_table
+
+
+LOW_TABLE = _build_low_table()
+_LOW_ARRAY = np.array(LOW_TABLE, dtype=np.uint16)
+
+_TRIPLE_COLEX = [evaluator._COLEX[i] for i in range(OMAHA_NUM_BOARD_CARDS_USED)]
+_TRIPLE_COLEX_ARRAY = np.array(_TRIPLE_COLEX, dtype=np.intp)
+
+# Filled by _load_tables(), strength of 5 card non-flush hands by
+# rank pair index (see evaluator._HOLE_PAIR_INDEX) * NUM_RANK_TRIPLES + triple index
+OMAHA_UNSUITED_TABLE: Optional[List[int]] = None
+_OMAHA_UNSUITED_ARRAY: np.ndarray
+_LOAD_LOCK = threading.Lock()
+
+
+def _triple_index(sorted_ranks: Sequence[int]) -> int:
+    return (
+        _TRIPLE_COLEX[0][sorted_ranks[0]]
+        + _TRIPLE_COLEX[1][sorted_ranks[1]]
+        + _TRIPLE_COLEX[2][sorted_ranks[2]]
+    )
+
+
+def _load_tables():
+    global OMAHA_UNSUITED_TABLE, _OMAHA_UNSUITED_ARRAY
+    evaluator.warm_up()
+    with _LOAD_LOCK:
+        if OMAHA_UNSUITED_TABLE is not None:
+            return
+        triples = np.array(
+            list(
+                itertools.combinations_with_replacement(
+                    range(NUM_CARD_RANKS), OMAHA_NUM_BOARD_CARDS_USED
+                )
+            ),
+            dtype=np.intp,
+        )
+        triple_index = sum(
+            _TRIPLE_COLEX_ARRAY[i, triples[:, i]]
+            for i in range(OMAHA_NUM_BOARD_CARDS_USED)
+        )
+        pairs = evaluator._HOLE_RANK_PAIRS
+        ranks = np.sort(
+            np.concatenate(
+                [
+                    np.broadcast_to(pairs[:, None, :], (len(pairs), len(triples), 2)),
+                    np.broadcast_to(triples[None, :, :], (len(pairs), len(triples), 3)),
+                ],
+                axis=2,
+            ),
+            axis=2,
+        )
+        index = evaluator._SIZE_OFFSET[MIN_EVAL_CARDS] + sum(
+            evaluator._COLEX_ARRAY[i, ranks[..., i]] for i in range(MIN_EVAL_CARDS)
+        )
+        table = np.zeros((NUM_RANK_PAIRS, NUM_RANK_TRIPLES), dtype=np.uint16)
+        table[:, triple_index] = evaluator._UNSUITED_ARRAY[index]
+        _OMAHA_UNSUITED_ARRAY = table.reshape(-1)
+        OMAHA_UNSUITED_TABLE = _OMAHA_UNSUITED_ARRAY.tolist()
+
+
+def _board_features(
+    board: Sequence[int],
+) -> Tuple[List[int], List[List[int]], List[int]]:
+    """
+    Returns
+    -------
+    rank triple index of every 3 board card combination, per suit the rank masks of
+    every suited 3 board card combination and the distinct low rank masks of
+    3 board card combinations holding 3 different low ranks
+    """
+    assert OMAHA_NUM_BOARD_CARDS_USED <= len(board) <= MIN_EVAL_CARDS, board
+    triples = [
+        _triple_index(sorted([first >> 2, second >> 2, third >> 2]))
+        for first, second, third in itertools.combinations(board, 3)
+    ]
+    suited_triple_masks: List[List[int]] = [[] for _ in range(NUM_CARD_SUITS)]
+    for suit in range(NUM_CARD_SUITS):
+        suited_board = [code >> 2 for code in board if code & 3 == suit]
+        for ranks in itertools.combinations(suited_board, 3):
+            suited_triple_masks[suit].append(
+                1 << ranks[0] | 1 << ranks[1] | 1 << ranks[2]
+            )
+    low_triple_masks = {
+        _LOW_BITS[first] | _LOW_BITS[second] | _LOW_BITS[third]
+        for first, second, third in itertools.combinations(board, 3)
+    }
+    return (
+        triples,
+        suited_triple_masks,
+        [mask for mask in low_triple_masks if mask.bit_count() == 3],
+    )
+
+
+def _evaluate_hole(
+    triples: List[int], suited_triple_masks: List[List[int]], hole: Sequence[int]
+) -> int:
+    assert len(hole) == PLO_NUM_PLAYER_CARDS, hole
+    table = OMAHA_UNSUITED_TABLE
+    assert table is not None
+    pair_index = evaluator._HOLE_PAIR_INDEX_LIST
+    flush_table = evaluator.FLUSH_TABLE
+    strength = 0
+    for first, second in itertools.combinations(hole, 2):
+        pair_offset = pair_index[first >> 2][second >> 2] * NUM_RANK_TRIPLES
+        strength = max(strength, max([table[pair_offset + t] for t in triples]))
+        if first & 3 == second & 3:
+            pair_mask = 1 << (first >> 2) | 1 << (second >> 2)
+            for triple_mask in suited_triple_masks[first & 3]:
+                strength = max(strength, flush_table[pair_mask | triple_mask])
+    return strength
+
+
+def evaluate_omaha(board: Sequence[int], hole: Sequence[int]) -> int:
+    """
+    Args
+    ----
+    board (Sequence[int]): 3 to 5 integer board card codes
+    hole (Sequence[int]): 4 integer hole card codes
+    Returns
+    -------
+    strength of the best hand using exactly 2 hole cards and 3 board cards, on the
+    same scale as evaluator.evaluate
+    """
+    if OMAHA_UNSUITED_TABLE is None:
+        _load_tables()
+    triples, suited_triple_masks, _ = _board_features(board)
+    return _evaluate_hole(triples, suited_triple_masks, hole)
+
+
+def _evaluate_low(low_triple_masks: List[int], hole: Sequence[int]) -> int:
+    assert len(hole) == PLO_NUM_PLAYER_CARDS, hole
+    strength = 0
+    for first, second in itertools.combinations(hole, 2):
+        pair_mask = _LOW_BITS[first] | _LOW_BITS[second]
+        if pair_mask.bit_count() == 2:
+            for triple_mask in low_triple_masks:
+                strength = max(strength, LOW_TABLE[pair_mask | triple_mask])
+    return strength
+
+
+def evaluate_omaha_low(board: Sequence[int], hole: Sequence[int]) -> int:
+    """
+    Returns
+    -------
+    eight or better low strength of the best hand using exactly 2 hole cards and
+    3 board cards. In [1, NUM_LOW_STRENGTHS] where larger is better (5-4-3-2-A is
+    best), 0 if the hand has no qualifying low.
+    """
+    _, _, low_triple_masks = _board_features(board)
+    return _evaluate_low(low_triple_masks, hole)
+
+
+def evaluate_omaha_hilo(
+    board: Sequence[int], holes: Sequence[Sequence[int]]
+) -> Tuple[List[int], List[int]]:
+    """
+    High and low strengths of every hole in one pass over the board.
+
+    Returns
+    -------
+    high strengths (see evaluate_omaha) and low strengths (see evaluate_omaha_low)
+    """
+    if OMAHA_UNSUITED_TABLE is None:
+        _load_tables()
+    triples, suited_triple_masks, low_triple_masks = _board_features(board)
+    highs = [_evaluate_hole(triples, suited_triple_masks, hole) for hole in holes]
+    lows = [_evaluate_low(low_triple_masks, hole) for hole in holes]
+    return highs, lows
+
+
+def _combination_cards(
+    boards: np.ndarray, holes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns
+    -------
+    (N, T, 3) sorted board triples and (N, K, 6, 2) hole pairs
+    """
+    boards = np.asarray(boards, dtype=np.intp)
+    holes = np.asarray(holes, dtype=np.intp)
+    assert boards.ndim == 2 and holes.ndim == 3, (boards.shape, holes.shape)
+    assert holes.shape[0] == boards.shape[0], (boards.shape, holes.shape)
+    assert holes.shape[2] == PLO_NUM_PLAYER_CARDS, holes.shape
+    assert OMAHA_NUM_BOARD_CARDS_USED <= boards.shape[1] <= MIN_EVAL_CARDS
+    triple_cards = np.sort(boards[:, _BOARD_COMBINATIONS[boards.shape[1]]], axis=2)
+    pair_cards = holes[:, :, _HOLE_COMBINATIONS]
+    return triple_cards, pair_cards
+
+
+def _high_batch(triple_cards: np.ndarray, pair_cards: np.ndarray) -> np.ndarray:
+    triple_index = sum(
+        _TRIPLE_COLEX_ARRAY[i, triple_cards[..., i] >> 2]
+        for i in range(OMAHA_NUM_BOARD_CARDS_USED)
+    )
+    pair_index = evaluator._HOLE_PAIR_INDEX[
+        pair_cards[..., 0] >> 2, pair_cards[..., 1] >> 2
+    ]
+    # (N, K, 6, T) strength of every 2 + 3 combination
+    strengths = _OMAHA_UNSUITED_ARRAY[
+        pair_index[..., None] * NUM_RANK_TRIPLES + triple_index[:, None, None, :]
+    ]
+
+    # Flushes need a suited hole pair and a board triple of the same suit
+    pair_suit = np.where(
+        (pair_cards[..., 0] & 3) == (pair_cards[..., 1] & 3), pair_cards[..., 0] & 3, -1
+    )
+    triple_suit = np.where(
+        ((triple_cards[..., 0] & 3) == (triple_cards[..., 1] & 3))
+        & ((triple_cards[..., 0] & 3) == (triple_cards[..., 2] & 3)),
+        triple_cards[..., 0] & 3,
+        -2,
+    )
+    suited = np.nonzero(pair_suit[..., None] == triple_suit[:, None, None, :])
+    if len(suited[0]):
+        board_idx, hole_idx, pair_idx, triple_idx = suited
+        triples = triple_cards[board_idx, triple_idx]
+        pairs = pair_cards[board_idx, hole_idx, pair_idx]
+        suit_masks = (
+            (1 << (triples[:, 0] >> 2))
+            | (1 << (triples[:, 1] >> 2))
+            | (1 << (triples[:, 2] >> 2))
+            | (1 << (pairs[:, 0] >> 2))
+            | (1 << (pairs[:, 1] >> 2))
+        )
+        strengths[suited] = np.maximum(
+            strengths[suited], evaluator._FLUSH_ARRAY[suit_masks]
+        )
+    return strengths.max(axis=(2, 3))
+
+
+def _low_batch(triple_cards: np.ndarray, pair_cards: np.ndarray) -> np.ndarray:
+    low_bits = _LOW_BITS_ARRAY[triple_cards]
+    triple_masks = low_bits[..., 0] | low_bits[..., 1] | low_bits[..., 2]
+    low_bits = _LOW_BITS_ARRAY[pair_cards]
+    pair_masks = low_bits[..., 0] | low_bits[..., 1]
+    return _LOW_ARRAY[pair_masks[..., None] | triple_masks[:, None, None, :]].max(
+        axis=(2, 3)
+    )
+
+
+def evaluate_omaha_batch(boards: np.ndarray, holes: np.ndarray) -> np.ndarray:
+    """
+    Vectorized version of evaluate_omaha.
+
+    Args
+    ----
+    boards (np.ndarray): (N, num_board_cards) integer card codes, 3 to 5 cards
+    holes (np.ndarray): (N, K, 4) integer card codes of K holes per board
+    Returns
+    -------
+    (N, K) hand strengths
+    """
+    if OMAHA_UNSUITED_TABLE is None:
+        _load_tables()
+    return _high_batch(*_combination_cards(boards, holes))
+
+
+def evaluate_omaha_hilo_batch(
+    boards: np.ndarray, holes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized version of evaluate_omaha_hilo (see evaluate_omaha_batch for shapes)
+
+    Returns
+    -------
+    (N, K) high strengths and (N, K) low strengths (0 is no low)
+    """
+    if OMAHA_UNSUITED_TABLE is None:
+        _load_tables()
+    triple_cards, pair_cards = _combination_cards(boards, holes)
+    return _high_batch(triple_cards, pair_cards), _low_batch(triple_cards, pair_cards)
+
+
+def rank_omaha_hands(board: Sequence[int], holes: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Omaha version of rules.rank_hands on integer card codes. Best hand is ranked 0
+    and tied hands share the same rank.
+    """
+    assert len(holes) > 0, holes
+    if OMAHA_UNSUITED_TABLE is None:
+        _load_tables()
+    triples, suited_triple_masks, _ = _board_features(board)
+    return strengths_to_ranks(
+        [_evaluate_hole(triples, suited_triple_masks, hole) for hole in holes]
+    )
+
+
+def rank_omaha_hands_batch(boards: np.ndarray, holes: np.ndarray) -> np.ndarray:
+    """
+    Returns
+    -------
+    (N, K) ranks of K holes on each of N boards (see evaluate_omaha_batch)
+    """
+    return strengths_to_ranks_batch(evaluate_omaha_batch(boards, holes))
@@ -0,0 +1,142 @@
+"""
+Pot splitting at showdown.
+
+Bets are split into a main pot and side pots by the distinct bet sizes of the
+players still contending for the pot. Each pot is shared by the best hands among
+the players who covered it. In hi-lo games each pot is halved between the best
+high and the best qualifying low hands (ties split the halves again, i.e.
+quarters), and the whole pot goes high when no eligible player has a low.
+
+Contributions are sorted once and swept from the smallest bet up, so building the
+pots is O(n log n) in the number of seats. Awarding them sweeps back down from the
+last side pot, adding the contenders eligible for each lower pot to the running
+best hands.
+
+Chips are integers. A pot that does not split evenly gives its odd chips one at a
+time to the winners in seat order (first seat left of the button first), and the
+high half of a hi-lo pot takes the odd chip of the halving.
+"""
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+__all__ = ["Pot", "side_pots", "split_pots"]
+
+
+class Pot(NamedTuple):
+    amount: int
+    eligible: List[int]
+
+
+def _pot_levels(
+    bets: Sequence[int], contenders: Sequence[int]
+) -> Tuple[List[int], List[Tuple[int, int]]]:
+    """
+    Returns
+    -------
+    (contenders sorted by bet, (pot size, index of the first eligible contender
+    in the sorted contenders) from the main pot to the last side pot)
+    """
+    assert len(contenders) > 0, contenders
+    order = sorted(contenders, key=bets.__getitem__)
+    sorted_bets = sorted(bets)
+    num_bets = len(sorted_bets)
+    levels: List[Tuple[int, int]] = []
+    prev_level = 0
+    # Bets before sorted_bets[j] are at most prev_level, fully in the previous pots
+    j = 0
+    for k, seat in enumerate(order):
+        level = bets[seat]
+        if k > 0 and level == prev_level:
+            continue
+        pot = 0
+        while j < num_bets and sorted_bets[j] <= level:
+            pot += sorted_bets[j] - prev_level
+            j += 1
+        pot += (num_bets - j) * (level - prev_level)
+        levels.append((int(pot), k))
+        prev_level = level
+    # Folded bets above every contender's bet go to the last pot
+    excess = sum(sorted_bets[j:]) - (num_bets - j) * prev_level
+    if excess > 0:
+        pot, k = levels[-1]
+        levels[-1] = (int(pot + excess), k)
+    return order, levels
+
+
+def side_pots(bets: Sequence[int], contenders: Sequence[int]) -> List[Pot]:
+    """
+    Args
+    ----
+    bets (Sequence[int]): total bet of every seat in the hand (including folded)
+    contenders (Sequence[int]): seats still contending for the pot
+    Returns
+    -------
+    main pot to the last side pot, eligible seats in contenders order
+    """
+    position = {seat: i for i, seat in enumerate(contenders)}
+    order, levels = _pot_levels(bets, contenders)
+    return [Pot(pot, sorted(order[k:], key=position.__getitem__)) for pot, k in levels]
+
+
+def _add_contender(strengths: Dict[int, int], winners: List[int], seat: int):
+    """
+    Add seat to the best hands so far (winners all share the same strength)
+    """
+    if len(winners) == 0 or strengths[seat] > strengths[winners[0]]:
+        winners.clear()
+        winners.append(seat)
+    elif strengths[seat] == strengths[winners[0]]:
+        winners.append(seat)
+
+
+def _share(
+    payouts: np.ndarray, amount: int, winners: List[int], position: Dict[int, int]
+):
+    base, odd_chips = divmod(amount, len(winners))
+    for i, seat in enumerate(sorted(winners, key=position.__getitem__)):
+        payouts[seat] += base + (i < odd_chips)
+
+
+def split_pots(
+    bets: Sequence[int],
+    high_strengths: Dict[int, int],
+    low_strengths: Optional[Dict[int, int]] = None,
+    seat_order: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """
+    Args
+    ----
+    bets (Sequence[int]): total bet of every seat in the hand (including folded)
+    high_strengths (Dict[int, int]): hand strength of every contending seat,
+        larger is better
+    low_strengths (Optional[Dict[int, int]]): hi-lo games only. Low strength of
+        every contending seat, larger is better and 0 is no qualifying low.
+    seat_order (Optional[Sequence[int]]): order in which winners receive odd
+        chips, every seat from the first seat left of the button. Defaults to
+        ascending seats.
+    Returns
+    -------
+    (num_seats,) integer amount won by every seat
+    """
+    if seat_order is None:
+        seat_order = range(len(bets))
+    position = {seat: i for i, seat in enumerate(seat_order)}
+    payouts = np.zeros(len(bets), dtype=np.int64)
+    order, levels = _pot_levels(bets, list(high_strengths.keys()))
+    high_winners: List[int] = []
+    low_winners: List[int] = []
+    # Every lower pot is eligible to the contenders of the pot above plus the
+    # contenders who bet exactly its level
+    num_eligible = len(order)
+    for pot, k in reversed(levels):
+        for seat in order[k:num_eligible]:
+            _add_contender(high_strengths, high_winners, seat)
+            if low_strengths is not None and low_strengths[seat] > 0:
+                _add_contender(low_strengths, low_winners, seat)
+        num_eligible = k
+        low_half = pot // 2 if len(low_winners) > 0 else 0
+        _share(payouts, pot - low_half, high_winners, position)
+        if low_half > 0:
+            _share(payouts, low_half, low_winners, position)
+    return payouts
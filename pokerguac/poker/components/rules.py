@@ -1,64 +1,70 @@
-from enum import Enum
+import numpy as np
 from typing import Tuple, OrderedDict, List, cast
 from abc import ABC, abstractmethod
 
 from .card import PokerCard, PokerSuit, PokerHand, PokerBoard, PokerHole
+from .constants import HandRanking
+from .evaluator import (
+    evaluate,
+    evaluate_batch,
+    strengths_to_ranks,
+    strengths_to_ranks_batch,
+)
 from .card_ops import (
     ace_sort,
     get_duplicate_cards,
     get_remainder_of_pairs,
-    lt_cards,
+    get_rank_key,
+    get_straight_high,
+    ACE,
+    KING,
 )
 
 
-class HandRanking(Enum):
-    ROYAL = 1
-    STRAIGHTFLUSH = 2
-    QUADS = 3
-    FULLHOUSE = 4
-    FLUSH = 5
-    STRAIGHT = 6
-    TRIPS = 7
-    TWOPAIR = 8
-    PAIR = 9
-    HIGH = 10
-
-    def __lt__(self, other):
-        if self.__class__ is other.__class__:
-            return self.value < other.value
-        return NotImplemented
-
-
-__all__ = ["rank_hands"]
+__all__ = ["rank_hands", "rank_hands_batch"]
 
 
 class HandType(ABC):
     final_hand: PokerHand
     name: HandRanking
+    sort_key: Tuple[int, ...]
 
-    def __init__(self, hand: PokerHand):
-        success, self.final_hand = self.check(list(hand))
-        assert success, (self.final_hand, hand)
+    def __init__(self, hand: PokerHand, checked: bool = False):
+        """
+        Args
+        ----
+        hand (PokerHand): cards to make the hand from
+        checked (bool): hand is already a final hand returned by check.
+            Skips running check a second time.
+        """
+        if checked:
+            self.final_hand = hand
+        else:
+            success, self.final_hand = self.check(list(hand))
+            assert success, (self.final_hand, hand)
+        # Computed once so that sorting hands is a plain tuple comparison
+        self.sort_key = (-self.name.value,) + self.tiebreak(self.final_hand)
 
     @classmethod
     @abstractmethod
     def check(cls, cards: List[PokerCard]) -> Tuple[bool, PokerHand]:
         raise NotImplementedError
 
-    @abstractmethod
+    @classmethod
+    def tiebreak(cls, final_hand: PokerHand) -> Tuple[int, ...]:
+        """
+        Key that orders two final hands of the same HandRanking
+        """
+        return get_rank_key(final_hand)
+
     def __lt__(self, other) -> bool:
         """
         Stronger Hand must be Larger
         """
-        if self.__class__ == other.__class__:
-            raise NotImplementedError
-        else:
-            return self.name > other.name
+        return self.sort_key < other.sort_key
 
     def __eq__(self, other) -> bool:
-        return self.__class__ == other.__class__ and sorted(self.final_hand) == sorted(
-            other.final_hand
-        )
+        return self.sort_key == other.sort_key
 
 
 class Royal(HandType):
@@ -73,17 +79,13 @@ class Royal(HandType):
 
     @classmethod
     def is_broadway(cls, cards: List[PokerCard]) -> bool:
-        ace = PokerCard("a", "s")
-        king = PokerCard("k", "s")
         straight, result = Straight.check(cards)
-        broadway = straight and ace in result and king in result
+        broadway = straight and ACE in result and KING in result
         return broadway
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            return False
-        else:
-            return self.name > other.name
+    @classmethod
+    def tiebreak(cls, final_hand: PokerHand) -> Tuple[int, ...]:
+        return ()
 
 
 class StraightFlush(HandType):
@@ -91,30 +93,12 @@ class StraightFlush(HandType):
 
     @classmethod
     def _all_straight_flush_cards(cls, cards: List[PokerCard]) -> List[PokerCard]:
-        sorted_cards = sorted(cards)
-        ace = PokerCard("a", "s")
-        king = PokerCard("k", "s")
-        straightflush_cards = []
-        for prev, curr in zip(sorted_cards[:-1], sorted_cards[1:]):
-            if curr - prev == 1 and prev.suit_eq(curr):
-                if prev not in straightflush_cards:
-                    straightflush_cards.append(prev)
-                straightflush_cards.append(curr)
-            elif len(straightflush_cards) >= 5:
-                break
-            else:
-                straightflush_cards = []
-
-        # Handle Broadway Straight
-        if king in straightflush_cards and ace in sorted_cards:
-            ace_card = None
-            for card in sorted_cards:
-                if card == ace and card.suit_eq(straightflush_cards[0]):
-                    ace_card = card
-            if ace_card is not None:
-                straightflush_cards.append(ace_card)
-
-        return ace_sort(straightflush_cards, straight=True)
+        # A straight flush is a straight among the cards of a single suit
+        for suit_index in range(4):
+            suited_cards = [card for card in cards if card.suit_index == suit_index]
+            if len(suited_cards) >= 5:
+                return Straight._all_straight_cards(suited_cards)
+        return []
 
     @classmethod
     def check(cls, cards: List[PokerCard]) -> Tuple[bool, PokerHand]:
@@ -128,11 +112,9 @@ class StraightFlush(HandType):
         result = cast(PokerHand, result)
         return straightflush, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            return lt_cards(self.final_hand, other.final_hand)
-        else:
-            return self.name > other.name
+    @classmethod
+    def tiebreak(cls, final_hand: PokerHand) -> Tuple[int, ...]:
+        return (get_straight_high(final_hand),)
 
 
 class Quads(HandType):
@@ -156,19 +138,6 @@ class Quads(HandType):
         result = cast(PokerHand, result)
         return quads, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            quads1 = get_duplicate_cards(list(self.final_hand), num_duplicate=4)
-            quads2 = get_duplicate_cards(list(other.final_hand), num_duplicate=4)
-            if quads1 == quads2:
-                remain1 = get_remainder_of_pairs(self.final_hand, quads1)
-                remain2 = get_remainder_of_pairs(other.final_hand, quads1)
-                return lt_cards(remain1, remain2)
-            else:
-                return lt_cards(quads1, quads2)
-        else:
-            return self.name > other.name
-
 
 class FullHouse(HandType):
     name: HandRanking = HandRanking.FULLHOUSE
@@ -201,20 +170,6 @@ class FullHouse(HandType):
         result = cast(PokerHand, result)
         return fullhouse, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            trips1 = get_duplicate_cards(list(self.final_hand), num_duplicate=3)
-            trips2 = get_duplicate_cards(list(other.final_hand), num_duplicate=3)
-
-            pair1 = get_duplicate_cards(list(self.final_hand), num_duplicate=2)
-            pair2 = get_duplicate_cards(list(other.final_hand), num_duplicate=2)
-            if trips1 == trips2:
-                return lt_cards(pair1, pair2)
-            else:
-                return lt_cards(trips1, trips2)
-        else:
-            return self.name > other.name
-
 
 class Flush(HandType):
     name: HandRanking = HandRanking.FLUSH
@@ -249,12 +204,6 @@ class Flush(HandType):
         result = cast(PokerHand, result)
         return flush, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            return lt_cards(list(self.final_hand), list(other.final_hand))
-        else:
-            return self.name > other.name
-
 
 class Straight(HandType):
     name: HandRanking = HandRanking.STRAIGHT
@@ -262,10 +211,13 @@ class Straight(HandType):
     @classmethod
     def _all_straight_cards(cls, cards: List[PokerCard]) -> List[PokerCard]:
         sorted_cards = sorted(cards)
-        ace = PokerCard("a", "s")
-        king = PokerCard("k", "s")
+        # One card per rank, paired cards must not break the run
+        unique_cards = sorted_cards[:1]
+        for card in sorted_cards[1:]:
+            if card != unique_cards[-1]:
+                unique_cards.append(card)
         straight_cards = []
-        for prev, curr in zip(sorted_cards[:-1], sorted_cards[1:]):
+        for prev, curr in zip(unique_cards[:-1], unique_cards[1:]):
             if curr - prev == 1:
                 if prev not in straight_cards:
                     straight_cards.append(prev)
@@ -276,10 +228,10 @@ class Straight(HandType):
                 straight_cards = []
 
         # Handle Broadway Straight
-        if king in straight_cards and ace in sorted_cards:
+        if KING in straight_cards and ACE in sorted_cards:
             ace_card = None
             for card in sorted_cards:
-                if card == ace:
+                if card == ACE:
                     ace_card = card
             assert ace_card is not None
             straight_cards.append(ace_card)
@@ -298,11 +250,9 @@ class Straight(HandType):
         result = cast(PokerHand, result)
         return straight, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            return lt_cards(self.final_hand, other.final_hand)
-        else:
-            return self.name > other.name
+    @classmethod
+    def tiebreak(cls, final_hand: PokerHand) -> Tuple[int, ...]:
+        return (get_straight_high(final_hand),)
 
 
 class Trips(HandType):
@@ -325,19 +275,6 @@ class Trips(HandType):
         result = cast(PokerHand, result)
         return trips, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            trips1 = get_duplicate_cards(list(self.final_hand), num_duplicate=3)[:-1]
-            trips2 = get_duplicate_cards(list(other.final_hand), num_duplicate=3)[:-1]
-            if trips1 == trips2:
-                remain1 = get_remainder_of_pairs(self.final_hand, trips1)
-                remain2 = get_remainder_of_pairs(other.final_hand, trips2)
-                return lt_cards(remain1, remain2)
-            else:
-                return lt_cards(trips1, trips2)
-        else:
-            return self.name > other.name
-
 
 class TwoPair(HandType):
     name: HandRanking = HandRanking.TWOPAIR
@@ -360,20 +297,6 @@ class TwoPair(HandType):
         result = cast(PokerHand, result)
         return twopair, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            pairs1 = get_duplicate_cards(list(self.final_hand), num_duplicate=2)[-2:]
-            pairs2 = get_duplicate_cards(list(other.final_hand), num_duplicate=2)[-2:]
-            if pairs1 == pairs2:
-                remain1 = get_remainder_of_pairs(self.final_hand, pairs1)
-                remain2 = get_remainder_of_pairs(other.final_hand, pairs2)
-                return lt_cards(remain1, remain2)
-            else:
-                return lt_cards(pairs1, pairs2)
-
-        else:
-            return self.name > other.name
-
 
 class Pair(HandType):
     name: HandRanking = HandRanking.PAIR
@@ -397,20 +320,6 @@ class Pair(HandType):
         result = cast(PokerHand, result)
         return pair, result
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            pairs1 = get_duplicate_cards(list(self.final_hand), num_duplicate=2)[-1:]
-            pairs2 = get_duplicate_cards(list(other.final_hand), num_duplicate=2)[-1:]
-            if pairs1 == pairs2:
-                remain1 = get_remainder_of_pairs(self.final_hand, pairs1)
-                remain2 = get_remainder_of_pairs(other.final_hand, pairs2)
-                return lt_cards(remain1, remain2)
-            else:
-                return lt_cards(pairs1, pairs2)
-
-        else:
-            return self.name > other.name
-
 
 class High(HandType):
     name: HandRanking = HandRanking.HIGH
@@ -420,12 +329,6 @@ class High(HandType):
         result = ace_sort(cards)[-5:]
         return True, cast(PokerHand, result)
 
-    def __lt__(self, other):
-        if self.__class__ == other.__class__:
-            return lt_cards(self.final_hand, other.final_hand)
-        else:
-            return self.name > other.name
-
 
 HANDRANKING_DICT = OrderedDict(
     {
@@ -457,41 +360,62 @@ def get_final_hand_made(
 
 
 def rank_hands(
-    board: PokerBoard, hands: List[PokerHole]
+    board: PokerBoard, hands: List[PokerHole], rank_only: bool = False
 ) -> Tuple[List[int], List[HandType]]:
+    """
+    Rank hands with the lookup evaluator. Best hand is ranked 0 and tied hands share
+    the same rank. HandType objects are built with the reference (slow) path and are
+    only returned for display.
+
+    Args
+    ----
+    board (PokerBoard): 5 board cards
+    hands (List[PokerHole]): holes to rank
+    rank_only (bool): only compute ranks. Returned final hands will be empty.
+    """
     assert len(board) == 5, board
     assert len(hands) > 0, hands
     for card in board:
         assert card is not None
     final_board = cast(PokerHand, list(board))
+    board_codes = [card.code for card in final_board]
 
-    hand_types: List[HandRanking] = []
+    strengths: List[int] = []
     final_hands: List[HandType] = []
 
     for hand in hands:
-        hand_type, final_hand = get_final_hand_made(final_board, hand)
-        hand_types.append(hand_type)
-        final_hands.append(HANDRANKING_DICT[hand_type](final_hand))
-    if len(hands) == 1:
-        ranks = [0]
-    else:
-        indices = list(range(len(hands)))
-        sorted_results = sorted(
-            zip(indices, final_hands), reverse=True, key=lambda x: x[1]
-        )
-        ranks = [-1] * len(hands)
-        rank = 0
-        tie_count = 1
-        for index in range(len(sorted_results) - 1):
-            i, hand = sorted_results[index]
-            ranks[i] = rank
-            next_i, next_hand = sorted_results[index + 1]
-            if hand != next_hand:
-                rank += tie_count
-                tie_count = 1
-            else:
-                tie_count += 1
-            if index == len(sorted_results) - 2:
-                # Make sure to add rank for last hand
-                ranks[next_i] = rank
+        strengths.append(evaluate(board_codes + [card.code for card in hand]))
+        if not rank_only:
+            hand_type, final_hand = get_final_hand_made(final_board, hand)
+            final_hands.append(HANDRANKING_DICT[hand_type](final_hand, checked=True))
+    ranks = strengths_to_ranks(strengths)
     return ranks, final_hands
+
+
+def rank_hands_batch(
+    boards: np.ndarray, holes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank hands of many showdowns at once.
+
+    Args
+    ----
+    boards (np.ndarray): (N, 5) integer card codes of N boards
+    holes (np.ndarray): (N, K, 2) integer card codes of K holes per board
+    Returns
+    -------
+    (N, K) hand strengths (larger is stronger) and (N, K) ranks (0 is best)
+    """
+    boards = np.asarray(boards)
+    holes = np.asarray(holes)
+    assert boards.ndim == 2 and boards.shape[1] == 5, boards.shape
+    assert holes.ndim == 3 and holes.shape[0] == boards.shape[0], holes.shape
+    assert holes.shape[2] == 2, holes.shape
+    assert holes.shape[1] > 0, holes.shape
+    num_boards, num_holes, _ = holes.shape
+    all_cards = np.concatenate(
+        [np.broadcast_to(boards[:, None, :], (num_boards, num_holes, 5)), holes],
+        axis=2,
+    )
+    strengths = evaluate_batch(all_cards)
+    return strengths, strengths_to_ranks_batch(strengths)
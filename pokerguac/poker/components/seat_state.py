@@ -0,0 +1,130 @@
+from typing import Iterator, Optional
+
+
+__all__ = ["SeatState"]
+
+
+class SeatState:
+    """
+    Status of every seat of a table held as integer bitsets (bit i is seat i),
+    updated by the seated players on every status or stack change. Counting
+    players and finding the next seat to act are single integer operations.
+        * occupied: a player is seated
+        * living: not eliminated
+        * joining: can receive a new hand
+        * alive: participating in the current hand (can be all-in)
+        * active: can take action
+        * waiting: waiting to act in the current stage
+        * raising: raised and is not all-in
+    """
+
+    __slots__ = (
+        "num_seats",
+        "occupied",
+        "living",
+        "joining",
+        "alive",
+        "active",
+        "waiting",
+        "raising",
+    )
+
+    num_seats: int
+    occupied: int
+    living: int
+    joining: int
+    alive: int
+    active: int
+    waiting: int
+    raising: int
+
+    def __init__(self, num_seats: int):
+        self.num_seats = num_seats
+        self.occupied = 0
+        self.living = 0
+        self.joining = 0
+        self.alive = 0
+        self.active = 0
+        self.waiting = 0
+        self.raising = 0
+
+    def update(
+        self,
+        seat: int,
+        living: bool,
+        joining: bool,
+        alive: bool,
+        active: bool,
+        waiting: bool,
+        raising: bool,
+    ):
+        bit = 1 << seat
+        self.occupied |= bit
+        self.living = self.living | bit if living else self.living & ~bit
+        self.joining = self.joining | bit if joining else self.joining & ~bit
+        self.alive = self.alive | bit if alive else self.alive & ~bit
+        self.active = self.active | bit if active else self.active & ~bit
+        self.waiting = self.waiting | bit if waiting else self.waiting & ~bit
+        self.raising = self.raising | bit if raising else self.raising & ~bit
+
+    def remove(self, seat: int):
+        """
+        Clear every bit of seat when its player leaves the table
+        """
+        mask = ~(1 << seat)
+        self.occupied &= mask
+        self.living &= mask
+        self.joining &= mask
+        self.alive &= mask
+        self.active &= mask
+        self.waiting &= mask
+        self.raising &= mask
+
+    @property
+    def empty(self) -> int:
+        return ((1 << self.num_seats) - 1) & ~self.occupied
+
+    @property
+    def num_empty(self) -> int:
+        return self.num_seats - self.occupied.bit_count()
+
+    @property
+    def num_living(self) -> int:
+        return self.living.bit_count()
+
+    @property
+    def num_joining(self) -> int:
+        return self.joining.bit_count()
+
+    @property
+    def num_alive(self) -> int:
+        return self.alive.bit_count()
+
+    @property
+    def num_active(self) -> int:
+        return self.active.bit_count()
+
+    @property
+    def num_raising(self) -> int:
+        return self.raising.bit_count()
+
+    @staticmethod
+    def seats(bits: int) -> Iterator[int]:
+        """
+        Seats of a bitset in ascending order
+        """
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def next_seat(self, bits: int, seat: int) -> Optional[int]:
+        """
+        First seat of bits after seat, wrapping around the table (seat itself
+        last). None if bits is empty.
+        """
+        if bits == 0:
+            return None
+        after = bits >> (seat + 1) << (seat + 1)
+        bits = after if after else bits
+        return (bits & -bits).bit_length() - 1
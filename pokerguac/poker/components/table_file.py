@@ -0,0 +1,183 @@
+"""
+Versioned binary file format for precomputed lookup tables.
+
+Layout
+------
+    8 bytes    magic (b"PGTABLE\\0")
+    4 bytes    little endian uint32 header length
+    header     utf-8 json: {
+                   "format_version": int, "name": str, "version": int,
+                   "arrays": {array_name: {"dtype", "shape", "offset"}},
+                   "meta": {...},
+               }
+    data       raw little endian arrays, each aligned to TABLE_ALIGNMENT bytes
+
+Files are opened read-only with mmap so every process that loads the same table
+shares the same physical pages instead of keeping a private copy.
+"""
+import os
+import json
+import mmap
+import struct
+import numpy as np
+from typing import Any, Dict, Mapping, Optional
+
+
+__all__ = ["TableFile", "save_table_file", "load_table_file", "TableVersionError"]
+
+TABLE_MAGIC = b"PGTABLE\0"
+TABLE_FORMAT_VERSION = 1
+TABLE_ALIGNMENT = 64
+
+
+class TableVersionError(ValueError):
+    """
+    Table file exists but was written for another table name or version
+    """
+
+
+class TableFile:
+    """
+    Read-only memory mapped table file. Arrays are numpy views on the mapping.
+    """
+
+    name: str
+    version: int
+    arrays: Dict[str, np.ndarray]
+    meta: Dict[str, Any]
+
+    def __init__(
+        self,
+        buffer: Optional[mmap.mmap],
+        name: str,
+        version: int,
+        arrays: Dict[str, np.ndarray],
+        meta: Dict[str, Any],
+    ):
+        self._buffer = buffer
+        self.name = name
+        self.version = version
+        self.arrays = arrays
+        self.meta = meta
+
+    def __getitem__(self, array_name: str) -> np.ndarray:
+        return self.arrays[array_name]
+
+
+def _aligned(offset: int) -> int:
+    return (offset + TABLE_ALIGNMENT - 1) // TABLE_ALIGNMENT * TABLE_ALIGNMENT
+
+
+def save_table_file(
+    path: str,
+    name: str,
+    version: int,
+    arrays: Mapping[str, np.ndarray],
+    meta: Optional[Dict[str, Any]] = None,
+):
+    """
+    Atomically write arrays to path. Concurrent writers never leave a partially
+    written table behind since the file is renamed into place when complete.
+    """
+    arrays = {
+        array_name: np.ascontiguousarray(
+            array, dtype=np.dtype(array.dtype).newbyteorder("<")
+        )
+        for array_name, array in arrays.items()
+    }
+
+    def make_header(data_start: int) -> bytes:
+        offset = data_start
+        array_headers = {}
+        for array_name, array in arrays.items():
+            array_headers[array_name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            offset = _aligned(offset + array.nbytes)
+        header = {
+            "format_version": TABLE_FORMAT_VERSION,
+            "name": name,
+            "version": version,
+            "arrays": array_headers,
+            "meta": meta or {},
+        }
+        return json.dumps(header).encode("utf-8")
+
+    # Offsets are stored in the header, so grow the data start until it fits
+    data_start = TABLE_ALIGNMENT
+    header = make_header(data_start)
+    while len(TABLE_MAGIC) + 4 + len(header) > data_start:
+        data_start = _aligned(len(TABLE_MAGIC) + 4 + len(header))
+        header = make_header(data_start)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(TABLE_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for array_name, array in arrays.items():
+            f.seek(json.loads(header)["arrays"][array_name]["offset"])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+
+def _parse_table_file(
+    path: str, buffer: mmap.mmap, name: Optional[str], version: Optional[int]
+) -> TableFile:
+    if buffer[: len(TABLE_MAGIC)] != TABLE_MAGIC:
+        raise TableVersionError(f"{path} is not a table file")
+    (header_len,) = struct.unpack_from("<I", buffer, len(TABLE_MAGIC))
+    header_start = len(TABLE_MAGIC) + 4
+    header = json.loads(bytes(buffer[header_start : header_start + header_len]))
+    if header["format_version"] != TABLE_FORMAT_VERSION:
+        raise TableVersionError(
+            f"{path} has table format {header['format_version']}"
+            f" != {TABLE_FORMAT_VERSION}"
+        )
+    if (name is not None and header["name"] != name) or (
+        version is not None and header["version"] != version
+    ):
+        raise TableVersionError(
+            f"{path} holds {header['name']} v{header['version']},"
+            f" expected {name} v{version}"
+        )
+
+    arrays = {}
+    for array_name, array_header in header["arrays"].items():
+        dtype = np.dtype(array_header["dtype"])
+        shape = tuple(array_header["shape"])
+        count = int(np.prod(shape))
+        arrays[array_name] = np.frombuffer(
+            buffer, dtype=dtype, count=count, offset=array_header["offset"]
+        ).reshape(shape)
+    return TableFile(buffer, header["name"], header["version"], arrays, header["meta"])
+
+
+def load_table_file(
+    path: str, name: Optional[str] = None, version: Optional[int] = None
+) -> TableFile:
+    """
+    Memory map a table file.
+
+    Raises
+    ------
+    FileNotFoundError if path does not exist and TableVersionError if the file was
+    written with another format, table name or table version, or is empty,
+    truncated or otherwise corrupt.
+    """
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as error:
+            # mmap refuses empty files
+            raise TableVersionError(f"{path} is empty") from error
+    try:
+        return _parse_table_file(path, buffer, name, version)
+    except TableVersionError:
+        raise
+    except (ValueError, KeyError, TypeError, struct.error) as error:
+        # json.JSONDecodeError and short np.frombuffer reads are ValueErrors
+        raise TableVersionError(f"{path} is not a valid table file") from error
@@ -0,0 +1,309 @@
+"""
+Card abstraction: hands bucketed by their hand strength distribution per street.
+
+For every isomorphic hole + flop and hole + turn the pipeline computes the
+histogram of the river hand strength (win + tie / 2 against a random hand) over
+every runout, plus EHS and EHS^2. Histograms are clustered with k-means on their
+cumulative distributions (the L2 analogue of the earth mover's distance, so hands
+with similar strength distributions share a bucket) and the bucket ids are
+written to a memory mapped table per street (with EHS and EHS^2 as float16):
+    python -m pokerguac.poker.gto.abstraction --street flop --buckets 200
+Histograms are checkpointed per canonical board, an interrupted build resumes.
+
+bucket(hole, board) is then
+    * preflop: the 169 preflop classes (lossless)
+    * flop / turn: one lookup in the street's bucket table
+    * river: the hand strength against a random hand split into equal width
+      buckets, computed once per board for every hole with a sort based showdown
+"""
+import os
+import shutil
+import argparse
+import numpy as np
+from functools import lru_cache, partial
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..components.card import PokerCard, PokerHole, PokerBoard
+from ..components.card_mask import CardMask
+from ..components.constants import NUM_FLOP_CARDS, NUM_TURN_CARDS
+from ..components.table_file import TableFile, load_table_file, save_table_file
+from .hand_range import HOLE_BITS, HOLE_CODES, Range, hole_index, river_showdown
+from .isomorphism import HandIndexer, get_indexer, preflop_index
+from .pipeline import ItemResult, run_checkpointed
+from .probabilities import runout_showdowns
+
+
+__all__ = ["bucket", "load_buckets", "generate_buckets", "NUM_RIVER_BUCKETS"]
+
+BUCKET_TABLE_NAME = "buckets"
+BUCKET_TABLE_VERSION = 1
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+NUM_BOARD_CARDS = 5
+STREET_BOARD_CARDS = {"flop": NUM_FLOP_CARDS, "turn": NUM_FLOP_CARDS + NUM_TURN_CARDS}
+# Histogram bins per street, counts fit in the histogram dtype
+NUM_HISTOGRAM_BINS = {"flop": 50, "turn": 10}
+HISTOGRAM_DTYPES = {"flop": np.uint16, "turn": np.uint8}
+DEFAULT_NUM_BUCKETS = 200
+NUM_RIVER_BUCKETS = 50
+# k-means is fit on a random sample of histograms and then assigns every row
+KMEANS_SAMPLE_SIZE = 1 << 18
+KMEANS_NUM_ITERATIONS = 50
+ASSIGN_BATCH_SIZE = 1 << 16
+DEFAULT_SEED = 0
+
+BOARD_INDEXERS = {
+    street: HandIndexer([num_board_cards])
+    for street, num_board_cards in STREET_BOARD_CARDS.items()
+}
+
+# Street name -> loaded bucket table and its bucket array
+_TABLES: Dict[str, TableFile] = {}
+_BUCKETS: Dict[str, np.ndarray] = {}
+
+
+def get_bucket_path(street: str, table_dir: Optional[str] = None) -> str:
+    return os.path.join(
+        TABLE_DIR if table_dir is None else table_dir,
+        f"{BUCKET_TABLE_NAME}_{street}_v{BUCKET_TABLE_VERSION}.bin",
+    )
+
+
+def load_buckets(street: str, path: Optional[str] = None) -> TableFile:
+    """
+    Memory map the bucket table of street ("flop" or "turn")
+
+    Raises
+    ------
+    FileNotFoundError if the table was not generated yet
+    """
+    assert street in STREET_BOARD_CARDS, street
+    if street not in _TABLES or path is not None:
+        table = load_table_file(
+            get_bucket_path(street) if path is None else path,
+            f"{BUCKET_TABLE_NAME}_{street}",
+            BUCKET_TABLE_VERSION,
+        )
+        _BUCKETS[street] = table["buckets"]
+        _TABLES[street] = table
+    return _TABLES[street]
+
+
+@lru_cache(maxsize=256)
+def _river_buckets(board_codes: Tuple[int, ...]) -> List[int]:
+    board: PokerBoard = [PokerCard.from_code(code) for code in board_codes]
+    wins, ties, _ = river_showdown(board, Range())
+    hand_strength = wins + ties / 2
+    return (
+        np.minimum(hand_strength * NUM_RIVER_BUCKETS, NUM_RIVER_BUCKETS - 1)
+        .astype(int)
+        .tolist()
+    )
+
+
+def bucket(hole: PokerHole, board: PokerBoard) -> int:
+    """
+    Bucket of hole on board (empty board slots are None) in the current street's
+    abstraction
+    """
+    hole_codes = [card.code for card in hole]
+    board_codes = [card.code for card in board if card is not None]
+    if len(board_codes) == 0:
+        return preflop_index(hole_codes)
+    if len(board_codes) == NUM_BOARD_CARDS:
+        return _river_buckets(tuple(sorted(board_codes)))[hole_index(hole)]
+    street = "flop" if len(board_codes) == NUM_FLOP_CARDS else "turn"
+    if street not in _BUCKETS:
+        load_buckets(street)
+    index = get_indexer(len(board_codes)).index(hole_codes + board_codes)
+    return int(_BUCKETS[street][index])
+
+
+def _street_features(street: str, board_index: int) -> ItemResult:
+    """
+    Returns
+    -------
+    (board class, river hand strength histogram and (ehs, ehs2) of every hole +
+    board index of the canonical board)
+    """
+    board = BOARD_INDEXERS[street].unindex(board_index)
+    hole_rows = np.flatnonzero((HOLE_BITS & CardMask.from_codes(board).bits) == 0)
+    _, wins, ties, alive = runout_showdowns(board)
+    wins, ties, alive = wins[:, hole_rows], ties[:, hole_rows], alive[:, hole_rows]
+    hand_strength = wins + ties / 2
+    num_bins = NUM_HISTOGRAM_BINS[street]
+    bins = np.minimum(hand_strength * num_bins, num_bins - 1).astype(np.intp)
+    histograms = np.stack(
+        [((bins == i) & alive).sum(axis=0) for i in range(num_bins)], axis=1
+    )
+    num_runouts = alive.sum(axis=0)
+    ehs = np.stack(
+        [
+            hand_strength.sum(axis=0) / num_runouts,
+            (hand_strength**2).sum(axis=0) / num_runouts,
+        ],
+        axis=1,
+    )
+    indexer = get_indexer(len(board))
+    indices = np.array(
+        [indexer.index(hole + board) for hole in HOLE_CODES[hole_rows].tolist()]
+    )
+    return board_index, {"histograms": (indices, histograms), "ehs": (indices, ehs)}
+
+
+def _cumulative(histograms: np.ndarray) -> np.ndarray:
+    histograms = histograms.astype(np.float64)
+    return np.cumsum(histograms, axis=1) / histograms.sum(axis=1, keepdims=True)
+
+
+def _nearest(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    distances = (
+        (points**2).sum(axis=1)[:, None]
+        - 2 * points @ centroids.T
+        + (centroids**2).sum(axis=1)[None, :]
+    )
+    return distances.argmin(axis=1)
+
+
+def _kmeans(
+    points: np.ndarray, num_clusters: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    k-means++ initialized Lloyd iterations
+
+    Returns
+    -------
+    (num_clusters, dim) centroids sorted by their mean (so buckets are ordered
+    from weak to strong hands)
+    """
+    centroids = [points[rng.integers(len(points))]]
+    distances = ((points - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(1, num_clusters):
+        if distances.sum() == 0:
+            centroids.append(points[rng.integers(len(points))])
+            continue
+        centroid = points[rng.choice(len(points), p=distances / distances.sum())]
+        centroids.append(centroid)
+        distances = np.minimum(distances, ((points - centroid) ** 2).sum(axis=1))
+    centroids = np.array(centroids)
+    for _ in range(KMEANS_NUM_ITERATIONS):
+        labels = _nearest(points, centroids)
+        new_centroids = centroids.copy()
+        for cluster in range(num_clusters):
+            members = points[labels == cluster]
+            if len(members) > 0:
+                new_centroids[cluster] = members.mean(axis=0)
+        if np.allclose(new_centroids, centroids):
+            break
+        centroids = new_centroids
+    # Larger cumulative distributions are weaker hands
+    return centroids[np.argsort(-centroids.sum(axis=1))]
+
+
+def _assign_buckets(
+    histograms: np.ndarray, num_buckets: int, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(
+        len(histograms), min(len(histograms), KMEANS_SAMPLE_SIZE), replace=False
+    )
+    centroids = _kmeans(_cumulative(histograms[np.sort(sample)]), num_buckets, rng)
+    dtype = np.uint8 if num_buckets <= 1 << 8 else np.uint16
+    buckets = np.zeros(len(histograms), dtype=dtype)
+    for start in range(0, len(histograms), ASSIGN_BATCH_SIZE):
+        points = _cumulative(histograms[start : start + ASSIGN_BATCH_SIZE])
+        buckets[start : start + len(points)] = _nearest(points, centroids)
+    return buckets, centroids
+
+
+def generate_buckets(
+    street: str,
+    num_buckets: int = DEFAULT_NUM_BUCKETS,
+    path: Optional[str] = None,
+    work_dir: Optional[str] = None,
+    num_workers: int = 1,
+    board_indices: Optional[Iterable[int]] = None,
+    seed: int = DEFAULT_SEED,
+    verbose: bool = False,
+) -> bool:
+    """
+    Build the bucket table of street, resuming from the checkpoints in work_dir.
+
+    Args
+    ----
+    street (str): "flop" or "turn"
+    num_buckets (int): number of k-means clusters
+    path (Optional[str]): table file written once every board is done
+    work_dir (Optional[str]): checkpoint directory, defaults to path + ".work".
+        Removed after the table is written.
+    num_workers (int): number of processes computing histograms
+    board_indices (Optional[Iterable[int]]): only compute these canonical boards
+        (BOARD_INDEXERS[street] classes)
+    seed (int): seed of the k-means sample and initialization
+    verbose (bool): show progress
+    Returns
+    -------
+    whether every board is done and the table was written
+    """
+    assert street in STREET_BOARD_CARDS, street
+    assert 0 < num_buckets <= 1 << 16, num_buckets
+    path = get_bucket_path(street) if path is None else path
+    work_dir = f"{path}.work" if work_dir is None else work_dir
+    size = get_indexer(STREET_BOARD_CARDS[street]).size
+    num_boards = BOARD_INDEXERS[street].size
+    arrays, complete = run_checkpointed(
+        work_dir,
+        {
+            "histograms": (
+                (size, NUM_HISTOGRAM_BINS[street]),
+                HISTOGRAM_DTYPES[street],
+            ),
+            "ehs": ((size, 2), np.float32),
+        },
+        num_boards,
+        partial(_street_features, street),
+        board_indices,
+        num_workers,
+        desc=f"{street} boards",
+        verbose=verbose,
+    )
+    if not complete:
+        return False
+    buckets, centroids = _assign_buckets(arrays["histograms"], num_buckets, seed)
+    save_table_file(
+        path,
+        f"{BUCKET_TABLE_NAME}_{street}",
+        BUCKET_TABLE_VERSION,
+        {
+            "buckets": buckets,
+            "centroids": centroids.astype(np.float32),
+            "ehs": np.array(arrays["ehs"], dtype=np.float16),
+        },
+        {"num_buckets": num_buckets, "seed": seed},
+    )
+    del arrays
+    shutil.rmtree(work_dir)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a card abstraction")
+    parser.add_argument("--street", choices=list(STREET_BOARD_CARDS), required=True)
+    parser.add_argument("--buckets", type=int, default=DEFAULT_NUM_BUCKETS)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    generate_buckets(
+        args.street,
+        args.buckets,
+        args.output,
+        args.work_dir,
+        num_workers=args.workers,
+        seed=args.seed,
+        verbose=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
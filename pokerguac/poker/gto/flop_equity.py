@@ -0,0 +1,189 @@
+"""
+Precomputed flop equity of every isomorphic hole + flop against a random hand.
+
+The table is indexed by FLOP_INDEXER (1,286,792 entries) and stores
+    * win, tie: probability of winning / tying against a random villain hole over
+      every turn + river runout
+    * ehs: expected hand strength, the mean over runouts of the river hand
+      strength (win + tie / 2 against every villain hole)
+    * ehs2: mean over runouts of the squared river hand strength, larger than
+      ehs ** 2 for drawing hands
+The table is not shipped (about 20 MB), build it once with
+    python -m pokerguac.poker.gto.flop_equity --workers 8
+Every canonical flop (1755 classes) computes all its holes at once. Finished flops
+are checkpointed to a work directory, so an interrupted build resumes where it
+stopped.
+"""
+import os
+import shutil
+import argparse
+import numpy as np
+from math import comb
+from typing import Optional, Sequence, Tuple
+
+from ..components.card import PokerHole, PokerBoard
+from ..components.card_mask import CardMask
+from ..components.constants import HOLDEM_NUM_PLAYER_CARDS, NUM_FLOP_CARDS
+from ..components.table_file import TableFile, load_table_file, save_table_file
+from .hand_range import HOLE_BITS, HOLE_CODES
+from .isomorphism import FLOP_INDEXER, HandIndexer
+from .pipeline import ItemResult, run_checkpointed
+from .probabilities import runout_showdowns
+
+
+__all__ = [
+    "flop_equity",
+    "load_flop_equity",
+    "generate_flop_equity",
+    "FlopEquity",
+]
+
+FLOP_EQUITY_TABLE_NAME = "flop_equity"
+FLOP_EQUITY_TABLE_VERSION = 1
+FLOP_EQUITY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "tables",
+    f"{FLOP_EQUITY_TABLE_NAME}_v{FLOP_EQUITY_TABLE_VERSION}.bin",
+)
+FLOP_EQUITY_VALUES = ("win", "tie", "ehs", "ehs2")
+NUM_BOARD_CARDS = 5
+NUM_RUNOUT_CARDS = NUM_BOARD_CARDS - NUM_FLOP_CARDS
+# Runouts of a hole + flop
+NUM_FLOP_RUNOUTS = comb(52 - NUM_FLOP_CARDS - HOLDEM_NUM_PLAYER_CARDS, NUM_RUNOUT_CARDS)
+
+FLOP_ONLY_INDEXER = HandIndexer([NUM_FLOP_CARDS])
+
+FlopEquity = Tuple[float, float, float, float]
+
+# Filled by load_flop_equity()
+_TABLE: Optional[TableFile] = None
+_VALUES: np.ndarray
+
+
+def load_flop_equity(path: Optional[str] = None) -> TableFile:
+    """
+    Memory map the flop equity table used by flop_equity.
+
+    Args
+    ----
+    path (Optional[str]): table file. Defaults to FLOP_EQUITY_PATH
+    Raises
+    ------
+    FileNotFoundError if the table was not generated yet
+    """
+    global _TABLE, _VALUES
+    if _TABLE is None or path is not None:
+        table = load_table_file(
+            FLOP_EQUITY_PATH if path is None else path,
+            FLOP_EQUITY_TABLE_NAME,
+            FLOP_EQUITY_TABLE_VERSION,
+        )
+        _VALUES = table["values"]
+        _TABLE = table
+    return _TABLE
+
+
+def flop_equity(hole: PokerHole, board: PokerBoard) -> FlopEquity:
+    """
+    Returns
+    -------
+    (win, tie, ehs, ehs2) of hole on the flop of board against a random hand
+    """
+    if _TABLE is None:
+        load_flop_equity()
+    codes = [card.code for card in hole] + [
+        card.code for card in board[:NUM_FLOP_CARDS]  # type: ignore
+    ]
+    win, tie, ehs, ehs2 = _VALUES[FLOP_INDEXER.index(codes)].tolist()
+    return win, tie, ehs, ehs2
+
+
+def _flop_values(flop_index: int) -> ItemResult:
+    """
+    Returns
+    -------
+    (flop_index, FLOP_INDEXER index and (4,) win, tie, ehs, ehs2 of every hole not
+    sharing a card with the flop)
+    """
+    flop = FLOP_ONLY_INDEXER.unindex(flop_index)
+    hole_rows = np.flatnonzero((HOLE_BITS & CardMask.from_codes(flop).bits) == 0)
+    _, wins, ties, _ = runout_showdowns(flop)
+    hand_strength = wins + ties / 2
+    values = np.stack(
+        [
+            wins.sum(axis=0),
+            ties.sum(axis=0),
+            hand_strength.sum(axis=0),
+            (hand_strength**2).sum(axis=0),
+        ],
+        axis=1,
+    )
+    values = values[hole_rows] / NUM_FLOP_RUNOUTS
+    indices = np.array(
+        [FLOP_INDEXER.index(hole + flop) for hole in HOLE_CODES[hole_rows].tolist()]
+    )
+    return flop_index, {"values": (indices, values)}
+
+
+def generate_flop_equity(
+    path: str = FLOP_EQUITY_PATH,
+    work_dir: Optional[str] = None,
+    num_workers: int = 1,
+    flop_indices: Optional[Sequence[int]] = None,
+    verbose: bool = False,
+) -> bool:
+    """
+    Build the flop equity table, resuming from the checkpoints in work_dir.
+
+    Args
+    ----
+    path (str): table file written once every flop is done
+    work_dir (Optional[str]): checkpoint directory, defaults to path + ".work".
+        Removed after the table is written.
+    num_workers (int): number of processes computing flops
+    flop_indices (Optional[Sequence[int]]): only compute these FLOP_ONLY_INDEXER
+        classes (i.e. to spread the build over several runs)
+    verbose (bool): show progress
+    Returns
+    -------
+    whether every flop is done and the table was written
+    """
+    work_dir = f"{path}.work" if work_dir is None else work_dir
+    arrays, complete = run_checkpointed(
+        work_dir,
+        {"values": ((FLOP_INDEXER.size, len(FLOP_EQUITY_VALUES)), np.float32)},
+        FLOP_ONLY_INDEXER.size,
+        _flop_values,
+        flop_indices,
+        num_workers,
+        desc="flops",
+        verbose=verbose,
+    )
+    if not complete:
+        return False
+    meta = {"values": list(FLOP_EQUITY_VALUES)}
+    save_table_file(
+        path,
+        FLOP_EQUITY_TABLE_NAME,
+        FLOP_EQUITY_TABLE_VERSION,
+        {"values": np.array(arrays["values"])},
+        meta,
+    )
+    del arrays
+    shutil.rmtree(work_dir)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the flop equity table")
+    parser.add_argument("--output", default=FLOP_EQUITY_PATH)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    generate_flop_equity(
+        args.output, args.work_dir, num_workers=args.workers, verbose=True
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+Hand ranges as weights over the 1326 hole combinations.
+
+Holes are indexed in HOLE_CODES order (itertools.combinations of card codes), so a
+range is a (1326,) weight vector and dead cards, unions and equities are vector
+operations. Ranges are written in the usual notation, comma separated:
+    "QQ", "TT+", "99-66"           pairs
+    "AKs", "ATs+", "A5s-A2s"       suited hands (kicker ranges)
+    "KQo", "K9o+", "AK"            offsuit / suited and offsuit hands
+    "AhKh"                         a single combination
+    "AKs:0.5"                      any of the above with a weight
+
+Showdowns against a range are sort based: on a river board every hole is scored
+once and sorted by strength. The villain weight a hero beats is the cumulative
+weight below its strength minus the cumulative weight of the villain holes holding
+either hero card (card removal), read from one cumulative sum per card, so every
+hero hole is scored at once without comparing pairs of holes.
+"""
+import itertools
+import numpy as np
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
+
+from ..components.card import PokerCard, PokerHole, PokerBoard
+from ..components.card_mask import CardMask
+from ..components.constants import (
+    HOLDEM_NUM_PLAYER_CARDS,
+    NUM_CARD_RANKS,
+    NUM_CARD_SUITS,
+)
+from ..components.evaluator import evaluate_holes_batch
+from .isomorphism import RANK_NAMES
+
+
+__all__ = [
+    "Range",
+    "HOLE_CODES",
+    "NUM_HOLES",
+    "hole_index",
+    "range_equity",
+    "river_showdown",
+    "showdown_weights",
+]
+
+HOLE_CODES = CardMask.full().combination_codes(2).astype(np.intp)
+NUM_HOLES = len(HOLE_CODES)
+HOLE_BITS = (np.int64(1) << HOLE_CODES.astype(np.int64)).sum(axis=1)
+SUIT_NAMES = "cdhs"
+NUM_DECK_CARDS = 52
+NUM_BOARD_CARDS = 5
+# Runouts enumerated by range_equity before it samples them instead
+MAX_EQUITY_RUNOUTS = 1 << 11
+# Maximum number of (runout, hero, villain) outcomes scored at once
+EVAL_BATCH_SIZE = 1 << 22
+# Boards per sort based showdown batch
+SHOWDOWN_BATCH_SIZE = 32
+# range_equity switches from outcome tensors to sort based showdowns above this
+# number of (hero, villain) combination pairs
+SORT_SHOWDOWN_MIN_PAIRS = 1 << 15
+
+# _HOLE_INDEX[first][second]: index of the hole in HOLE_CODES
+_HOLE_INDEX = [[-1] * 52 for _ in range(52)]
+for _index, (_first, _second) in enumerate(HOLE_CODES.tolist()):
+    _HOLE_INDEX[_first][_second] = _HOLE_INDEX[_second][_first] = _index
+# Pairs of holes sharing a card can not be dealt together
+_CONFLICTS = (HOLE_BITS[:, None] & HOLE_BITS[None, :]) != 0
+_COMPATIBLE = (~_CONFLICTS).astype(np.float64)
+
+DeadCards = Union[Iterable[Optional[PokerCard]], CardMask]
+
+
+def hole_index(hole: Union[PokerHole, Tuple[int, int]]) -> int:
+    """
+    Index of hole (PokerCards or card codes) in HOLE_CODES
+    """
+    first, second = (card if isinstance(card, int) else card.code for card in hole)
+    return _HOLE_INDEX[first][second]
+
+
+def _rank(name: str) -> int:
+    assert name in RANK_NAMES, f"{name} is not a rank"
+    return RANK_NAMES.index(name)
+
+
+def _combo_indices(high: int, low: int, suited: Optional[bool]) -> List[int]:
+    """
+    Returns
+    -------
+    indices of every combination of the ranks, suited only / offsuit only / both
+    (suited is None). Pairs ignore suited.
+    """
+    indices = []
+    for high_suit, low_suit in itertools.product(range(NUM_CARD_SUITS), repeat=2):
+        if high == low and low_suit <= high_suit:
+            continue
+        if high != low and suited is not None and suited != (high_suit == low_suit):
+            continue
+        indices.append(_HOLE_INDEX[high * 4 + high_suit][low * 4 + low_suit])
+    return indices
+
+
+def _parse_hand(token: str) -> Tuple[int, int, Optional[bool]]:
+    assert len(token) in (2, 3), f"{token} is not a hand"
+    high, low = _rank(token[0].upper()), _rank(token[1].upper())
+    suited = None
+    if len(token) == 3:
+        assert token[2] in "so", f"{token} is not a hand"
+        suited = token[2] == "s"
+    return max(high, low), min(high, low), suited
+
+
+def _parse_token(token: str) -> List[int]:
+    """
+    Returns
+    -------
+    indices of every combination of a single range token (without weight)
+    """
+    if len(token) == 4 and token[1] in SUIT_NAMES and token[3] in SUIT_NAMES:
+        cards = [PokerCard.from_symbol(token[:2]), PokerCard.from_symbol(token[2:])]
+        assert cards[0] != cards[1], token
+        return [hole_index((cards[0], cards[1]))]
+
+    if "-" in token:
+        first, last = (_parse_hand(hand) for hand in token.split("-"))
+        assert first[2] == last[2], f"{token} mixes suited and offsuit hands"
+        if first[0] == first[1]:
+            assert last[0] == last[1], f"{token} mixes pairs and unpaired hands"
+            ranks = range(min(first[0], last[0]), max(first[0], last[0]) + 1)
+            hands = [(rank, rank) for rank in ranks]
+        else:
+            assert first[0] == last[0], f"{token} has different high cards"
+            ranks = range(min(first[1], last[1]), max(first[1], last[1]) + 1)
+            hands = [(first[0], rank) for rank in ranks]
+        return [
+            index
+            for high, low in hands
+            for index in _combo_indices(high, low, first[2])
+        ]
+
+    plus = token.endswith("+")
+    high, low, suited = _parse_hand(token[:-1] if plus else token)
+    if not plus:
+        hands = [(high, low)]
+    elif high == low:
+        hands = [(rank, rank) for rank in range(high, NUM_CARD_RANKS)]
+    else:
+        hands = [(high, rank) for rank in range(low, high)]
+    return [index for high, low in hands for index in _combo_indices(high, low, suited)]
+
+
+@lru_cache(maxsize=1024)
+def _parse_notation(notation: str) -> np.ndarray:
+    weights = np.zeros(NUM_HOLES)
+    for token in notation.replace(" ", "").split(","):
+        if token == "":
+            continue
+        weight = 1.0
+        if ":" in token:
+            token, weight_text = token.split(":")
+            weight = float(weight_text)
+        weights[_parse_token(token)] = weight
+    weights.flags.writeable = False
+    return weights
+
+
+class Range:
+    """
+    Weights of the 1326 hole combinations (HOLE_CODES order). Weights are
+    relative, a combination is as likely as its weight over the total weight of
+    the combinations not blocked by known cards.
+    """
+
+    weights: np.ndarray
+
+    def __init__(self, weights: Optional[np.ndarray] = None):
+        if weights is None:
+            weights = np.ones(NUM_HOLES)
+        weights = np.asarray(weights, dtype=np.float64)
+        assert weights.shape == (NUM_HOLES,), weights.shape
+        assert np.all(weights >= 0), "Range weights must be non-negative"
+        self.weights = weights
+
+    @classmethod
+    def from_notation(cls, notation: str) -> "Range":
+        """
+        (i.e. Range.from_notation("TT+, AKs, KQo:0.5"))
+        """
+        return cls(_parse_notation(notation).copy())
+
+    @classmethod
+    def from_holes(cls, holes: Iterable[PokerHole]) -> "Range":
+        weights = np.zeros(NUM_HOLES)
+        weights[[hole_index(hole) for hole in holes]] = 1
+        return cls(weights)
+
+    def block(self, dead_cards: DeadCards) -> "Range":
+        """
+        Returns
+        -------
+        range without the combinations holding a dead card (i.e. the board)
+        """
+        if not isinstance(dead_cards, CardMask):
+            dead_cards = CardMask.from_cards(dead_cards)
+        return Range(np.where(HOLE_BITS & dead_cards.bits, 0.0, self.weights))
+
+    def holes(self) -> List[Tuple[PokerHole, float]]:
+        """
+        Returns
+        -------
+        (hole, weight) of every combination with a positive weight
+        """
+        return [
+            (
+                (PokerCard.from_code(first), PokerCard.from_code(second)),
+                float(self.weights[index]),
+            )
+            for index in np.flatnonzero(self.weights)
+            for first, second in [HOLE_CODES[index].tolist()]
+        ]
+
+    def num_combos(self) -> float:
+        return float(self.weights.sum())
+
+    def __add__(self, other: "Range") -> "Range":
+        return Range(np.maximum(self.weights, other.weights))
+
+    def __contains__(self, hole: PokerHole) -> bool:
+        return self.weights[hole_index(hole)] > 0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.weights))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Range) and np.array_equal(self.weights, other.weights)
+
+    def __repr__(self):
+        return f"Range({len(self)} combos)"
+
+
+def showdown_weights(
+    strengths: np.ndarray, weights: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Args
+    ----
+    strengths (np.ndarray): (N, NUM_HOLES) strength of every hole on N boards
+    weights (np.ndarray): (N, NUM_HOLES) villain weight of every hole, zero for
+        holes sharing a card with the board
+    Returns
+    -------
+    (N, NUM_HOLES) villain weight every hole beats, ties and faces in total,
+    excluding villain holes sharing a card with the hero hole
+    """
+    num_boards, num_holes = strengths.shape
+    assert num_holes == NUM_HOLES, strengths.shape
+    strengths = strengths.astype(np.int64)
+    weights = weights.astype(np.float64)
+    order = np.argsort(strengths, axis=1, kind="stable")
+    sorted_strengths = np.take_along_axis(strengths, order, axis=1)
+    sorted_weights = np.take_along_axis(weights, order, axis=1)
+    # Per board position of the first hole at least as strong / stronger
+    rows = np.arange(num_boards)[:, None]
+    offsets = rows * (int(strengths.max(initial=0)) + 1)
+    flat_sorted = (sorted_strengths + offsets).ravel()
+    flat_strengths = (strengths + offsets).ravel()
+    lower = np.searchsorted(flat_sorted, flat_strengths, "left").reshape(
+        strengths.shape
+    )
+    upper = np.searchsorted(flat_sorted, flat_strengths, "right").reshape(
+        strengths.shape
+    )
+    lower -= rows * num_holes
+    upper -= rows * num_holes
+
+    # cumulative[b, i]: weight of the i weakest holes
+    cumulative = np.zeros((num_boards, num_holes + 1))
+    np.cumsum(sorted_weights, axis=1, out=cumulative[:, 1:])
+    # card_cumulative[b, i, c]: same but only holes holding card c
+    card_cumulative = np.zeros((num_boards, num_holes + 1, NUM_DECK_CARDS))
+    sorted_holes = HOLE_CODES[order]
+    for i in range(HOLDEM_NUM_PLAYER_CARDS):
+        np.put_along_axis(
+            card_cumulative[:, 1:],
+            sorted_holes[..., i : i + 1],
+            sorted_weights[..., None],
+            axis=2,
+        )
+    np.cumsum(card_cumulative, axis=1, out=card_cumulative)
+    card_cumulative = card_cumulative.reshape(num_boards, -1)
+
+    def weight_below(position: np.ndarray) -> np.ndarray:
+        weight = np.take_along_axis(cumulative, position, axis=1)
+        for i in range(HOLDEM_NUM_PLAYER_CARDS):
+            card_index = position * NUM_DECK_CARDS + HOLE_CODES[None, :, i]
+            weight -= np.take_along_axis(card_cumulative, card_index, axis=1)
+        return weight
+
+    # The hero hole holds both its cards and is subtracted twice from every
+    # cumulative weight it is part of (at or above its own position)
+    wins = weight_below(lower)
+    ties = weight_below(upper) + weights - wins
+    totals = weight_below(np.full_like(lower, num_holes)) + weights
+    return wins, ties, totals
+
+
+def river_showdown(
+    board: PokerBoard, villain: Range
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Showdown of every hero hole against villain on a complete board.
+
+    Returns
+    -------
+    (NUM_HOLES,) winning, draw and losing probability of every hole in
+    HOLE_CODES order. All zero for holes sharing a card with the board or
+    without non-conflicting villain holes.
+    """
+    board_codes = [card.code for card in board if card is not None]
+    assert len(board_codes) == NUM_BOARD_CARDS, board
+    strengths = evaluate_holes_batch(np.array([board_codes]), HOLE_CODES)
+    alive = (HOLE_BITS & CardMask.from_codes(board_codes).bits) == 0
+    wins, ties, totals = (
+        values[0]
+        for values in showdown_weights(strengths, (alive * villain.weights)[None, :])
+    )
+    scale = np.divide(1, totals, out=np.zeros(NUM_HOLES), where=alive & (totals > 0))
+    return wins * scale, ties * scale, (totals - wins - ties) * scale
+
+
+def _runouts(board_codes: List[int], seed: Optional[int]) -> np.ndarray:
+    remain_cards = CardMask.from_codes(board_codes).complement()
+    num_runout_cards = NUM_BOARD_CARDS - len(board_codes)
+    runouts = remain_cards.combination_codes(num_runout_cards)
+    if len(runouts) > MAX_EQUITY_RUNOUTS:
+        rng = np.random.default_rng(seed)
+        runouts = runouts[rng.choice(len(runouts), MAX_EQUITY_RUNOUTS, False)]
+    return runouts.astype(np.intp)
+
+
+def range_equity(
+    hero: Range, villain: Range, board: PokerBoard, seed: Optional[int] = None
+) -> float:
+    """
+    Equity (draws count half) of hero against villain on board, over every
+    non-conflicting pair of combinations and every runout. Boards with more than
+    MAX_EQUITY_RUNOUTS runouts (i.e. preflop) average a seeded random subset.
+
+    Narrow ranges score runouts as (runout x hero x villain) outcome tensors over
+    the combinations in the ranges, wide ranges use sort based showdowns.
+    """
+    board_codes = [card.code for card in board if card is not None]
+    hero_index = np.flatnonzero(hero.weights)
+    villain_index = np.flatnonzero(villain.weights)
+    runouts = _runouts(board_codes, seed)
+    rivers = np.concatenate(
+        [np.broadcast_to(board_codes, (len(runouts), len(board_codes))), runouts],
+        axis=1,
+    )
+    river_bits = (np.int64(1) << rivers.astype(np.int64)).sum(axis=1)
+
+    num_pairs = len(hero_index) * len(villain_index)
+    sort_based = num_pairs > SORT_SHOWDOWN_MIN_PAIRS
+    if sort_based:
+        batch_size = SHOWDOWN_BATCH_SIZE
+    else:
+        batch_size = max(1, EVAL_BATCH_SIZE // max(num_pairs, 1))
+        compatible = _COMPATIBLE[np.ix_(hero_index, villain_index)]
+    numerator, denominator = 0.0, 0.0
+    for start in range(0, len(rivers), batch_size):
+        river = rivers[start : start + batch_size]
+        alive = (river_bits[start : start + batch_size, None] & HOLE_BITS) == 0
+        strengths = evaluate_holes_batch(river, HOLE_CODES)
+        if sort_based:
+            hero_weights = alive * hero.weights
+            wins, ties, totals = showdown_weights(strengths, alive * villain.weights)
+            numerator += float((hero_weights * (wins + ties / 2)).sum())
+            denominator += float((hero_weights * totals).sum())
+            continue
+        hero_strengths = strengths[:, hero_index, None]
+        villain_strengths = strengths[:, None, villain_index]
+        hero_weights = alive[:, hero_index] * hero.weights[hero_index]
+        villain_weights = alive[:, villain_index] * villain.weights[villain_index]
+        outcomes = (hero_strengths > villain_strengths) + 0.5 * (
+            hero_strengths == villain_strengths
+        )
+        numerator += np.einsum(
+            "bh,bhv,hv,bv->", hero_weights, outcomes, compatible, villain_weights
+        )
+        denominator += np.einsum(
+            "bh,hv,bv->", hero_weights, compatible, villain_weights
+        )
+    assert denominator > 0, "Ranges have no non-conflicting combinations"
+    return float(numerator / denominator)
@@ -0,0 +1,374 @@
+"""
+Suit isomorphism of hole + board situations.
+
+Permuting suits does not change the value of a hand, so AhKh on 2c7c9d is the same
+situation as its 23 suit relabelled versions. HandIndexer maps cards dealt in rounds
+(hole, flop, turn, river) to a dense index of their isomorphism class and back to a
+canonical representative.
+
+For every suit the cards are described by the rank mask they hold in each round.
+A hand is the multiset of these four mask sequences, which is indexed by
+    * configuration: multiset of per suit card counts per round, one offset each
+    * per suit index: mixed radix over rounds of the colex index of the round's
+      rank mask among ranks not used by earlier rounds of the suit
+    * suits sharing a card count vector are interchangeable, their per suit
+      indices are indexed as a multiset
+Sizes: 169 preflop, 1,286,792 flop, 55,190,538 turn and 2,428,287,420 river classes.
+"""
+import itertools
+from bisect import bisect_right
+from math import comb
+from typing import Dict, List, Sequence, Tuple
+
+from ..components.card import PokerHole, PokerBoard
+from ..components.constants import (
+    NUM_CARD_RANKS,
+    NUM_CARD_SUITS,
+    HOLDEM_NUM_PLAYER_CARDS,
+    NUM_FLOP_CARDS,
+    NUM_TURN_CARDS,
+    NUM_RIVER_CARDS,
+)
+
+
+__all__ = [
+    "HandIndexer",
+    "PREFLOP_INDEXER",
+    "FLOP_INDEXER",
+    "TURN_INDEXER",
+    "RIVER_INDEXER",
+    "canonical_index",
+    "get_indexer",
+    "preflop_index",
+    "preflop_class_name",
+    "preflop_class_holes",
+    "NUM_PREFLOP_CLASSES",
+]
+
+NUM_PREFLOP_CLASSES = NUM_CARD_RANKS * NUM_CARD_RANKS
+RANK_NAMES = "23456789TJQKA"
+
+# _COLEX_INDEX[mask]: colex index of the subset mask among subsets of the same size
+_COLEX_INDEX = [0] * (1 << NUM_CARD_RANKS)
+for _mask in range(1 << NUM_CARD_RANKS):
+    _bits = [bit for bit in range(NUM_CARD_RANKS) if _mask >> bit & 1]
+    _COLEX_INDEX[_mask] = sum(comb(bit, i + 1) for i, bit in enumerate(_bits))
+
+CountVector = Tuple[int, ...]
+Configuration = Tuple[CountVector, ...]
+
+
+# _RANK_COMB[n][k] = comb(n, k) for n, k <= 13
+_RANK_COMB = [
+    [comb(n, k) for k in range(NUM_CARD_RANKS + 1)] for n in range(NUM_CARD_RANKS + 1)
+]
+
+
+def _compress(mask: int, used: int) -> int:
+    """
+    Remove the bit positions of used from mask (mask holds none of them)
+    """
+    while used:
+        bit = used.bit_length() - 1
+        mask = (mask & ((1 << bit) - 1)) | ((mask >> (bit + 1)) << bit)
+        used ^= 1 << bit
+    return mask
+
+
+def _decompress(mask: int, used: int) -> int:
+    """
+    Inverse of _compress, insert empty bit positions at used
+    """
+    for bit in range(NUM_CARD_RANKS):
+        if used >> bit & 1:
+            mask = (mask & ((1 << bit) - 1)) | ((mask >> bit) << (bit + 1))
+    return mask
+
+
+def _unrank_colex(index: int, num_bits: int) -> int:
+    mask = 0
+    for i in range(num_bits, 0, -1):
+        bit = i - 1
+        while comb(bit + 1, i) <= index:
+            bit += 1
+        index -= comb(bit, i)
+        mask |= 1 << bit
+    return mask
+
+
+def _unrank_multiset(index: int, size: int) -> List[int]:
+    """
+    Inverse of multiset colex index sum(comb(value_i + i, i + 1)), ascending values
+    """
+    values = []
+    for i in range(size, 0, -1):
+        value = 0
+        while comb(value + 1 + i - 1, i) <= index:
+            value += 1
+        index -= comb(value + i - 1, i)
+        values.append(value)
+    return values[::-1]
+
+
+class HandIndexer:
+    """
+    Dense index of suit isomorphism classes of cards dealt in rounds.
+    (i.e. HandIndexer([2, 3]) indexes hole + flop, cards are integer card codes
+    in round order, order within a round does not matter)
+    """
+
+    cards_per_round: Tuple[int, ...]
+    size: int
+
+    def __init__(self, cards_per_round: Sequence[int]):
+        self.cards_per_round = tuple(cards_per_round)
+        self.num_cards = sum(self.cards_per_round)
+        round_vectors = list(
+            itertools.product(*[range(num + 1) for num in self.cards_per_round])
+        )
+        # Every multiset of 4 suit count vectors summing to cards_per_round,
+        # suits ordered by count vector
+        configurations: List[Configuration] = [
+            vectors
+            for vectors in itertools.combinations_with_replacement(
+                sorted(round_vectors), NUM_CARD_SUITS
+            )
+            if all(
+                sum(vector[r] for vector in vectors) == num
+                for r, num in enumerate(self.cards_per_round)
+            )
+        ]
+
+        self._configurations = configurations
+        self._config_offsets: List[int] = []
+        self._config_index: Dict[Configuration, int] = {}
+        # Per configuration: (first suit, number of suits, number of group indices)
+        # of every group of suits sharing a count vector
+        self._config_groups: List[List[Tuple[int, int, int]]] = []
+        offset = 0
+        for i, configuration in enumerate(configurations):
+            groups = []
+            size = 1
+            first = 0
+            for vector, suits in itertools.groupby(configuration):
+                num_suits = len(list(suits))
+                group_size = comb(self._suit_size(vector) + num_suits - 1, num_suits)
+                groups.append((first, num_suits, group_size))
+                size *= group_size
+                first += num_suits
+            self._config_offsets.append(offset)
+            self._config_index[configuration] = i
+            self._config_groups.append(groups)
+            offset += size
+        self.size = offset
+
+    @staticmethod
+    def _suit_size(vector: CountVector) -> int:
+        size = 1
+        used = 0
+        for num in vector:
+            size *= comb(NUM_CARD_RANKS - used, num)
+            used += num
+        return size
+
+    def _canonical_order(
+        self, cards: Sequence[int]
+    ) -> Tuple[List[Tuple[CountVector, int]], List[int]]:
+        """
+        Returns
+        -------
+        (count vector, per suit index) of every suit and suits in canonical order
+        """
+        assert len(cards) == self.num_cards, cards
+        masks = [[0] * len(self.cards_per_round) for _ in range(NUM_CARD_SUITS)]
+        start = 0
+        for r, num in enumerate(self.cards_per_round):
+            for code in cards[start : start + num]:
+                masks[code & 3][r] |= 1 << (code >> 2)
+            start += num
+
+        suit_keys = []
+        for suit_masks in masks:
+            vector = []
+            index = 0
+            used = 0
+            num_used = 0
+            for mask in suit_masks:
+                num = mask.bit_count()
+                if num:
+                    index = index * _RANK_COMB[NUM_CARD_RANKS - num_used][num]
+                    index += _COLEX_INDEX[_compress(mask, used) if used else mask]
+                    used |= mask
+                    num_used += num
+                vector.append(num)
+            suit_keys.append((tuple(vector), index))
+        order = sorted(range(NUM_CARD_SUITS), key=lambda suit: suit_keys[suit])
+        return suit_keys, order
+
+    def index(self, cards: Sequence[int]) -> int:
+        """
+        Args
+        ----
+        cards (Sequence[int]): distinct integer card codes in round order
+        Returns
+        -------
+        isomorphism class index in [0, size)
+        """
+        suit_keys, order = self._canonical_order(cards)
+        configuration = tuple(suit_keys[suit][0] for suit in order)
+        config = self._config_index[configuration]
+        index = 0
+        for first, num_suits, group_size in self._config_groups[config]:
+            if num_suits == 1:
+                group_index = suit_keys[order[first]][1]
+            else:
+                group_index = 0
+                for i, suit in enumerate(order[first : first + num_suits]):
+                    group_index += comb(suit_keys[suit][1] + i, i + 1)
+            index = index * group_size + group_index
+        return self._config_offsets[config] + index
+
+    def unindex(self, index: int) -> List[int]:
+        """
+        Returns
+        -------
+        canonical representative cards of class index, in round order with the
+        cards of every round sorted
+        """
+        assert 0 <= index < self.size, index
+        config = bisect_right(self._config_offsets, index) - 1
+        configuration = self._configurations[config]
+        remainder = index - self._config_offsets[config]
+        suit_indices = [0] * NUM_CARD_SUITS
+        for first, num_suits, group_size in reversed(self._config_groups[config]):
+            remainder, group_index = divmod(remainder, group_size)
+            values = _unrank_multiset(group_index, num_suits)
+            suit_indices[first : first + num_suits] = values
+
+        rounds: List[List[int]] = [[] for _ in self.cards_per_round]
+        for suit, (vector, suit_index) in enumerate(zip(configuration, suit_indices)):
+            radices = []
+            used_count = 0
+            for num in vector:
+                radices.append(comb(NUM_CARD_RANKS - used_count, num))
+                used_count += num
+            digits = []
+            for radix in reversed(radices):
+                suit_index, digit = divmod(suit_index, radix)
+                digits.append(digit)
+            used = 0
+            for r, (num, digit) in enumerate(zip(vector, reversed(digits))):
+                mask = _decompress(_unrank_colex(digit, num), used)
+                used |= mask
+                for rank in range(NUM_CARD_RANKS):
+                    if mask >> rank & 1:
+                        rounds[r].append(rank * 4 + suit)
+        return [code for round_cards in rounds for code in sorted(round_cards)]
+
+    def canonicalize(self, cards: Sequence[int]) -> Tuple[List[int], List[int]]:
+        """
+        Returns
+        -------
+        canonical cards (same as unindex(index(cards))) and the suit permutation
+        mapping every suit of cards to its canonical suit
+        """
+        _, order = self._canonical_order(cards)
+        permutation = [0] * NUM_CARD_SUITS
+        for canonical_suit, suit in enumerate(order):
+            permutation[suit] = canonical_suit
+        canonical = []
+        start = 0
+        for num in self.cards_per_round:
+            canonical.extend(
+                sorted(
+                    (code & ~3) | permutation[code & 3]
+                    for code in cards[start : start + num]
+                )
+            )
+            start += num
+        return canonical, permutation
+
+
+PREFLOP_INDEXER = HandIndexer([HOLDEM_NUM_PLAYER_CARDS])
+FLOP_INDEXER = HandIndexer([HOLDEM_NUM_PLAYER_CARDS, NUM_FLOP_CARDS])
+TURN_INDEXER = HandIndexer([HOLDEM_NUM_PLAYER_CARDS, NUM_FLOP_CARDS, NUM_TURN_CARDS])
+RIVER_INDEXER = HandIndexer(
+    [HOLDEM_NUM_PLAYER_CARDS, NUM_FLOP_CARDS, NUM_TURN_CARDS, NUM_RIVER_CARDS]
+)
+_INDEXERS = {
+    0: PREFLOP_INDEXER,
+    NUM_FLOP_CARDS: FLOP_INDEXER,
+    NUM_FLOP_CARDS + NUM_TURN_CARDS: TURN_INDEXER,
+    NUM_FLOP_CARDS + NUM_TURN_CARDS + NUM_RIVER_CARDS: RIVER_INDEXER,
+}
+
+
+def get_indexer(num_board_cards: int) -> HandIndexer:
+    """
+    Returns
+    -------
+    indexer of hole + board situations with num_board_cards (0, 3, 4 or 5) cards
+    """
+    assert num_board_cards in _INDEXERS, num_board_cards
+    return _INDEXERS[num_board_cards]
+
+
+def canonical_index(hole: PokerHole, board: PokerBoard) -> int:
+    """
+    Isomorphism class index of hole on board (empty board slots are None), dense
+    in [0, get_indexer(number of board cards).size)
+    """
+    board_codes = [card.code for card in board if card is not None]
+    indexer = get_indexer(len(board_codes))
+    return indexer.index([card.code for card in hole] + board_codes)
+
+
+def preflop_index(hole: Sequence[int]) -> int:
+    """
+    Index of the 169 preflop classes laid out as the usual 13 x 13 grid
+    (row * 13 + col, aces first). Pairs are on the diagonal, suited hands above it
+    and offsuit hands below it (i.e. 0 is AA, 1 is AKs and 13 is AKo).
+    """
+    first, second = hole
+    high = NUM_CARD_RANKS - 1 - max(first >> 2, second >> 2)
+    low = NUM_CARD_RANKS - 1 - min(first >> 2, second >> 2)
+    if first & 3 == second & 3:
+        return high * NUM_CARD_RANKS + low
+    return low * NUM_CARD_RANKS + high
+
+
+def preflop_class_name(index: int) -> str:
+    """
+    (i.e. "AA", "AKs", "72o")
+    """
+    assert 0 <= index < NUM_PREFLOP_CLASSES, index
+    row, col = divmod(index, NUM_CARD_RANKS)
+    high = RANK_NAMES[NUM_CARD_RANKS - 1 - min(row, col)]
+    low = RANK_NAMES[NUM_CARD_RANKS - 1 - max(row, col)]
+    if row == col:
+        return high + low
+    return high + low + ("s" if row < col else "o")
+
+
+def preflop_class_holes(index: int) -> List[Tuple[int, int]]:
+    """
+    Returns
+    -------
+    every hole (pair of integer card codes) of a preflop class: 6 for pairs,
+    4 for suited and 12 for offsuit hands
+    """
+    assert 0 <= index < NUM_PREFLOP_CLASSES, index
+    row, col = divmod(index, NUM_CARD_RANKS)
+    high = NUM_CARD_RANKS - 1 - min(row, col)
+    low = NUM_CARD_RANKS - 1 - max(row, col)
+    holes = []
+    for high_suit in range(NUM_CARD_SUITS):
+        for low_suit in range(NUM_CARD_SUITS):
+            if row == col and low_suit <= high_suit:
+                continue
+            elif row < col and low_suit != high_suit:
+                continue
+            elif row > col and low_suit == high_suit:
+                continue
+            holes.append((high * 4 + high_suit, low * 4 + low_suit))
+    return holes
@@ -0,0 +1,155 @@
+"""
+Outs: what every unseen card does to hero's hand.
+
+Every card that can come next is scored in one vectorized pass. Hero's hand
+rankings come from evaluate_batch, and the range showdowns come from
+evaluate_holes_batch on every completed board. Range combinations blocked by
+hero, the board or the runout are masked with the HOLE_BITS card bitsets.
+"""
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional
+
+from ..components.card import PokerCard, PokerHole, PokerBoard
+from ..components.card_mask import CardMask
+from ..components.constants import HandRanking, NUM_FLOP_CARDS
+from ..components.evaluator import (
+    evaluate,
+    evaluate_batch,
+    evaluate_holes_batch,
+    hand_ranking,
+    hand_ranking_batch,
+)
+from .hand_range import HOLE_BITS, HOLE_CODES, Range
+
+
+__all__ = ["Outs", "compute_outs"]
+
+NUM_BOARD_CARDS = 5
+# Favorite when the equity after the card is above this
+FAVORITE_EQUITY = 0.5
+
+
+class Outs(NamedTuple):
+    """
+    Every unseen card (card code order) with hero's hand ranking and equity
+    against the villain range once the card is dealt
+    """
+
+    cards: List[PokerCard]
+    rankings: List[HandRanking]
+    equities: np.ndarray
+    ranking: HandRanking
+
+    @property
+    def improving(self) -> List[PokerCard]:
+        """
+        Cards giving hero a better hand ranking than the current one
+        """
+        return [
+            card
+            for card, ranking in zip(self.cards, self.rankings)
+            if ranking < self.ranking
+        ]
+
+    @property
+    def favorite(self) -> List[PokerCard]:
+        """
+        Cards after which hero is the favorite against the range
+        """
+        return [
+            card
+            for card, equity in zip(self.cards, self.equities.tolist())
+            if equity > FAVORITE_EQUITY
+        ]
+
+    def by_ranking(self) -> Dict[HandRanking, List[PokerCard]]:
+        """
+        Improving cards grouped by the hand ranking they give, best first
+        """
+        groups: Dict[HandRanking, List[PokerCard]] = {}
+        for card, ranking in sorted(
+            zip(self.cards, self.rankings), key=lambda item: item[1].value
+        ):
+            if ranking < self.ranking:
+                groups.setdefault(ranking, []).append(card)
+        return groups
+
+
+def compute_outs(
+    hole: PokerHole, board: PokerBoard, villain: Optional[Range] = None
+) -> Outs:
+    """
+    Args
+    ----
+    hole (PokerHole): hero hole cards
+    board (PokerBoard): flop or turn, empty board slots are None
+    villain (Optional[Range]): villain range, defaults to every hole
+    Returns
+    -------
+    Outs of the next card. On the flop the equity after a turn card is exact
+    over every river, on the turn it is the river showdown.
+    """
+    hole_codes = [card.code for card in hole]
+    board_codes = [card.code for card in board if card is not None]
+    assert NUM_FLOP_CARDS <= len(board_codes) < NUM_BOARD_CARDS, board
+    villain = Range() if villain is None else villain
+    known = CardMask.from_codes(hole_codes + board_codes)
+    cards = np.array(known.complement().codes(), dtype=np.intp)
+    num_cards = len(cards)
+
+    next_boards = np.concatenate(
+        [np.broadcast_to(board_codes, (num_cards, len(board_codes))), cards[:, None]],
+        axis=1,
+    )
+    strengths = evaluate_batch(
+        np.concatenate(
+            [next_boards, np.broadcast_to(hole_codes, (num_cards, 2))], axis=1
+        )
+    )
+
+    # (num_cards, num_runouts, 5) completed boards per next card
+    if next_boards.shape[1] == NUM_BOARD_CARDS:
+        final_boards = next_boards[:, None, :]
+    else:
+        rivers = np.broadcast_to(cards, (num_cards, num_cards))
+        rivers = rivers[~np.eye(num_cards, dtype=bool)].reshape(num_cards, -1)
+        final_boards = np.concatenate(
+            [
+                np.broadcast_to(next_boards[:, None, :], (num_cards, num_cards - 1, 4)),
+                rivers[:, :, None],
+            ],
+            axis=2,
+        )
+    num_runouts = final_boards.shape[1]
+    final_boards = final_boards.reshape(-1, NUM_BOARD_CARDS)
+    hero_strengths = evaluate_batch(
+        np.concatenate(
+            [final_boards, np.broadcast_to(hole_codes, (len(final_boards), 2))],
+            axis=1,
+        )
+    )
+    villain_strengths = evaluate_holes_batch(final_boards, HOLE_CODES)
+    board_bits = (np.int64(1) << final_boards.astype(np.int64)).sum(axis=1)
+    weights = np.where(
+        (HOLE_BITS[None, :] & (board_bits[:, None] | known.bits)) == 0,
+        villain.weights[None, :],
+        0.0,
+    )
+    shares = (hero_strengths[:, None] > villain_strengths) + 0.5 * (
+        hero_strengths[:, None] == villain_strengths
+    )
+    # Every (runout, villain hole) deal is weighted by the villain hole weight
+    won = (weights * shares).sum(axis=1).reshape(num_cards, num_runouts)
+    total = weights.sum(axis=1).reshape(num_cards, num_runouts)
+    equities = np.divide(
+        won.sum(axis=1),
+        total.sum(axis=1),
+        out=np.zeros(num_cards),
+        where=total.sum(axis=1) > 0,
+    )
+    return Outs(
+        cards=[PokerCard.from_code(code) for code in cards.tolist()],
+        rankings=[HandRanking(value) for value in hand_ranking_batch(strengths)],
+        equities=equities,
+        ranking=hand_ranking(evaluate(board_codes + hole_codes)),
+    )
@@ -0,0 +1,101 @@
+"""
+Resumable parallel builds of precomputed tables.
+
+A build is split into items (i.e. canonical flops) whose results are scattered
+into work arrays. Work arrays and the done flag of every item are numpy files in
+a work directory, flushed every CHECKPOINT_INTERVAL items, so an interrupted build
+skips the finished items when it is started again.
+"""
+import os
+import multiprocessing
+import numpy as np
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from ..components.evaluator import warm_up
+
+
+__all__ = ["open_work_array", "run_checkpointed"]
+
+# Finished items between two checkpoints of the work directory
+CHECKPOINT_INTERVAL = 16
+
+# (item index, {work array name: (indices, values)})
+ItemResult = Tuple[int, Dict[str, Tuple[np.ndarray, np.ndarray]]]
+
+
+def open_work_array(path: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """
+    Memory map a work array, creating it (zero filled) if it does not exist
+    """
+    if os.path.exists(path):
+        array = np.lib.format.open_memmap(path, mode="r+")
+        assert array.shape == tuple(shape), (path, array.shape, shape)
+        return array
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+
+def run_checkpointed(
+    work_dir: str,
+    work_arrays: Dict[str, Tuple[Tuple[int, ...], type]],
+    num_items: int,
+    compute: Callable[[int], ItemResult],
+    item_indices: Optional[Iterable[int]] = None,
+    num_workers: int = 1,
+    desc: str = "items",
+    verbose: bool = False,
+) -> Tuple[Dict[str, np.ndarray], bool]:
+    """
+    Args
+    ----
+    work_dir (str): checkpoint directory
+    work_arrays (Dict[str, Tuple[Tuple[int, ...], type]]): shape and dtype of
+        every work array
+    num_items (int): number of items of the whole build
+    compute (Callable[[int], ItemResult]): picklable function computing an item
+    item_indices (Optional[Iterable[int]]): only compute these items
+    num_workers (int): number of processes computing items
+    desc (str): progress bar description
+    verbose (bool): show progress
+    Returns
+    -------
+    (memory mapped work arrays, whether every item of the build is done)
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    arrays = {
+        name: open_work_array(os.path.join(work_dir, f"{name}.npy"), shape, dtype)
+        for name, (shape, dtype) in work_arrays.items()
+    }
+    done = open_work_array(os.path.join(work_dir, "done.npy"), (num_items,), np.bool_)
+    if item_indices is None:
+        item_indices = range(num_items)
+    remaining = [index for index in item_indices if not done[index]]
+
+    def checkpoint():
+        # Results reach the disk before their items are marked done
+        for array in arrays.values():
+            array.flush()
+        done.flush()
+
+    warm_up()
+    pool = multiprocessing.Pool(num_workers, warm_up) if num_workers > 1 else None
+    try:
+        results = (
+            map(compute, remaining)
+            if pool is None
+            else pool.imap_unordered(compute, remaining)
+        )
+        if verbose:
+            from tqdm import tqdm
+
+            results = tqdm(results, total=len(remaining), desc=desc)
+        for i, (item_index, item_results) in enumerate(results):
+            for name, (indices, values) in item_results.items():
+                arrays[name][indices] = values
+            done[item_index] = True
+            if (i + 1) % CHECKPOINT_INTERVAL == 0:
+                checkpoint()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        checkpoint()
+    return arrays, bool(done.all())
@@ -0,0 +1,347 @@
+"""
+Precomputed preflop equity of the 169 preflop classes.
+
+The table holds
+    * heads_up[i, j]: equity of class i against class j, averaged over every
+      non-conflicting pair of holes of the two classes
+    * vs_random[i, n - 1]: equity of class i against n random hands (n = 1 ~ 8)
+Equity is the expected share of the pot, i.e. a draw between k players is worth
+1 / k. Classes are indexed with preflop_index.
+
+The shipped table is generated by the module entry point, run
+    python -m pokerguac.poker.gto.preflop_equity --help
+to rebuild it. Heads-up matchups are either enumerated exactly over every board or
+sampled (stratified over the hole pairs of a matchup), the table meta records which.
+
+The shipped table is sampled with the generator defaults (seed 0) since exact
+enumeration takes about half a cpu day. A pot share lies in [0, 1], so its
+standard deviation is at most 1 / 2 and the sampling error has a standard
+deviation of at most
+    * heads_up: 0.5 / sqrt(DEFAULT_NUM_SAMPLES) ~ 0.0028
+    * vs_random: 0.5 / sqrt(DEFAULT_NUM_RANDOM_SAMPLES) ~ 0.0014
+i.e. entries are within 0.011 and 0.006 (4 standard deviations) of the exact
+equities. Spot checks against exact enumeration differ by 0.005 at most.
+"""
+import os
+import argparse
+import multiprocessing
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..components.card import PokerHole
+from ..components.card_mask import CardMask
+from ..components.constants import MAX_NUM_PLAYERS, HOLDEM_NUM_PLAYER_CARDS
+from ..components.evaluator import evaluate_batch, warm_up
+from ..components.table_file import TableFile, load_table_file, save_table_file
+from .isomorphism import (
+    HandIndexer,
+    NUM_PREFLOP_CLASSES,
+    preflop_class_holes,
+    preflop_index,
+)
+
+
+__all__ = [
+    "preflop_equity",
+    "preflop_matchup_equity",
+    "load_preflop_equity",
+    "generate_preflop_equity",
+    "MAX_NUM_OPPONENTS",
+]
+
+PREFLOP_EQUITY_TABLE_NAME = "preflop_equity"
+PREFLOP_EQUITY_TABLE_VERSION = 1
+PREFLOP_EQUITY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "tables",
+    f"{PREFLOP_EQUITY_TABLE_NAME}_v{PREFLOP_EQUITY_TABLE_VERSION}.bin",
+)
+MAX_NUM_OPPONENTS = MAX_NUM_PLAYERS - 1
+NUM_BOARD_CARDS = 5
+# Generator defaults (samples per heads-up matchup / per class and opponent count)
+DEFAULT_NUM_SAMPLES = 1 << 15
+DEFAULT_NUM_RANDOM_SAMPLES = 1 << 17
+DEFAULT_SEED = 0
+# Maximum number of hands evaluated in a single evaluate_batch call
+EVAL_BATCH_SIZE = 1 << 20
+
+_HEADS_UP_INDEXER = HandIndexer([HOLDEM_NUM_PLAYER_CARDS, HOLDEM_NUM_PLAYER_CARDS])
+
+# Filled by load_preflop_equity(), list copies for scalar lookups
+_TABLE: Optional[TableFile] = None
+_HEADS_UP: List[List[float]]
+_VS_RANDOM: List[List[float]]
+
+
+def load_preflop_equity(path: Optional[str] = None) -> TableFile:
+    """
+    Memory map the preflop equity table used by preflop_equity and
+    preflop_matchup_equity.
+
+    Args
+    ----
+    path (Optional[str]): table file. Defaults to the shipped PREFLOP_EQUITY_PATH
+    """
+    global _TABLE, _HEADS_UP, _VS_RANDOM
+    if _TABLE is None or path is not None:
+        table = load_table_file(
+            PREFLOP_EQUITY_PATH if path is None else path,
+            PREFLOP_EQUITY_TABLE_NAME,
+            PREFLOP_EQUITY_TABLE_VERSION,
+        )
+        _HEADS_UP = table["heads_up"].tolist()
+        _VS_RANDOM = table["vs_random"].tolist()
+        _TABLE = table
+    return _TABLE
+
+
+def preflop_equity(hole: PokerHole, num_opponents: int = 1) -> float:
+    """
+    Equity of hole against num_opponents (1 ~ MAX_NUM_OPPONENTS) random hands
+    """
+    assert 1 <= num_opponents <= MAX_NUM_OPPONENTS, num_opponents
+    if _TABLE is None:
+        load_preflop_equity()
+    return _VS_RANDOM[preflop_index([card.code for card in hole])][num_opponents - 1]
+
+
+def preflop_matchup_equity(hole: PokerHole, villain: PokerHole) -> float:
+    """
+    Equity of the preflop class of hole against the preflop class of villain.
+    Suits only count through the classes (i.e. AhKh vs QhJh is looked up as
+    AKs vs QJs).
+    """
+    if _TABLE is None:
+        load_preflop_equity()
+    return _HEADS_UP[preflop_index([card.code for card in hole])][
+        preflop_index([card.code for card in villain])
+    ]
+
+
+def _matchup_holes(
+    index: int, villain_index: int
+) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    return [
+        (hole, villain)
+        for hole in preflop_class_holes(index)
+        for villain in preflop_class_holes(villain_index)
+        if len(set(hole + villain)) == 2 * HOLDEM_NUM_PLAYER_CARDS
+    ]
+
+
+def _pot_shares(strengths: np.ndarray) -> np.ndarray:
+    """
+    Returns
+    -------
+    pot share of the first column given (N, num_players) hand strengths
+    """
+    best = strengths.max(axis=1)
+    num_winners = (strengths == best[:, None]).sum(axis=1)
+    return np.where(strengths[:, 0] == best, 1 / num_winners, 0.0)
+
+
+def _exact_matchup_equity(hole: Sequence[int], villain: Sequence[int]) -> float:
+    boards = CardMask.from_codes(list(hole) + list(villain)).complement()
+    boards = boards.combination_codes(NUM_BOARD_CARDS)
+    total = 0.0
+    for start in range(0, len(boards), EVAL_BATCH_SIZE):
+        board = boards[start : start + EVAL_BATCH_SIZE]
+        strengths = np.stack(
+            [
+                evaluate_batch(
+                    np.concatenate(
+                        [board, np.broadcast_to(cards, (len(board), 2))], axis=1
+                    )
+                )
+                for cards in [hole, villain]
+            ],
+            axis=1,
+        )
+        total += float(_pot_shares(strengths).sum())
+    return total / len(boards)
+
+
+def _random_cards(
+    rng: np.random.Generator, used: np.ndarray, num_cards: int
+) -> np.ndarray:
+    """
+    Args
+    ----
+    used (np.ndarray): (N, num used cards) card codes dealt per row
+    Returns
+    -------
+    (N, num_cards) distinct random cards per row avoiding the used cards
+    """
+    keys = rng.random((len(used), 52))
+    np.put_along_axis(keys, used.astype(np.intp), 2.0, axis=1)
+    return keys.argpartition(num_cards - 1, axis=1)[:, :num_cards]
+
+
+def _heads_up_row(args: Tuple[int, bool, int, np.random.SeedSequence]) -> np.ndarray:
+    """
+    Equity of class index against classes index ~ NUM_PREFLOP_CLASSES - 1
+    """
+    index, exact, num_samples, seed = args
+    rng = np.random.default_rng(seed)
+    exact_cache: Dict[int, float] = {}
+    row = np.zeros(NUM_PREFLOP_CLASSES)
+    for villain_index in range(index, NUM_PREFLOP_CLASSES):
+        if villain_index == index:
+            # Swapping seats of the same class is a symmetry of the matchup
+            row[villain_index] = 0.5
+            continue
+        matchups = _matchup_holes(index, villain_index)
+        if exact:
+            equities = []
+            for hole, villain in matchups:
+                key = _HEADS_UP_INDEXER.index(hole + villain)
+                if key not in exact_cache:
+                    exact_cache[key] = _exact_matchup_equity(hole, villain)
+                equities.append(exact_cache[key])
+            row[villain_index] = np.mean(equities)
+            continue
+        # Every hole pair gets the same number of samples
+        num_repeats = -(-num_samples // len(matchups))
+        cards = np.repeat(np.array(matchups).reshape(-1, 4), num_repeats, axis=0)
+        boards = _random_cards(rng, cards, NUM_BOARD_CARDS)
+        strengths = np.stack(
+            [
+                evaluate_batch(
+                    np.concatenate([boards, cards[:, 2 * i :][:, :2]], axis=1)
+                )
+                for i in range(2)
+            ],
+            axis=1,
+        )
+        row[villain_index] = _pot_shares(strengths).mean()
+    return row
+
+
+def _vs_random_row(args: Tuple[int, int, np.random.SeedSequence]) -> np.ndarray:
+    """
+    Equity of class index against 1 ~ MAX_NUM_OPPONENTS random hands
+    """
+    index, num_samples, seed = args
+    rng = np.random.default_rng(seed)
+    holes = np.array(preflop_class_holes(index))
+    row = np.zeros(MAX_NUM_OPPONENTS)
+    for num_opponents in range(1, MAX_NUM_OPPONENTS + 1):
+        hole = np.repeat(holes, -(-num_samples // len(holes)), axis=0)
+        dealt = _random_cards(rng, hole, NUM_BOARD_CARDS + 2 * num_opponents)
+        boards = dealt[:, :NUM_BOARD_CARDS]
+        player_holes = [hole] + [
+            dealt[:, NUM_BOARD_CARDS + 2 * i :][:, :2] for i in range(num_opponents)
+        ]
+        strengths = np.stack(
+            [
+                evaluate_batch(np.concatenate([boards, player_hole], axis=1))
+                for player_hole in player_holes
+            ],
+            axis=1,
+        )
+        row[num_opponents - 1] = _pot_shares(strengths).mean()
+    return row
+
+
+def generate_preflop_equity(
+    exact: bool = False,
+    num_samples: int = DEFAULT_NUM_SAMPLES,
+    num_random_samples: int = DEFAULT_NUM_RANDOM_SAMPLES,
+    num_workers: int = 1,
+    seed: int = DEFAULT_SEED,
+    verbose: bool = False,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Args
+    ----
+    exact (bool): enumerate every board of every heads-up matchup (hours of cpu
+        time) instead of sampling num_samples boards per matchup
+    num_samples (int): boards per sampled heads-up matchup
+    num_random_samples (int): deals per class and number of random opponents
+    num_workers (int): number of processes, rows are seeded independently of it
+    seed (int): root seed of the sampling rngs
+    verbose (bool): show progress
+    Returns
+    -------
+    (table arrays, table meta)
+    """
+    row_seeds = np.random.SeedSequence(seed).spawn(2 * NUM_PREFLOP_CLASSES)
+    heads_up_args = [
+        (index, exact, num_samples, row_seeds[index])
+        for index in range(NUM_PREFLOP_CLASSES)
+    ]
+    vs_random_args = [
+        (index, num_random_samples, row_seeds[NUM_PREFLOP_CLASSES + index])
+        for index in range(NUM_PREFLOP_CLASSES)
+    ]
+    warm_up()
+    if num_workers > 1:
+        with multiprocessing.Pool(num_workers, warm_up) as pool:
+            heads_up_rows = pool.imap(_heads_up_row, heads_up_args)
+            vs_random_rows = pool.imap(_vs_random_row, vs_random_args)
+            heads_up_rows, vs_random_rows = _collect(
+                heads_up_rows, vs_random_rows, verbose
+            )
+    else:
+        heads_up_rows, vs_random_rows = _collect(
+            map(_heads_up_row, heads_up_args),
+            map(_vs_random_row, vs_random_args),
+            verbose,
+        )
+
+    heads_up = np.array(heads_up_rows)
+    # Fill the lower triangle, equities of a matchup sum to 1
+    lower = np.tril_indices(NUM_PREFLOP_CLASSES, -1)
+    heads_up[lower] = 1 - heads_up.T[lower]
+    arrays = {
+        "heads_up": heads_up.astype(np.float32),
+        "vs_random": np.array(vs_random_rows, dtype=np.float32),
+    }
+    meta = {
+        "method": "exact" if exact else "sampled",
+        "num_samples": None if exact else num_samples,
+        "num_random_samples": num_random_samples,
+        "seed": seed,
+    }
+    return arrays, meta
+
+
+def _collect(heads_up_rows, vs_random_rows, verbose: bool):
+    if verbose:
+        from tqdm import tqdm
+
+        heads_up_rows = tqdm(heads_up_rows, total=NUM_PREFLOP_CLASSES, desc="heads up")
+        vs_random_rows = tqdm(vs_random_rows, total=NUM_PREFLOP_CLASSES, desc="random")
+    return list(heads_up_rows), list(vs_random_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the preflop equity table")
+    parser.add_argument("--output", default=PREFLOP_EQUITY_PATH)
+    parser.add_argument("--exact", action="store_true")
+    parser.add_argument("--samples", type=int, default=DEFAULT_NUM_SAMPLES)
+    parser.add_argument(
+        "--random-samples", type=int, default=DEFAULT_NUM_RANDOM_SAMPLES
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    arrays, meta = generate_preflop_equity(
+        exact=args.exact,
+        num_samples=args.samples,
+        num_random_samples=args.random_samples,
+        num_workers=args.workers,
+        seed=args.seed,
+        verbose=True,
+    )
+    save_table_file(
+        args.output,
+        PREFLOP_EQUITY_TABLE_NAME,
+        PREFLOP_EQUITY_TABLE_VERSION,
+        arrays,
+        meta,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,774 @@
-import itertools
+import os
+import time
+import multiprocessing
 import numpy as np
-from typing import Set, List, Tuple, cast
+from math import comb, gcd
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union, cast
 
 from ..components.card import PokerHole, PokerBoard, PokerCard
-from ..components.rules import rank_hands
-from ..components.constants import POKER_CARD_DECK, NUMBER_STRING_TO_INT
+from ..components.card_mask import CardMask
+from ..components.evaluator import evaluate_batch, evaluate_holes_batch, warm_up
+from .hand_range import HOLE_BITS, HOLE_CODES, NUM_HOLES, Range, showdown_weights
+from .isomorphism import get_indexer
 
 NUM_BOARD_CARDS = 5
+# Maximum number of hands evaluated in a single evaluate_batch call
+EVAL_BATCH_SIZE = 1 << 20
+# Maximum number of isomorphism classes kept by the compute_hand_strength cache
+HAND_STRENGTH_CACHE_SIZE = 1 << 16
+# Number of board runouts per chunk of parallel compute_hand_strength
+HAND_STRENGTH_CHUNK_SIZE = 1 << 12
+# Monte Carlo defaults of estimate_hand_strength
+MC_MAX_SAMPLES = 1 << 20
+MC_MIN_SAMPLES = 1 << 10
+MC_BATCH_SIZE = 1 << 13
+# Deal samplers of estimate_hand_strength
+SAMPLING_METHODS = ("random", "stratified", "quasi")
+# Independently randomized point sets per stratified / quasi random batch, the
+# spread of their means gives the standard error
+NUM_REPLICATES = 8
+GOLDEN_RATIO = (1 + 5**0.5) / 2
+# z score of the 95% normal confidence interval
+CONFIDENCE_Z = 1.96
+# Runout boards scored together by runout_showdowns
+RUNOUT_BATCH_SIZE = 64
+# compute_multiway_equity enumerates up to this many (runout, villain holes) cases
+MULTIWAY_MAX_EXACT_CASES = 1 << 22
+MULTIWAY_NUM_SAMPLES = 1 << 16
 
+Seed = Union[None, int, np.random.Generator]
 
-def get_remaining_cards(used_cards: List[PokerCard]) -> List[PokerCard]:
-    remaining_cards = []
-    for card_str in POKER_CARD_DECK:
-        card1 = PokerCard.from_symbol(card_str)
-        is_remain = True
-        for card2 in used_cards:
-            if card1.equal(card2):
-                is_remain = False
-                break
-        if is_remain:
-            remaining_cards.append(card1)
-    return remaining_cards
+UsedCards = Union[Iterable[Optional[PokerCard]], CardMask]
+
+
+def _to_card_mask(used_cards: UsedCards) -> CardMask:
+    if isinstance(used_cards, CardMask):
+        return used_cards
+    return CardMask.from_cards(used_cards)
+
+
+def get_remaining_cards(used_cards: UsedCards) -> List[PokerCard]:
+    return _to_card_mask(used_cards).complement().cards()
 
 
-def get_all_possible_villain_holes(used_cards: List[PokerCard]) -> List[PokerHole]:
-    remain_cards = get_remaining_cards(used_cards)
-    villain_cards = list(itertools.combinations(remain_cards, 2))
-    return villain_cards
+def get_all_possible_villain_holes(used_cards: UsedCards) -> List[PokerHole]:
+    remain_cards = _to_card_mask(used_cards).complement()
+    return cast(List[PokerHole], list(remain_cards.combinations(2)))
 
 
 def get_all_possible_boards(
-    used_cards: List[PokerCard], board: PokerBoard
+    used_cards: UsedCards, board: PokerBoard
 ) -> List[PokerBoard]:
     assert len(board) == NUM_BOARD_CARDS
-    remain_cards = get_remaining_cards(used_cards)
+    remain_cards = _to_card_mask(used_cards).complement()
     num_left_board_cards = board.count(None)
     assert num_left_board_cards >= 0 and num_left_board_cards <= NUM_BOARD_CARDS
-    all_boards = list(itertools.combinations(remain_cards, num_left_board_cards))
     board_cards: List[PokerCard] = list(filter(lambda card: card is not None, board))  # type: ignore
     all_boards = [
         cast(PokerBoard, board_cards + list(remain_board))
-        for remain_board in all_boards
+        for remain_board in remain_cards.combinations(num_left_board_cards)
     ]
     return all_boards
 
 
 def compute_hand_strength(
-    hole: PokerHole, board: PokerBoard
+    hole: PokerHole, board: PokerBoard, num_workers: Optional[int] = 1
+) -> Tuple[float, float, float]:
+    """
+    Exact winning, draw and losing probability of hole against a single random
+    villain hole, enumerating every remaining board runout.
+
+    Serial results are cached by suit isomorphism class, so relabelled suits of an
+    already computed situation are free.
+
+    Args
+    ----
+    hole (PokerHole): hero hole cards
+    board (PokerBoard): board cards, empty board slots are None
+    num_workers (Optional[int]): number of processes enumerating runouts
+        (None is every cpu). Runouts are split into fixed chunks and the integer
+        outcome counts are summed, so results equal the serial ones bit for bit.
+    """
+    board_codes = [card.code for card in board if card is not None]
+    hole_codes = [card.code for card in hole]
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_workers > 1:
+        return _to_probabilities(
+            _parallel_count_outcomes(hole_codes, board_codes, num_workers)
+        )
+    indexer = get_indexer(len(board_codes))
+    return _cached_hand_strength(
+        len(board_codes), indexer.index(hole_codes + board_codes)
+    )
+
+
+@lru_cache(maxsize=HAND_STRENGTH_CACHE_SIZE)
+def _cached_hand_strength(
+    num_board_cards: int, index: int
 ) -> Tuple[float, float, float]:
-    card_board: List[PokerCard] = list(filter(lambda card: card is not None, board))  # type: ignore
-    used_cards = set(hole)
-    used_cards.update(set(card_board))
-    all_boards = get_all_possible_boards(used_cards, board)
-    avg_winning_prob = 0.0
-    avg_draw_prob = 0.0
-    avg_losing_prob = 0.0
-    num_cases = 0
-    for simul_board in all_boards:
-        simul_used_cards = set()
-        simul_used_cards.update(hole)
-        simul_used_cards.update(set(simul_board))
-        villain_holes = get_all_possible_villain_holes(simul_used_cards)
-        num_cases += len(villain_holes)
-        villain_holes.insert(0, hole)
-        ranks, _ = rank_hands(simul_board, villain_holes)
-        my_rank = ranks[0]
-        villain_ranks = np.array(ranks[1:])
-        avg_losing_prob += np.sum(my_rank > villain_ranks)
-        avg_winning_prob += np.sum(my_rank < villain_ranks)
-        avg_draw_prob += np.sum(my_rank == villain_ranks)
-    avg_winning_prob = float(avg_winning_prob / num_cases)
-    avg_draw_prob = float(avg_draw_prob / num_cases)
-    avg_losing_prob = float(avg_losing_prob / num_cases)
-    assert avg_winning_prob + avg_draw_prob + avg_losing_prob == 1
-    return avg_winning_prob, avg_draw_prob, avg_losing_prob
+    codes = get_indexer(num_board_cards).unindex(index)
+    hole, board = codes[:2], codes[2:]
+    return _to_probabilities(_count_outcomes(hole, board, _runouts(hole, board)))
+
+
+def _to_probabilities(counts: Tuple[int, int, int]) -> Tuple[float, float, float]:
+    num_wins, num_draws, num_losses = counts
+    num_cases = num_wins + num_draws + num_losses
+    return num_wins / num_cases, num_draws / num_cases, num_losses / num_cases
+
+
+def _runouts(hole: List[int], board: List[int]) -> np.ndarray:
+    remain_cards = CardMask.from_codes(hole + board).complement()
+    return remain_cards.combination_codes(NUM_BOARD_CARDS - len(board))
+
+
+def _count_outcomes(
+    hole: List[int], board: List[int], runouts: np.ndarray
+) -> Tuple[int, int, int]:
+    """
+    Returns
+    -------
+    number of (runout, villain hole) pairs hole wins, draws and loses over runouts
+    """
+    hole_codes = np.array(hole, dtype=np.intp)
+    board_codes = np.array(board, dtype=np.intp)
+    villain_holes = CardMask.from_codes(hole + board).complement().combination_codes(2)
+    villain_bits = (np.int64(1) << villain_holes.astype(np.int64)).sum(axis=1)
+
+    num_wins, num_draws, num_losses = 0, 0, 0
+    num_boards_per_batch = max(1, EVAL_BATCH_SIZE // len(villain_holes))
+    for start in range(0, len(runouts), num_boards_per_batch):
+        runout = runouts[start : start + num_boards_per_batch]
+        num_runouts = len(runout)
+        simul_boards = np.concatenate(
+            [np.broadcast_to(board_codes, (num_runouts, len(board_codes))), runout],
+            axis=1,
+        )
+        my_strength = evaluate_batch(
+            np.concatenate(
+                [simul_boards, np.broadcast_to(hole_codes, (num_runouts, 2))], axis=1
+            )
+        )
+        villain_strengths = evaluate_holes_batch(simul_boards, villain_holes)
+        # Villain holes sharing a card with the runout are not possible
+        runout_bits = (np.int64(1) << runout.astype(np.int64)).sum(axis=1)
+        possible = (runout_bits[:, None] & villain_bits[None, :]) == 0
+        my_strength = my_strength[:, None]
+        num_wins += int(np.count_nonzero(possible & (my_strength > villain_strengths)))
+        num_draws += int(
+            np.count_nonzero(possible & (my_strength == villain_strengths))
+        )
+        num_losses += int(
+            np.count_nonzero(possible & (my_strength < villain_strengths))
+        )
+    return num_wins, num_draws, num_losses
+
+
+def _count_outcomes_chunk(
+    args: Tuple[List[int], List[int], np.ndarray]
+) -> Tuple[int, int, int]:
+    return _count_outcomes(*args)
+
+
+def _parallel_count_outcomes(
+    hole: List[int], board: List[int], num_workers: int
+) -> Tuple[int, int, int]:
+    runouts = _runouts(hole, board)
+    # Chunks only depend on the runout enumeration order, never on num_workers
+    chunks = [
+        (hole, board, runouts[start : start + HAND_STRENGTH_CHUNK_SIZE])
+        for start in range(0, len(runouts), HAND_STRENGTH_CHUNK_SIZE)
+    ]
+    # Workers memory map the same evaluator table file instead of rebuilding it
+    warm_up()
+    with multiprocessing.Pool(min(num_workers, len(chunks)), warm_up) as pool:
+        counts = pool.map(_count_outcomes_chunk, chunks)
+    num_wins, num_draws, num_losses = (sum(count) for count in zip(*counts))
+    return num_wins, num_draws, num_losses
+
+
+def runout_showdowns(
+    board: Sequence[int],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Showdown of every hole against a random villain hole on every runout of a
+    partial board, scored for all holes at once with sort based showdowns.
+
+    Args
+    ----
+    board (Sequence[int]): 3 to 5 board card codes
+    Returns
+    -------
+    (R, 5 - len(board)) runouts and (R, NUM_HOLES) winning probability, draw
+    probability and whether the hole is possible on the runout (holes sharing a
+    card with the runout board are all zero)
+    """
+    board = list(board)
+    runouts = (
+        CardMask.from_codes(board)
+        .complement()
+        .combination_codes(NUM_BOARD_CARDS - len(board))
+    )
+    wins = np.zeros((len(runouts), NUM_HOLES))
+    ties = np.zeros((len(runouts), NUM_HOLES))
+    alive = np.zeros((len(runouts), NUM_HOLES), dtype=bool)
+    for start in range(0, len(runouts), RUNOUT_BATCH_SIZE):
+        runout = runouts[start : start + RUNOUT_BATCH_SIZE].astype(np.intp)
+        rivers = np.concatenate(
+            [np.broadcast_to(board, (len(runout), len(board))), runout], axis=1
+        )
+        strengths = evaluate_holes_batch(rivers, HOLE_CODES)
+        river_bits = (np.int64(1) << rivers.astype(np.int64)).sum(axis=1)
+        valid = (river_bits[:, None] & HOLE_BITS[None, :]) == 0
+        batch_wins, batch_ties, totals = showdown_weights(strengths, valid)
+        scale = np.divide(valid, totals, out=np.zeros(totals.shape), where=valid)
+        wins[start : start + len(runout)] = batch_wins * scale
+        ties[start : start + len(runout)] = batch_ties * scale
+        alive[start : start + len(runout)] = valid
+    return runouts, wins, ties, alive
+
+
+class HandStrengthEstimate(NamedTuple):
+    """
+    Monte Carlo estimate of winning, draw and losing probability with the standard
+    error of every estimate. Equity counts a draw as half a win.
+    """
+
+    win: float
+    draw: float
+    loss: float
+    win_std_error: float
+    draw_std_error: float
+    loss_std_error: float
+    equity: float
+    equity_std_error: float
+    num_samples: int
+
+    def confidence_interval(
+        self, value: str = "equity", z: float = CONFIDENCE_Z
+    ) -> Tuple[float, float]:
+        """
+        Args
+        ----
+        value (str): one of "win", "draw", "loss" or "equity"
+        z (float): z score of the normal confidence interval (1.96 is 95%)
+        Returns
+        -------
+        (low, high) confidence interval of value clipped to [0, 1]
+        """
+        estimate = getattr(self, value)
+        std_error = getattr(self, f"{value}_std_error")
+        return max(estimate - z * std_error, 0.0), min(estimate + z * std_error, 1.0)
+
+
+def _std_error(prob: float, num_samples: int) -> float:
+    return float(np.sqrt(prob * (1 - prob) / num_samples))
+
+
+def estimate_hand_strength(
+    hole: PokerHole,
+    board: PokerBoard,
+    target_std_error: Optional[float] = None,
+    max_samples: int = MC_MAX_SAMPLES,
+    max_seconds: Optional[float] = None,
+    seed: Seed = None,
+    batch_size: int = MC_BATCH_SIZE,
+    min_samples: int = MC_MIN_SAMPLES,
+    method: str = "random",
+) -> HandStrengthEstimate:
+    """
+    Monte Carlo estimate of compute_hand_strength. Every sample is a board runout
+    and a villain hole from the remaining cards.
+
+    Every deal is a point of [0, 1)^2: the first coordinate picks the runout in
+    enumeration order, the second the villain hole ordered by its strength on the
+    current board. method picks how points are spread:
+        * random: independent uniform deals
+        * stratified: latin hypercube, every batch has one point in each of its n
+          slices of the runouts and of the villain holes. Once n exceeds the
+          number of runouts every runout (on the turn every river card) is dealt
+          floor(n / runouts) or one more times, so the last street is enumerated
+          and only the earlier streets are sampled.
+        * quasi: randomly shifted rank-1 lattice, a low discrepancy grid
+    Both reduce the variance of drawing hands the most, where the runout decides
+    the outcome. Their batches are NUM_REPLICATES independently randomized point
+    sets and standard errors come from the spread of the replicate means.
+
+    Args
+    ----
+    hole (PokerHole): hero hole cards
+    board (PokerBoard): board cards, empty board slots are None
+    target_std_error (Optional[float]): stop as soon as the standard error of the
+        equity is at most target_std_error (checked once every batch, after at
+        least min_samples samples)
+    max_samples (int): sample budget
+    max_seconds (Optional[float]): stop after the first batch that exceeds this
+        time budget. Results are then no longer reproducible from seed alone.
+    seed (Seed): seed or generator of the sampling rng
+    batch_size (int): number of samples evaluated per batch
+    min_samples (int): samples before the stopping rule is applied
+    method (str): one of SAMPLING_METHODS
+    Returns
+    -------
+    estimate after a multiple of batch_size samples (or max_samples samples)
+    """
+    assert max_samples > 0 and batch_size > 0, (max_samples, batch_size)
+    assert method in SAMPLING_METHODS, method
+    start_time = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    board_codes = [card.code for card in board if card is not None]
+    hole_codes = [card.code for card in hole]
+    remain_codes = np.array(
+        CardMask.from_codes(hole_codes + board_codes).complement().codes(),
+        dtype=np.intp,
+    )
+    num_runout_cards = NUM_BOARD_CARDS - len(board_codes)
+    num_drawn_cards = num_runout_cards + 2
+    villain_holes = _ordered_villain_holes(hole_codes, board_codes)
+
+    # (number of samples, wins, draws) of every replicate
+    replicates: List[Tuple[int, int, int]] = []
+    num_wins, num_draws, num_samples = 0, 0, 0
+    while num_samples < max_samples:
+        num_batch = min(batch_size, max_samples - num_samples)
+        if method == "random":
+            # First cards of a random permutation of the remaining cards
+            drawn = rng.random((num_batch, len(remain_codes))).argpartition(
+                num_drawn_cards - 1, axis=1
+            )[:, :num_drawn_cards]
+            drawn = remain_codes[drawn]
+            wins, draws = _showdown_outcomes(
+                hole_codes,
+                board_codes,
+                drawn[:, :num_runout_cards],
+                drawn[:, num_runout_cards:],
+            )
+            num_wins += int(np.count_nonzero(wins))
+            num_draws += int(np.count_nonzero(draws))
+            num_samples += num_batch
+        else:
+            num_points = num_batch // NUM_REPLICATES
+            if num_points == 0:
+                break
+            for _ in range(NUM_REPLICATES):
+                points = (
+                    _latin_hypercube(num_points, rng)
+                    if method == "stratified"
+                    else _shifted_lattice(num_points, rng)
+                )
+                runouts, villains = _deal_points(
+                    points, remain_codes, num_runout_cards, villain_holes, rng
+                )
+                wins, draws = _showdown_outcomes(
+                    hole_codes, board_codes, runouts, villains
+                )
+                replicates.append(
+                    (
+                        num_points,
+                        int(np.count_nonzero(wins)),
+                        int(np.count_nonzero(draws)),
+                    )
+                )
+            num_wins = sum(replicate[1] for replicate in replicates)
+            num_draws = sum(replicate[2] for replicate in replicates)
+            num_samples = sum(replicate[0] for replicate in replicates)
+
+        if num_samples >= min_samples:
+            if target_std_error is not None:
+                estimate = _estimate(num_wins, num_draws, num_samples, replicates)
+                if estimate.equity_std_error <= target_std_error:
+                    return estimate
+            if (
+                max_seconds is not None
+                and time.perf_counter() - start_time >= max_seconds
+            ):
+                break
+    return _estimate(num_wins, num_draws, num_samples, replicates)
+
+
+def _showdown_outcomes(
+    hole: List[int], board: List[int], runouts: np.ndarray, villains: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns
+    -------
+    whether hole wins and whether it draws against villains (N, 2) on board
+    completed by runouts (N, 5 - len(board))
+    """
+    num_deals = len(runouts)
+    simul_boards = np.concatenate(
+        [np.broadcast_to(board, (num_deals, len(board))), runouts], axis=1
+    ).astype(np.intp)
+    my_strength = evaluate_batch(
+        np.concatenate([simul_boards, np.broadcast_to(hole, (num_deals, 2))], axis=1)
+    )
+    villain_strength = evaluate_batch(np.concatenate([simul_boards, villains], axis=1))
+    return my_strength > villain_strength, my_strength == villain_strength
+
+
+def _ordered_villain_holes(hole: List[int], board: List[int]) -> np.ndarray:
+    """
+    Holes not sharing a card with hole and board, ordered by their strength on
+    board (by card codes preflop) so that neighbouring holes fare alike
+    """
+    holes = HOLE_CODES[(HOLE_BITS & CardMask.from_codes(hole + board).bits) == 0]
+    if len(board) == 0:
+        return holes
+    strengths = evaluate_holes_batch(np.array([board], dtype=np.intp), holes)[0]
+    return holes[np.argsort(strengths, kind="stable")]
+
+
+def _latin_hypercube(num_points: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    (num_points, 2) points with exactly one point in every slice
+    [i / num_points, (i + 1) / num_points) of each coordinate
+    """
+    strata = np.stack([np.arange(num_points), rng.permutation(num_points)], axis=1)
+    return (strata + rng.random((num_points, 2))) / num_points
+
+
+def _shifted_lattice(num_points: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    (num_points, 2) Fibonacci like rank-1 lattice (i / n, i * g / n) with a
+    uniform random shift modulo 1
+    """
+    generator = max(1, round(num_points / GOLDEN_RATIO))
+    while gcd(generator, num_points) != 1:
+        generator += 1
+    i = np.arange(num_points)
+    lattice = np.stack([i, i * generator % num_points], axis=1) / num_points
+    return (lattice + rng.random(2)) % 1
+
+
+def _unrank_combinations(ranks: np.ndarray, num_items: int, k: int) -> np.ndarray:
+    """
+    (N, k) increasing item positions of the combinations with colexicographic
+    ranks
+    """
+    positions = np.zeros((len(ranks), k), dtype=np.intp)
+    ranks = ranks.astype(np.int64)
+    for j in range(k, 0, -1):
+        table = np.array([comb(x, j) for x in range(num_items)], dtype=np.int64)
+        position = np.searchsorted(table, ranks, side="right") - 1
+        positions[:, j - 1] = position
+        ranks = ranks - table[position]
+    return positions
+
+
+def _deal_points(
+    points: np.ndarray,
+    remain_codes: np.ndarray,
+    num_runout_cards: int,
+    villain_holes: np.ndarray,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map points of [0, 1)^2 to (runouts, villain holes). A villain hole sharing a
+    card with its runout is redrawn uniformly among the holes that do not, which
+    keeps every (runout, villain hole) deal equally likely.
+    """
+    num_runouts = comb(len(remain_codes), num_runout_cards)
+    runout_ranks = np.minimum(points[:, 0] * num_runouts, num_runouts - 1)
+    runouts = remain_codes[
+        _unrank_combinations(runout_ranks, len(remain_codes), num_runout_cards)
+    ]
+    runout_bits = (np.int64(1) << runouts.astype(np.int64)).sum(axis=1)
+    villain_bits = (np.int64(1) << villain_holes.astype(np.int64)).sum(axis=1)
+    villain_rows = np.minimum(
+        (points[:, 1] * len(villain_holes)).astype(np.intp), len(villain_holes) - 1
+    )
+    conflicts = np.flatnonzero(runout_bits & villain_bits[villain_rows])
+    while len(conflicts) > 0:
+        villain_rows[conflicts] = rng.integers(len(villain_holes), size=len(conflicts))
+        conflicts = conflicts[
+            (runout_bits[conflicts] & villain_bits[villain_rows[conflicts]]) != 0
+        ]
+    return runouts, villain_holes[villain_rows]
+
+
+def _estimate(
+    num_wins: int,
+    num_draws: int,
+    num_samples: int,
+    replicates: List[Tuple[int, int, int]],
+) -> HandStrengthEstimate:
+    if len(replicates) == 0:
+        return _hand_strength_estimate(num_wins, num_draws, num_samples)
+    sizes, wins, draws = np.array(replicates, dtype=np.float64).T
+    weights = sizes / sizes.sum()
+    correction = len(replicates) / max(len(replicates) - 1, 1)
+
+    def std_error(counts: np.ndarray) -> float:
+        # Standard error of the size weighted mean of the replicate means
+        means = counts / sizes
+        deviations = means - (weights * means).sum()
+        return float(np.sqrt(correction * (weights**2 * deviations**2).sum()))
+
+    win = num_wins / num_samples
+    draw = num_draws / num_samples
+    return HandStrengthEstimate(
+        win=win,
+        draw=draw,
+        loss=1 - win - draw,
+        win_std_error=std_error(wins),
+        draw_std_error=std_error(draws),
+        loss_std_error=std_error(sizes - wins - draws),
+        equity=win + draw / 2,
+        equity_std_error=std_error(wins + draws / 2),
+        num_samples=num_samples,
+    )
+
+
+def _hand_strength_estimate(
+    num_wins: int, num_draws: int, num_samples: int
+) -> HandStrengthEstimate:
+    win = num_wins / num_samples
+    draw = num_draws / num_samples
+    loss = 1 - win - draw
+    equity = win + draw / 2
+    # Per sample equity is 1, 1/2 or 0, so its second moment is win + draw / 4
+    variance = max(win + draw / 4 - equity * equity, 0.0)
+    return HandStrengthEstimate(
+        win=win,
+        draw=draw,
+        loss=loss,
+        win_std_error=_std_error(win, num_samples),
+        draw_std_error=_std_error(draw, num_samples),
+        loss_std_error=_std_error(loss, num_samples),
+        equity=equity,
+        equity_std_error=float(np.sqrt(variance / num_samples)),
+        num_samples=num_samples,
+    )
+
+
+class MultiwayEquity(NamedTuple):
+    """
+    Share of the pot won by hero against several villains (a draw between k
+    players is worth 1 / k). std_error is 0 for exact results, otherwise the
+    equity is within CONFIDENCE_Z * std_error of the exact one 95% of the time.
+    """
+
+    equity: float
+    std_error: float
+    num_cases: int
+    exact: bool
+
+
+def _pot_share(hero_strengths: np.ndarray, villain_strengths: np.ndarray) -> np.ndarray:
+    """
+    Args
+    ----
+    hero_strengths (np.ndarray): (...,) hero strengths
+    villain_strengths (np.ndarray): (..., K) strengths of the K villains
+    Returns
+    -------
+    (...,) pot share of hero
+    """
+    best_villain = villain_strengths.max(axis=-1)
+    num_tied = (villain_strengths == hero_strengths[..., None]).sum(axis=-1)
+    return np.where(hero_strengths >= best_villain, 1 / (1 + num_tied), 0.0)
+
+
+def _villain_supports(
+    dead_bits: int, num_opponents: int, villain_ranges: Optional[Sequence[Range]]
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Returns
+    -------
+    (hole indices, weights) of the combinations every villain can hold
+    """
+    if villain_ranges is None:
+        villain_ranges = [Range()] * num_opponents
+    supports = []
+    for villain_range in villain_ranges:
+        weights = np.where(HOLE_BITS & dead_bits, 0.0, villain_range.weights)
+        index = np.flatnonzero(weights)
+        supports.append((index, weights[index]))
+    return supports
+
+
+def _exact_multiway_equity(
+    hole: List[int],
+    board: List[int],
+    supports: List[Tuple[np.ndarray, np.ndarray]],
+) -> MultiwayEquity:
+    # Every non-conflicting assignment of combinations to villains
+    deals = np.zeros((1, 0), dtype=np.intp)
+    deal_bits = np.zeros(1, dtype=np.int64)
+    deal_weights = np.ones(1)
+    for index, weights in supports:
+        conflicts = (deal_bits[:, None] & HOLE_BITS[index][None, :]) != 0
+        rows, cols = np.nonzero(~conflicts)
+        deals = np.concatenate([deals[rows], index[cols, None]], axis=1)
+        deal_bits = deal_bits[rows] | HOLE_BITS[index][cols]
+        deal_weights = deal_weights[rows] * weights[cols]
+
+    runouts = _runouts(hole, board).astype(np.intp)
+    runout_bits = (np.int64(1) << runouts.astype(np.int64)).sum(axis=1)
+    hole_codes = np.array(hole, dtype=np.intp)
+    total_share, total_weight = 0.0, 0.0
+    batch_size = max(1, EVAL_BATCH_SIZE // max(len(deals), 1))
+    for start in range(0, len(runouts), batch_size):
+        runout = runouts[start : start + batch_size]
+        rivers = np.concatenate(
+            [np.broadcast_to(board, (len(runout), len(board))), runout], axis=1
+        )
+        strengths = evaluate_holes_batch(rivers, HOLE_CODES)
+        hero_strengths = evaluate_batch(
+            np.concatenate(
+                [rivers, np.broadcast_to(hole_codes, (len(runout), 2))], axis=1
+            )
+        )
+        villain_strengths = strengths[:, deals]
+        shares = _pot_share(
+            np.broadcast_to(hero_strengths[:, None], villain_strengths.shape[:2]),
+            villain_strengths,
+        )
+        possible = (runout_bits[start : start + batch_size, None] & deal_bits) == 0
+        weights = possible * deal_weights
+        total_share += float((shares * weights).sum())
+        total_weight += float(weights.sum())
+    assert total_weight > 0, "Villain ranges have no non-conflicting combinations"
+    num_cases = len(runouts) * len(deals)
+    return MultiwayEquity(total_share / total_weight, 0.0, num_cases, True)
+
+
+def _sample_villain_holes(
+    rng: np.random.Generator,
+    num_samples: int,
+    dead_bits: int,
+    supports: List[Tuple[np.ndarray, np.ndarray]],
+) -> np.ndarray:
+    """
+    Returns
+    -------
+    (num_samples, K, 2) villain holes drawn from the ranges without conflicts
+    (rows with conflicting holes are redrawn as a whole)
+    """
+    holes = np.zeros((num_samples, len(supports), 2), dtype=np.intp)
+    todo = np.arange(num_samples)
+    while len(todo) > 0:
+        deal_bits = np.full(len(todo), dead_bits, dtype=np.int64)
+        conflict = np.zeros(len(todo), dtype=bool)
+        for i, (index, weights) in enumerate(supports):
+            drawn = index[rng.choice(len(index), len(todo), p=weights / weights.sum())]
+            conflict |= (deal_bits & HOLE_BITS[drawn]) != 0
+            deal_bits |= HOLE_BITS[drawn]
+            holes[todo, i] = HOLE_CODES[drawn]
+        todo = todo[conflict]
+    return holes
+
+
+def _sampled_multiway_equity(
+    hole: List[int],
+    board: List[int],
+    num_opponents: int,
+    supports: Optional[List[Tuple[np.ndarray, np.ndarray]]],
+    num_samples: int,
+    seed: Seed,
+) -> MultiwayEquity:
+    rng = np.random.default_rng(seed)
+    dead_bits = CardMask.from_codes(hole + board).bits
+    num_runout_cards = NUM_BOARD_CARDS - len(board)
+    shares = np.zeros(num_samples)
+    for start in range(0, num_samples, MC_BATCH_SIZE):
+        num_batch = min(MC_BATCH_SIZE, num_samples - start)
+        if supports is None:
+            # Random villains are dealt from the deck with the runout
+            villain_holes = np.zeros((num_batch, 0, 2), dtype=np.intp)
+            num_drawn = num_runout_cards + 2 * num_opponents
+        else:
+            villain_holes = _sample_villain_holes(rng, num_batch, dead_bits, supports)
+            num_drawn = num_runout_cards
+        used = np.concatenate(
+            [
+                np.broadcast_to(hole + board, (num_batch, len(hole + board))),
+                villain_holes.reshape(num_batch, -1),
+            ],
+            axis=1,
+        )
+        keys = rng.random((num_batch, 52))
+        np.put_along_axis(keys, used, 2.0, axis=1)
+        drawn = keys.argpartition(max(num_drawn - 1, 0), axis=1)[:, :num_drawn]
+        if supports is None:
+            villain_holes = drawn[:, num_runout_cards:].reshape(
+                num_batch, num_opponents, 2
+            )
+        rivers = np.concatenate(
+            [
+                np.broadcast_to(board, (num_batch, len(board))),
+                drawn[:, :num_runout_cards],
+            ],
+            axis=1,
+        )
+        hero_strengths = evaluate_batch(
+            np.concatenate([rivers, np.broadcast_to(hole, (num_batch, 2))], axis=1)
+        )
+        villain_strengths = np.stack(
+            [
+                evaluate_batch(np.concatenate([rivers, villain_holes[:, i]], axis=1))
+                for i in range(villain_holes.shape[1])
+            ],
+            axis=1,
+        )
+        shares[start : start + num_batch] = _pot_share(
+            hero_strengths, villain_strengths
+        )
+    std_error = float(shares.std() / np.sqrt(num_samples))
+    return MultiwayEquity(float(shares.mean()), std_error, num_samples, False)
+
+
+def compute_multiway_equity(
+    hole: PokerHole,
+    board: PokerBoard,
+    num_opponents: Optional[int] = None,
+    villain_ranges: Optional[Sequence[Range]] = None,
+    max_exact_cases: int = MULTIWAY_MAX_EXACT_CASES,
+    num_samples: int = MULTIWAY_NUM_SAMPLES,
+    seed: Seed = None,
+) -> MultiwayEquity:
+    """
+    Pot share of hole against num_opponents random hands or against one villain
+    per range in villain_ranges.
+
+    Enumerates every runout and every non-conflicting deal of villain holes when
+    there are at most max_exact_cases (runout, deal) cases, otherwise samples
+    num_samples deals. A pot share lies in [0, 1], so the sampled std_error is at
+    most 0.5 / sqrt(num_samples) (0.002 for the default 65536 samples).
+
+    Args
+    ----
+    hole (PokerHole): hero hole cards
+    board (PokerBoard): board cards, empty board slots are None
+    num_opponents (Optional[int]): number of random villain hands
+    villain_ranges (Optional[Sequence[Range]]): range of every villain, exclusive
+        with num_opponents
+    max_exact_cases (int): largest number of enumerated cases
+    num_samples (int): number of sampled deals otherwise
+    seed (Seed): seed or generator of the sampling rng
+    """
+    assert (num_opponents is None) != (
+        villain_ranges is None
+    ), "Give either num_opponents or villain_ranges"
+    num_opponents = len(villain_ranges) if villain_ranges else num_opponents
+    assert num_opponents is not None and num_opponents > 0, num_opponents
+    hole_codes = [card.code for card in hole]
+    board_codes = [card.code for card in board if card is not None]
+    dead_bits = CardMask.from_codes(hole_codes + board_codes).bits
+
+    supports = _villain_supports(dead_bits, num_opponents, villain_ranges)
+    num_dead = len(hole_codes) + len(board_codes)
+    num_runouts = comb(52 - num_dead, NUM_BOARD_CARDS - len(board_codes))
+    num_cases = num_runouts * int(np.prod([float(len(index)) for index, _ in supports]))
+    if num_cases <= max_exact_cases:
+        return _exact_multiway_equity(hole_codes, board_codes, supports)
+    return _sampled_multiway_equity(
+        hole_codes,
+        board_codes,
+        num_opponents,
+        None if villain_ranges is None else supports,
+        num_samples,
+        seed,
+    )
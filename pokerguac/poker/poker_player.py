@@ -1,39 +1,55 @@
 import numpy as np
 from queue import Queue
-from typing import Optional, List, Dict, Tuple, Sequence
+from typing import Optional, List, Tuple, Sequence
+from .components.action_log import ActionLog
 from .components.card import PokerBoard, PokerHole, PokerCard
+from .components.chips import Chips, to_chips
+from .components.seat_state import SeatState
 from .components.constants import (
     PlayerAction,
     PlayerPosition,
     PlayerStatus,
     PokerStage,
     PlayerType,
-    ALL_POKER_STAGES,
     INVALID_NAMES,
 )
 from .agents.poker_agent import PokerAgent
 
 
+# Statuses of players not in the current hand
+NOT_IN_HAND_STATUSES = frozenset(
+    [
+        PlayerStatus.FOLD,
+        PlayerStatus.WAITING_HAND,
+        PlayerStatus.SITTING_OUT,
+        PlayerStatus.ELIMINATED,
+    ]
+)
+
+
 class PokerPlayer:
     name: str
-    stack: float
     position: Optional[PlayerPosition]
     hole: Optional[PokerHole]
-    status: PlayerStatus
-    stage_bet: float
-    bank_roll: float
-    start_bank_roll: float
+    _stack: Chips
+    _status: PlayerStatus
+    # Set while seated at a table, kept up to date on status and stack changes
+    seat: Optional[int] = None
+    seat_state: Optional[SeatState] = None
+    stage_bet: Chips
+    bank_roll: Chips
+    start_bank_roll: Chips
     time_bank: Optional[float] = None
     left_num_buy_ins: Optional[int] = None
     type: PlayerType
 
-    def __init__(self, name: str, action_agent: PokerAgent, bank_roll: float):
+    def __init__(self, name: str, action_agent: PokerAgent, bank_roll: Chips):
         assert name.lower() not in INVALID_NAMES
         self.name = name
         self.action_agent = action_agent
-        self.bank_roll = bank_roll
-        self.start_bank_roll = bank_roll
-        self.stack = 0
+        self.bank_roll = to_chips(bank_roll)
+        self.start_bank_roll = self.bank_roll
+        self._stack = 0
         self.reset()
 
     def reset(self):
@@ -42,6 +58,53 @@ class PokerPlayer:
         self.status = PlayerStatus.SITTING_OUT
         self.position = None
 
+    @property
+    def stack(self) -> Chips:
+        return self._stack
+
+    @stack.setter
+    def stack(self, stack: Chips):
+        self._stack = stack
+        self._update_seat_state()
+
+    @property
+    def status(self) -> PlayerStatus:
+        return self._status
+
+    @status.setter
+    def status(self, status: PlayerStatus):
+        self._status = status
+        self._update_seat_state()
+
+    def sit(self, seat: int, seat_state: SeatState):
+        self.seat = seat
+        self.seat_state = seat_state
+        self._update_seat_state()
+
+    def stand_up(self):
+        if self.seat_state is not None:
+            assert self.seat is not None
+            self.seat_state.remove(self.seat)
+        self.seat = None
+        self.seat_state = None
+
+    def _update_seat_state(self):
+        if self.seat_state is None:
+            return
+        assert self.seat is not None
+        status = self._status
+        eliminated = status == PlayerStatus.ELIMINATED
+        alive = status not in NOT_IN_HAND_STATUSES
+        self.seat_state.update(
+            self.seat,
+            living=not eliminated,
+            joining=not eliminated and status != PlayerStatus.SITTING_OUT,
+            alive=alive,
+            active=alive and not self.is_all_in(),
+            waiting=status == PlayerStatus.WAITING_TURN,
+            raising=status == PlayerStatus.RAISE and self._stack > 0,
+        )
+
     def stage_reset(self, stage: PokerStage):
         self.stage_bet = 0
         if self.is_active():
@@ -60,52 +123,51 @@ class PokerPlayer:
         assert self.hole is None
         self.hole = hole
 
-    def get_effective_stack(self, big_blind: float) -> float:
+    def get_effective_stack(self, big_blind: Chips) -> float:
         return self.stack / big_blind
 
-    @classmethod
-    def per_player_action_to_bet(
-        cls,
-        per_player_action: Dict[PokerStage, List[List[Tuple[PlayerAction, float]]]],
-    ) -> np.ndarray:
-        total_bets = np.zeros(len(per_player_action[PokerStage.PREFLOP]))
-        for stage in ALL_POKER_STAGES:
-            for i in range(len(per_player_action[stage])):
-                for action, bet in per_player_action[stage][i]:
-                    total_bets[i] += bet
-        return total_bets
-
     def action(
         self,
         board: PokerBoard,
-        per_player_action: Dict[PokerStage, List[List[Tuple[PlayerAction, float]]]],
-        player_stacks: List[float],
+        per_player_bet: np.ndarray,
+        max_bet: Chips,
+        action_log: ActionLog,
+        player_stacks: List[Chips],
         player_idx: int,
-        big_blind: float,
-    ) -> Tuple[float, PlayerAction]:
+        big_blind: Chips,
+    ) -> Tuple[Chips, PlayerAction]:
+        """
+        Args
+        ----
+        per_player_bet (np.ndarray): (num_seats,) running total bet of every seat
+            in the hand
+        max_bet (Chips): largest total bet of the hand, i.e. the bet to call
+        """
         assert len(board) == 5
         assert self.position is not None
         bet, action = self.action_agent.action(
             board,
-            self.per_player_action_to_bet(per_player_action),
-            per_player_action,
+            per_player_bet,
+            max_bet,
+            action_log,
             player_stacks,
             self.position,
             player_idx,
             big_blind,
         )
+        bet = to_chips(bet)
         assert (
             self.stack >= bet
         ), f"Invalid betting occured from player {self.name}: [stack: {self.stack}, bet: {bet}]"
-        per_player_bet = self.per_player_action_to_bet(per_player_action)
 
         if action == PlayerAction.RAISE:
             self.status = PlayerStatus.RAISE
             if not bet == self.stack:
-                assert (
-                    per_player_bet[player_idx] + bet - np.max(per_player_bet)
-                    >= big_blind
-                ), (big_blind, bet, per_player_bet)
+                assert per_player_bet[player_idx] + bet - max_bet >= big_blind, (
+                    big_blind,
+                    bet,
+                    max_bet,
+                )
         elif action == PlayerAction.FOLD:
             self.status = PlayerStatus.FOLD
             assert bet == 0
@@ -120,13 +182,13 @@ class PokerPlayer:
         assert self.hole is not None
         return self.hole
 
-    def cash(self, cash_size: float):
+    def cash(self, cash_size: Chips):
         assert self.stack >= 0 and cash_size >= 0, (self.stack, cash_size)
-        self.stack += cash_size
+        self.stack += to_chips(cash_size)
 
     def join_tournament(
         self,
-        buy_in: float,
+        buy_in: Chips,
         max_num_buy_ins: int,
         time_bank: Optional[float] = None,
     ):
@@ -135,8 +197,8 @@ class PokerPlayer:
         self.time_bank = time_bank
         self.try_buy_in(buy_in, buy_in)
 
-    def try_buy_in(self, min_buy_in: float, max_buy_in: float):
-        assert np.isclose(self.stack, 0)
+    def try_buy_in(self, min_buy_in: Chips, max_buy_in: Chips):
+        assert self.stack == 0, self.stack
         assert min_buy_in > 0 and max_buy_in > 0 and max_buy_in >= min_buy_in
         if self.left_num_buy_ins is not None and self.left_num_buy_ins == 0:
             # Used all number of buy ins for tounament
@@ -148,13 +210,13 @@ class PokerPlayer:
             # TODO: Simply buy in Max possible buy-in amount currently
             # TODO: Player status should be sitting out unless player wants to rejoin
             self.status = PlayerStatus.WAITING_HAND
-            buy_in = min(max_buy_in, self.bank_roll)
+            buy_in = to_chips(min(max_buy_in, self.bank_roll))
             self.bank_roll = self.bank_roll - buy_in
             if self.left_num_buy_ins is not None:
                 self.left_num_buy_ins = self.left_num_buy_ins - 1
             self.stack = buy_in
 
-    def blind(self, small_blind: float, big_blind: float) -> float:
+    def blind(self, small_blind: Chips, big_blind: Chips) -> Chips:
         assert self.stack > 0
         assert (
             self.position == PlayerPosition.SMALLBLIND
@@ -166,13 +228,13 @@ class PokerPlayer:
             self.status = PlayerStatus.CALL
         else:
             self.status = PlayerStatus.RAISE
-        blind_val = min(self.stack, blind)
+        blind_val = to_chips(min(self.stack, blind))
         self.stack = self.stack - blind_val
         self.stage_bet += blind_val
         return blind_val
 
     def straddle(
-        self, player_stacks: List[float], player_idx: int, big_blind: float
+        self, player_stacks: List[Chips], player_idx: int, big_blind: Chips
     ) -> bool:
         if self.stack < 2 * big_blind:
             straddle = False
@@ -198,15 +260,15 @@ class PokerPlayer:
         return self.status == PlayerStatus.SITTING_OUT
 
     def is_all_in(self):
-        return np.isclose(self.stack, 0) and (
+        return self.stack == 0 and (
             self.status == PlayerStatus.CALL or self.status == PlayerStatus.RAISE
         )
 
     def is_eliminated(self):
         eliminated = False
         if self.status == PlayerStatus.ELIMINATED:
-            assert self.left_num_buy_ins is None or np.isclose(self.left_num_buy_ins, 0)
-            assert np.isclose(self.stack, 0), self.stack
+            assert self.left_num_buy_ins is None or self.left_num_buy_ins == 0
+            assert self.stack == 0, self.stack
             eliminated = True
         return eliminated
 
@@ -214,22 +276,13 @@ class PokerPlayer:
         """
         Player is at an actionable state. (Can Raise / Bet)
         """
-        return (
-            self.status not in [PlayerStatus.FOLD, PlayerStatus.WAITING_HAND]
-            and not self.is_eliminated()
-            and not self.is_sitting_out()
-            and not self.is_all_in()
-        )
+        return self.is_alive() and not self.is_all_in()
 
     def is_alive(self):
         """
         Player is still participating in the current hand (but can be all-in)
         """
-        return (
-            self.status not in [PlayerStatus.FOLD, PlayerStatus.WAITING_HAND]
-            and not self.is_eliminated()
-            and not self.is_sitting_out()
-        )
+        return self.status not in NOT_IN_HAND_STATUSES and not self.is_eliminated()
 
     def is_joining(self):
         """
@@ -4,7 +4,6 @@ import time
 from typing import List, Dict, Any, Optional, Tuple, cast
 
 from .components.constants import (
-    POKER_CARD_DECK,
     NUM_PLAYERS_TO_POSITIONS,
     ALL_POKER_STAGES,
     MIN_NUM_PLAYERS,
@@ -18,8 +17,14 @@ from .components.constants import (
     PokerTableState,
 )
 from .components.card import PokerCard, PokerBoard, PokerHole
+from .components.action_log import ActionLog
+from .components.card_mask import CardMask
+from .components.chips import Chips, to_chips
 from .poker_player import PokerPlayer, PlayerAction, PlayerStatus
-from .components.rules import rank_hands
+from .components.evaluator import EvaluatorState, strengths_to_ranks
+from .components.omaha import rank_omaha_hands, evaluate_omaha_hilo
+from .components.pot import split_pots
+from .components.seat_state import SeatState
 from ..config import TableGameConfig, PokerGameType
 
 
@@ -30,9 +35,17 @@ class PokerTable:
     board: PokerBoard
     cards: List[PokerCard]
     active_card_deck: List[PokerCard]
+    dead_cards: CardMask
+    board_state: EvaluatorState
     players: List[Optional[PokerPlayer]]
+    seat_state: SeatState
     eliminated_players: Dict[PokerPlayer, int]
-    per_player_action: Dict[PokerStage, List[List[Tuple[PlayerAction, float]]]]
+    action_log: ActionLog
+    # Running bets of the hand, updated on every recorded action
+    per_player_bet: np.ndarray
+    per_stage_bet: np.ndarray
+    pot_size: Chips
+    max_bet: Chips
     num_hand_players: int
     num_alive_hand_players: int
     num_player_cards: int
@@ -46,10 +59,10 @@ class PokerTable:
     def __init__(
         self,
         num_players: int,
-        big_blind: float,
-        small_blind: float,
-        min_buy_in: float,
-        max_buy_in: float,
+        big_blind: Chips,
+        small_blind: Chips,
+        min_buy_in: Chips,
+        max_buy_in: Chips,
         num_player_cards: int = HOLDEM_NUM_PLAYER_CARDS,
         game_type: PokerGameType = PokerGameType.HOLDEM,
     ):
@@ -58,12 +71,13 @@ class PokerTable:
         self.num_player_cards = num_player_cards
         self.active = False
         self.cfg = TableGameConfig(
-            big_blind=big_blind,
-            small_blind=small_blind,
-            min_buy_in=min_buy_in,
-            max_buy_in=max_buy_in,
+            big_blind=to_chips(big_blind),
+            small_blind=to_chips(small_blind),
+            min_buy_in=to_chips(min_buy_in),
+            max_buy_in=to_chips(max_buy_in),
             game_type=game_type,
         )
+        self.players = []
         self.reset()
 
     def reset(self):
@@ -71,19 +85,26 @@ class PokerTable:
         self.num_hand_players = 0
         self.num_alive_hand_players = 0
         self.board = [None] * BOARD_NUM_CARDS
+        for player in self.players:
+            if player is not None:
+                player.stand_up()
         self.players = [None for _ in range(self.num_players)]
+        self.seat_state = SeatState(self.num_players)
         self.button = None
         self.eliminated_players = {}
         self.cards = []
-        self.per_player_action = {
-            stage: [[] for _ in range(self.num_players)] for stage in ALL_POKER_STAGES
-        }
+        self.dead_cards = CardMask()
+        self.board_state = EvaluatorState()
+        self.action_log = ActionLog()
+        self.per_player_bet = np.zeros(self.num_players, dtype=np.int64)
+        self.per_stage_bet = np.zeros(
+            (len(ALL_POKER_STAGES), self.num_players), dtype=np.int64
+        )
+        self._clear_bets()
 
     def activate_table(self):
         assert self.get_num_hand_players() >= MIN_NUM_PLAYERS
-        self.cards = [
-            PokerCard(card_str[0], card_str[1]) for card_str in POKER_CARD_DECK
-        ]
+        self.cards = PokerCard.deck()
         assert len(self.cards) == CARD_DECK_SIZE
         self.active_card_deck = self.cards.copy()
         if self.button is None:
@@ -102,20 +123,15 @@ class PokerTable:
 
     def init_button(self):
         # init button
-        playing_indices = []
-        for i, player in enumerate(self.players):
-            if player is not None and player.is_joining():
-                playing_indices.append(i)
-        self.button = np.random.choice(playing_indices)
+        playing_indices = list(SeatState.seats(self.seat_state.joining))
+        self.button = int(np.random.choice(playing_indices))
 
     def move_button(self):
         # move button
         assert self.button is not None
-        self.button = (self.button + 1) % self.num_players
-        button_player = self.players[self.button]
-        while button_player is None or not button_player.is_joining():
-            self.button = (self.button + 1) % self.num_players
-            button_player = self.players[self.button]
+        button = self.seat_state.next_seat(self.seat_state.joining, self.button)
+        assert button is not None
+        self.button = button
 
     def _assign_positions(self):
         # Assign positions for active players
@@ -138,57 +154,64 @@ class PokerTable:
 
     def _next(self):
         assert self.player_in_action is not None
-        self.player_in_action = (self.player_in_action + 1) % self.num_players
-        curr_player = self.players[self.player_in_action]
-        counter = 1
-        while curr_player is None or not curr_player.is_active():
-            self.player_in_action = (self.player_in_action + 1) % self.num_players
-            curr_player = self.players[self.player_in_action]
-            counter += 1
-            if counter >= self.num_players:
-                # There might not be a next person to act if everyone all-ins
-                break
+        next_seat = self.seat_state.next_seat(
+            self.seat_state.active, self.player_in_action
+        )
+        # There might not be a next person to act if everyone all-ins
+        if next_seat is not None:
+            self.player_in_action = next_seat
 
     def round_reset(self):
         for player in self.players:
             if player is None:
                 continue
             player.hand_reset()
-        self.per_player_action = {
-            stage: [[] for _ in range(self.num_players)] for stage in ALL_POKER_STAGES
-        }
+        self._clear_bets()
         self.stage = PokerStage.PREFLOP
         self.state = PokerTableState.BLIND
         self.player_in_action = self.button
         self._next()
         self._assign_positions()
 
+    def _clear_bets(self):
+        self.action_log.clear()
+        self.per_player_bet.fill(0)
+        self.per_stage_bet.fill(0)
+        self.pot_size = 0
+        self.max_bet = 0
+
+    def _record_action(self, seat: int, action: PlayerAction, bet: Chips):
+        """
+        Log the action of seat in the current stage and update the running bets
+        """
+        self.action_log.append(seat, self.stage, action, bet)
+        self.per_player_bet[seat] += bet
+        self.per_stage_bet[self.stage.value, seat] += bet
+        self.pot_size += bet
+        self.max_bet = max(self.max_bet, int(self.per_player_bet[seat]))
+
     def _blind(self):
         assert self.player_in_action is not None
         small_blind = self.players[self.player_in_action]
         assert small_blind is not None
         bet = small_blind.blind(self.cfg["small_blind"], self.cfg["big_blind"])
-        self.per_player_action[self.stage][self.player_in_action].append(
-            (PlayerAction.SMALL_BLIND, bet)
-        )
+        self._record_action(self.player_in_action, PlayerAction.SMALL_BLIND, bet)
         self._next()
 
         big_blind = self.players[self.player_in_action]
         assert big_blind is not None
         bet = big_blind.blind(self.cfg["big_blind"], self.cfg["big_blind"])
-        self.per_player_action[self.stage][self.player_in_action].append(
-            (PlayerAction.BIG_BLIND, bet)
-        )
+        self._record_action(self.player_in_action, PlayerAction.BIG_BLIND, bet)
         if big_blind.status == PlayerStatus.RAISE and not small_blind.is_all_in():
             small_blind.status = PlayerStatus.WAITING_TURN
         self._next()
 
-    def get_player_stacks(self):
+    def get_player_stacks(self) -> List[Chips]:
         stacks = []
         for i in range(self.num_players):
             player = self.players[i]
             if player is None:
-                stacks.append(0.0)
+                stacks.append(0)
             else:
                 stacks.append(player.stack)
         return stacks
@@ -200,8 +223,8 @@ class PokerTable:
         if straddle_player.straddle(
             self.get_player_stacks(), self.player_in_action, self.cfg["big_blind"]
         ):
-            self.per_player_action[self.stage][self.player_in_action].append(
-                (PlayerAction.STRADDLE, 2 * self.cfg["big_blind"])
+            self._record_action(
+                self.player_in_action, PlayerAction.STRADDLE, 2 * self.cfg["big_blind"]
             )
             for player in self.players:
                 if (
@@ -218,13 +241,32 @@ class PokerTable:
         assert len(self.cards) == CARD_DECK_SIZE
         np.random.shuffle(self.cards)  # type: ignore
         self.active_card_deck = self.cards.copy()
+        self.dead_cards = CardMask()
+        self.board_state = EvaluatorState()
+
+    def _draw_card(self) -> PokerCard:
+        card = self.active_card_deck.pop()
+        assert card not in self.dead_cards, (card, self.dead_cards)
+        self.dead_cards = self.dead_cards.add(card)
+        return card
+
+    def _draw_board_card(self, index: int):
+        card = self._draw_card()
+        self.board[index] = card
+        self.board_state = self.board_state.add(card.code)
+
+    def get_remaining_cards(self) -> CardMask:
+        """
+        get cards that are not dealt yet (including other players' holes)
+        """
+        return self.dead_cards.complement()
 
     def _deal(self):
         assert self.button is not None
         hands: List[List[PokerCard]] = [[] for _ in range(self.num_player_cards)]
         for i in range(self.num_player_cards):
             for _ in range(self.num_hand_players):
-                hands[i].append(self.active_card_deck.pop())
+                hands[i].append(self._draw_card())
 
         count = 0
         for player_idx in range(self.button + 1, self.button + self.num_players + 1):
@@ -242,31 +284,26 @@ class PokerTable:
         return self.get_num_alive_players() < MIN_NUM_PLAYERS
 
     def _action_finished(self) -> bool:
-        action_finished = True
-        raise_counter = 0
-        for player in self.players:
-            if player is None:
-                continue
-            elif player.status == PlayerStatus.WAITING_TURN:
-                action_finished = False
-            elif player.status == PlayerAction.RAISE and not player.is_all_in():
-                raise_counter += 1
-
-        if raise_counter >= MIN_NUM_PLAYERS:
-            action_finished = False
-
-        return action_finished
+        return (
+            self.seat_state.waiting == 0
+            and self.seat_state.num_raising < MIN_NUM_PLAYERS
+        )
 
     def player_action(self, curr_player: PokerPlayer):
         assert self.player_in_action is not None
+        # Agents read the running bets without being able to modify them
+        per_player_bet = self.per_player_bet.view()
+        per_player_bet.flags.writeable = False
         bet, action = curr_player.action(
             self.board,
-            self.per_player_action,
+            per_player_bet,
+            self.max_bet,
+            self.action_log,
             self.get_player_stacks(),
             self.player_in_action,
             self.cfg["big_blind"],
         )
-        self.per_player_action[self.stage][self.player_in_action].append((action, bet))
+        self._record_action(self.player_in_action, action, bet)
         if action == PlayerAction.RAISE:
             for player in self.players:
                 if player is None or player == curr_player or not player.is_active():
@@ -298,84 +335,57 @@ class PokerTable:
                 continue
             else:
                 assert player.stack >= 0, (player.name, player.stack)
-                if np.isclose(player.stack, 0):
+                if player.stack == 0:
                     player.try_buy_in(self.cfg["min_buy_in"], self.cfg["max_buy_in"])
                     if player.is_eliminated() and player not in self.eliminated_players:
                         # Eliminate Player
                         self.eliminated_players[player] = self.hand_number
+                        player.stand_up()
                         self.players[i] = None
 
     def get_num_living_players(self) -> int:
         """
         Get number of players surviving in the game. (Not Eliminated)
         """
-        num_out_players = 0
-        for player in self.players:
-            if player is None or player.is_eliminated():
-                num_out_players += 1
-        num_alive_players = self.num_players - num_out_players
-        return num_alive_players
+        return self.seat_state.num_living
 
     def get_num_active_players(self) -> int:
         """
         get number of players that can take action (Bet)
         """
-        num_active_players = 0
-        for player in self.players:
-            if player is not None and player.is_active():
-                num_active_players += 1
-        return num_active_players
+        return self.seat_state.num_active
 
     def get_num_alive_players(self) -> int:
         """
         get number of players participating in current hand (but can be all-in)
         """
-        num_alive_players = 0
-        for player in self.players:
-            if player is not None and player.is_alive():
-                num_alive_players += 1
-        return num_alive_players
+        return self.seat_state.num_alive
 
     def get_num_hand_players(self) -> int:
         """
         get number of players that can receive a new hand.
         """
-        num_hand_players = 0
-        for player in self.players:
-            if player is not None and player.is_joining():
-                num_hand_players += 1
-        return num_hand_players
+        return self.seat_state.num_joining
 
     def get_living_players(self) -> List[PokerPlayer]:
         """
         get number of players surviving. (Not eliminated)
         """
         living_players = []
-        for player in self.players:
-            if player is not None and not player.is_eliminated():
-                living_players.append(player)
+        for seat in SeatState.seats(self.seat_state.living):
+            player = self.players[seat]
+            assert player is not None
+            living_players.append(player)
         return living_players
 
-    def get_per_player_bets(self) -> List[float]:
+    def get_per_player_bets(self) -> List[Chips]:
         """
         get per player total bet in current stage (for display)
         """
-        stage_actions = self.per_player_action[self.stage]
-        assert len(stage_actions) == self.num_players
-        player_bets = []
-        for i in range(self.num_players):
-            total_bet = 0
-            for action, bet in stage_actions[i]:
-                total_bet += bet
-            player_bets.append(total_bet)
-        return player_bets
+        return self.per_stage_bet[self.stage.value].tolist()
 
     def get_num_empty_seats(self) -> int:
-        count = 0
-        for player in self.players:
-            if player is None:
-                count += 1
-        return count
+        return self.seat_state.num_empty
 
     def preflop(self):
         assert self.get_num_active_players() >= MIN_NUM_PLAYERS
@@ -397,9 +407,9 @@ class PokerTable:
                 == CARD_DECK_SIZE - self.num_player_cards * self.num_hand_players
             )
             assert self.stage == PokerStage.FLOP
-            self.active_card_deck.pop()
+            self._draw_card()
             for i in range(NUM_FLOP_CARDS):
-                self.board[i] = self.active_card_deck.pop()
+                self._draw_board_card(i)
             self._action()
             self._end_stage()
 
@@ -415,9 +425,9 @@ class PokerTable:
                 - 1
             )
             assert self.stage == PokerStage.TURN
-            self.active_card_deck.pop()
+            self._draw_card()
             for i in range(NUM_TURN_CARDS):
-                self.board[NUM_FLOP_CARDS + i] = self.active_card_deck.pop()
+                self._draw_board_card(NUM_FLOP_CARDS + i)
             self._action()
             self._end_stage()
 
@@ -434,11 +444,9 @@ class PokerTable:
                 - 2
             )
             assert self.stage == PokerStage.RIVER
-            self.active_card_deck.pop()
+            self._draw_card()
             for i in range(NUM_RIVER_CARDS):
-                self.board[
-                    NUM_FLOP_CARDS + NUM_TURN_CARDS + i
-                ] = self.active_card_deck.pop()
+                self._draw_board_card(NUM_FLOP_CARDS + NUM_TURN_CARDS + i)
             self._action()
             self._end_stage()
 
@@ -446,80 +454,69 @@ class PokerTable:
         self._cashing()
         self._eliminate_players()
 
+    def _showdown_ranks(self, player_holes: List[PokerHole]) -> List[int]:
+        hole_codes = [[card.code for card in hole] for hole in player_holes]
+        if self.cfg["game_type"] == PokerGameType.HOLDEM:
+            # Board was evaluated street by street, only the holes are left to score
+            return strengths_to_ranks(
+                [self.board_state.evaluate(hole) for hole in hole_codes]
+            )
+        else:
+            # Omaha hands must use exactly two hole cards
+            return rank_omaha_hands(self.board_state.codes, hole_codes)
+
+    def _seat_order(self) -> List[int]:
+        """
+        Seats from the first seat left of the button, the order odd chips of split
+        pots are handed out in
+        """
+        assert self.button is not None
+        return [
+            (self.button + i) % self.num_players for i in range(1, self.num_players + 1)
+        ]
+
     def _cashing(self):
+        seats = []
         player_holes = []
-        candidate_players = []
-        pre_cash_stack = self.get_table_stack_size()
-        pot_size = self.get_pot_size()
-        for player in self.players:
-            if player is None:
-                continue
-            elif player.status in [
+        for seat, player in enumerate(self.players):
+            if player is not None and player.status in [
                 PlayerStatus.CALL,
                 PlayerStatus.RAISE,
             ]:
+                seats.append(seat)
                 player_holes.append(player.open_cards())
-                candidate_players.append(player)
 
-        player_ranks, _ = rank_hands(self.board, player_holes)
-        ranked_players = {}
-        for rank, player in zip(player_ranks, candidate_players):
-            if rank in ranked_players:
-                ranked_players[rank].append(self.players.index(player))
-            else:
-                ranked_players[rank] = [self.players.index(player)]
-
-        total_pot = self.get_pot_size()
-        per_player_bet = PokerPlayer.per_player_action_to_bet(self.per_player_action)
-        for rank in sorted(ranked_players.keys()):
-            if np.allclose(total_pot, 0):
-                break
-            elif total_pot < 0:
-                raise ValueError(
-                    f"Something has gone wrong with cashing out! Total pot size {total_pot} is different from total prize"
-                )
-            else:
-                num_ties = len(ranked_players[rank])
-                players = [self.players[i] for i in ranked_players[rank]]
-                bets = np.array([per_player_bet[i] for i in ranked_players[rank]])
-                players_and_bets = sorted(zip(players, bets), key=lambda x: x[1])
-                players, bets = [x[0] for x in players_and_bets], [
-                    x[1] for x in players_and_bets
-                ]
-                bets = np.array([0] + bets)
-                bets = bets[1:] - bets[:-1]
-                rank_cashed_outs = np.zeros(self.num_players)
-                per_player_bets = per_player_bet
-                for i, player in enumerate(players):
-                    cashed_out_bets = np.zeros(self.num_players)
-                    for j in range(i + 1):
-                        player_pots = np.minimum(bets[j], per_player_bets)
-                        cashed_out_bets += player_pots / num_ties
-                        per_player_bets = per_player_bets - player_pots / num_ties
-
-                    if np.allclose(cashed_out_bets, 0):
-                        # Added for floating point precision errors
-                        cashed_out_bets = np.zeros(self.num_players)
-                    rank_cashed_outs += cashed_out_bets
-                    player.cash(np.sum(cashed_out_bets))
-                    total_pot = total_pot - np.sum(cashed_out_bets)
-                    num_ties = num_ties - 1
-
-                per_player_bet = per_player_bet - rank_cashed_outs
-
-        assert np.allclose(total_pot, 0), total_pot
-        assert np.allclose(per_player_bet, np.zeros(self.num_players)), (
-            per_player_bet,
-            np.zeros(self.num_players),
+        pre_cash_stack = self.get_table_stack_size()
+        pot_size = self.pot_size
+        low_strengths = None
+        if self.cfg["game_type"] == PokerGameType.PLO_HILO:
+            # Every pot is split between high and low hands
+            high_strengths, low_values = evaluate_omaha_hilo(
+                self.board_state.codes,
+                [[card.code for card in hole] for hole in player_holes],
+            )
+            low_strengths = dict(zip(seats, low_values))
+        else:
+            # Best rank is 0, negate so that larger is better
+            high_strengths = [-rank for rank in self._showdown_ranks(player_holes)]
+        payouts = split_pots(
+            self.per_player_bet.tolist(),
+            dict(zip(seats, high_strengths)),
+            low_strengths,
+            seat_order=self._seat_order(),
         )
-        assert np.allclose(pre_cash_stack + pot_size, self.get_table_stack_size()), (
+        for seat in seats:
+            player = self.players[seat]
+            assert player is not None
+            player.cash(int(payouts[seat]))
+
+        assert int(payouts.sum()) == pot_size, (payouts, pot_size)
+        assert pre_cash_stack + pot_size == self.get_table_stack_size(), (
             pre_cash_stack,
             pot_size,
             self.get_table_stack_size(),
         )
-        self.per_player_action = {
-            stage: [[] for _ in range(self.num_players)] for stage in ALL_POKER_STAGES
-        }
+        self._clear_bets()
 
     def play_hand(self):
         """
@@ -556,19 +553,17 @@ class PokerTable:
                         self._shuffle()
                         self._deal()
                     case PokerStage.FLOP:
-                        self.active_card_deck.pop()
+                        self._draw_card()
                         for i in range(NUM_FLOP_CARDS):
-                            self.board[i] = self.active_card_deck.pop()
+                            self._draw_board_card(i)
                     case PokerStage.TURN:
-                        self.active_card_deck.pop()
+                        self._draw_card()
                         for i in range(NUM_TURN_CARDS):
-                            self.board[NUM_FLOP_CARDS + i] = self.active_card_deck.pop()
+                            self._draw_board_card(NUM_FLOP_CARDS + i)
                     case PokerStage.RIVER:
-                        self.active_card_deck.pop()
+                        self._draw_card()
                         for i in range(NUM_RIVER_CARDS):
-                            self.board[
-                                NUM_FLOP_CARDS + NUM_TURN_CARDS + i
-                            ] = self.active_card_deck.pop()
+                            self._draw_board_card(NUM_FLOP_CARDS + NUM_TURN_CARDS + i)
                 if self._action_finished():
                     self.state = PokerTableState.END_STAGE
                 else:
@@ -600,10 +595,10 @@ class PokerTable:
                 self.move_button()
                 self.state = PokerTableState.BLIND
 
-    def get_pot_size(self) -> float:
-        return np.sum(PokerPlayer.per_player_action_to_bet(self.per_player_action))
+    def get_pot_size(self) -> Chips:
+        return self.pot_size
 
-    def get_table_stack_size(self) -> float:
+    def get_table_stack_size(self) -> Chips:
         stack = 0
         for player in self.players:
             if player is not None:
@@ -615,18 +610,17 @@ class PokerTable:
         if new_player.is_eliminated():
             success = False
         else:
-            for i, player in enumerate(self.players):
-                if player is None:
-                    empty_seats.append(i)
+            empty_seats = list(SeatState.seats(self.seat_state.empty))
             success = len(empty_seats) > 0
             if success:
-                seat = np.random.choice(empty_seats)
+                seat = int(np.random.choice(empty_seats))
                 self.players[seat] = new_player
+                new_player.sit(seat, self.seat_state)
         return success
 
-    def update_blind(self, small_blind: float, big_blind: float):
-        self.cfg["small_blind"] = small_blind
-        self.cfg["big_blind"] = big_blind
+    def update_blind(self, small_blind: Chips, big_blind: Chips):
+        self.cfg["small_blind"] = to_chips(small_blind)
+        self.cfg["big_blind"] = to_chips(big_blind)
 
     def player_has_holes(self) -> bool:
         for player in self.players:
@@ -669,7 +663,7 @@ class PokerTable:
             report[player] = {}
             report[player]["name"] = player.name
             report[player]["stack"] = player.stack
-            assert np.isclose(player.stack, 0)
+            assert player.stack == 0, player.stack
             report[player]["num_hands_played"] = self.eliminated_players[player]
 
         for player in self.get_living_players():
@@ -4,6 +4,7 @@ import numpy as np
 from .poker_arcade import PokerHomeScreen, PokerTableScreen
 from .poker.agents import ALL_AGENT_TYPES
 from .poker.components.constants import MAX_NUM_PLAYERS
+from .poker.components.evaluator import warm_up
 from .poker import poker_cache_game_init, poker_tournament_init
 from .poker_arcade.constants import SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE
 
@@ -20,6 +21,8 @@ class PokerGuacHoldemEngine(arcade.Window):
 
     def setup(self):
         """Set up the game variables. Call to re-start the game."""
+        # Load hand evaluator tables while the window opens
+        warm_up(background=True)
         # Create your sprites and sprite lists here
         player_names = [
             "Alex",
@@ -0,0 +1,114 @@
+import os
+import unittest
+import tempfile
+import itertools
+import numpy as np
+from typing import List
+
+from pokerguac.poker.components.card import PokerCard, PokerHole, PokerBoard
+from pokerguac.poker.components.table_file import save_table_file
+from pokerguac.poker.gto import abstraction
+from pokerguac.poker.gto.abstraction import (
+    _assign_buckets,
+    BOARD_INDEXERS,
+    bucket,
+    BUCKET_TABLE_NAME,
+    BUCKET_TABLE_VERSION,
+    generate_buckets,
+    load_buckets,
+    NUM_RIVER_BUCKETS,
+)
+from pokerguac.poker.gto.isomorphism import FLOP_INDEXER, preflop_index
+from pokerguac.poker.gto.probabilities import compute_hand_strength
+
+
+def to_cards(symbols: str) -> List[PokerCard]:
+    return [PokerCard.from_symbol(symbol) for symbol in symbols.split()]
+
+
+def to_hole(cards: List[PokerCard]) -> PokerHole:
+    first, second = cards
+    return first, second
+
+
+def to_board(cards: List[PokerCard]) -> PokerBoard:
+    board: PokerBoard = list(cards)
+    return board + [None] * (5 - len(board))
+
+
+class TestAbstraction(unittest.TestCase):
+    def test_flop_buckets(self):
+        board_indices = [100, 900]
+        num_buckets = 8
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "buckets.bin")
+            work_dir = os.path.join(tmp_dir, "work")
+            self.assertFalse(
+                generate_buckets(
+                    "flop", num_buckets, path, work_dir, board_indices=board_indices
+                )
+            )
+            histograms = np.load(os.path.join(work_dir, "histograms.npy"))
+            ehs = np.load(os.path.join(work_dir, "ehs.npy"))
+            computed = np.flatnonzero(histograms.sum(axis=1))
+            buckets = np.zeros(FLOP_INDEXER.size, dtype=np.uint8)
+            buckets[computed], centroids = _assign_buckets(
+                histograms[computed], num_buckets, 0
+            )
+            save_table_file(
+                path,
+                f"{BUCKET_TABLE_NAME}_flop",
+                BUCKET_TABLE_VERSION,
+                {"buckets": buckets},
+            )
+            load_buckets("flop", path)
+            self.addCleanup(abstraction._TABLES.clear)
+            self.addCleanup(abstraction._BUCKETS.clear)
+
+            self.assertEqual(len(centroids), num_buckets)
+            # Buckets are ordered from weak to strong hands
+            mean_ehs = [
+                ehs[computed][buckets[computed] == i, 0].mean()
+                for i in range(num_buckets)
+            ]
+            self.assertEqual(np.argmax(mean_ehs), num_buckets - 1)
+            self.assertEqual(np.argmin(mean_ehs), 0)
+
+            board = BOARD_INDEXERS["flop"].unindex(board_indices[0])
+            for hole in itertools.islice(
+                (
+                    hole
+                    for hole in itertools.combinations(range(52), 2)
+                    if not set(hole) & set(board)
+                ),
+                0,
+                None,
+                97,
+            ):
+                # Buckets do not depend on the suit labels
+                codes = [code ^ 1 for code in hole + tuple(board)]
+                cards = [PokerCard.from_code(code) for code in codes]
+                poker_hole, poker_board = to_hole(cards[:2]), to_board(cards[2:])
+                self.assertEqual(
+                    bucket(poker_hole, poker_board),
+                    buckets[FLOP_INDEXER.index(list(hole) + board)],
+                )
+                index = FLOP_INDEXER.index(list(hole) + board)
+                win, draw, _ = compute_hand_strength(poker_hole, poker_board)
+                self.assertAlmostEqual(float(ehs[index, 0]), win + draw / 2, places=5)
+                self.assertGreaterEqual(ehs[index, 1], ehs[index, 0] ** 2 - 1e-6)
+
+    def test_preflop_and_river_buckets(self):
+        hole = to_hole(to_cards("ah kd"))
+        self.assertEqual(bucket(hole, to_board([])), preflop_index([50, 45]))
+        for symbols in ["2h 7h 9c td 2d", "as kh 9c td 2d"]:
+            board = to_board(to_cards(symbols))
+            win, draw, _ = compute_hand_strength(hole, board)
+            self.assertEqual(
+                bucket(hole, board),
+                min(int((win + draw / 2) * NUM_RIVER_BUCKETS), NUM_RIVER_BUCKETS - 1),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+
+from pokerguac.poker.components.action_log import ActionLog
+from pokerguac.poker.components.constants import PlayerAction, PokerStage
+
+
+class TestActionLog(unittest.TestCase):
+    def _log_hand(self, log: ActionLog):
+        log.append(1, PokerStage.PREFLOP, PlayerAction.SMALL_BLIND, 1)
+        log.append(2, PokerStage.PREFLOP, PlayerAction.BIG_BLIND, 3)
+        log.append(0, PokerStage.PREFLOP, PlayerAction.RAISE, 9)
+        log.append(1, PokerStage.PREFLOP, PlayerAction.FOLD, 0)
+        log.append(2, PokerStage.PREFLOP, PlayerAction.CALL, 6)
+        log.append(2, PokerStage.FLOP, PlayerAction.RAISE, 10)
+        log.append(0, PokerStage.FLOP, PlayerAction.CALL, 10)
+
+    def test_views(self):
+        log = ActionLog(capacity=4)
+        self._log_hand(log)
+        self.assertEqual(len(log), 7)
+        flop = log.stage(PokerStage.FLOP)
+        np.testing.assert_array_equal(flop.seats, [2, 0])
+        np.testing.assert_array_equal(flop.amounts, [10, 10])
+        self.assertEqual(len(log.stage(PokerStage.RIVER).seats), 0)
+        seat = log.seat(2)
+        np.testing.assert_array_equal(
+            seat.actions,
+            [PlayerAction.BIG_BLIND.value, PlayerAction.CALL.value, 1],
+        )
+        np.testing.assert_array_equal(log.seat(2, PokerStage.PREFLOP).amounts, [3, 6])
+        np.testing.assert_array_equal(log.per_player_bet(4), [19, 1, 19, 0])
+        np.testing.assert_array_equal(
+            log.per_stage_bet(3)[:2], [[9, 1, 9], [10, 0, 10]]
+        )
+        with self.assertRaises(ValueError):
+            log.hand().amounts[0] = 0
+
+    def test_clear_and_hands(self):
+        log = ActionLog()
+        self._log_hand(log)
+        log.start_hand()
+        self.assertEqual(len(log), 0)
+        log.append(0, PokerStage.PREFLOP, PlayerAction.SMALL_BLIND, 1)
+        np.testing.assert_array_equal(log.per_player_bet(3), [1, 0, 0])
+        self.assertEqual(log.size, 8)
+        log.clear()
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,13 +3,14 @@ import logging
 import numpy as np
 from tqdm import trange
 
-from pokerguac.poker import ALL_AGENT_TYPES
+from pokerguac.poker import ALL_AGENT_TYPES, PokerGameType
 from pokerguac.poker.components.constants import MAX_NUM_PLAYERS, MIN_NUM_PLAYERS
 from pokerguac.poker_engine import poker_cache_game_init
 
 
 REPORT_PERIOD = 25
 NUM_TEST_EPOCHS = 100
+NUM_PLO_TEST_EPOCHS = 20
 MAX_ITERS = 1000
 TEST_PERIOD = 10
 
@@ -33,16 +34,25 @@ class TestCacheGame(unittest.TestCase):
         ]
 
     def test_cache_game_play(self):
+        self._play_cache_games(PokerGameType.HOLDEM, self.test_epochs)
+
+    def test_plo_cache_game_play(self):
+        self._play_cache_games(PokerGameType.PLO, NUM_PLO_TEST_EPOCHS)
+
+    def test_plo_hilo_cache_game_play(self):
+        self._play_cache_games(PokerGameType.PLO_HILO, NUM_PLO_TEST_EPOCHS)
+
+    def _play_cache_games(self, game_type: PokerGameType, num_epochs: int):
         # Using large blinds just for testing purposes
         big_blind = 3
         small_blind = 1
         min_buy_in = 100
         max_buy_in = 300
         player_bank_rolls = (
-            np.random.uniform(low=1, high=3, size=len(self.player_names)) * max_buy_in
+            np.random.randint(max_buy_in, 3 * max_buy_in, size=len(self.player_names))
         ).tolist()
 
-        for epoch in trange(self.test_epochs):
+        for epoch in trange(num_epochs):
             iter = 1
             num_players = np.random.randint(MIN_NUM_PLAYERS, MAX_NUM_PLAYERS + 1)
             action_agent_types = list(
@@ -57,6 +67,7 @@ class TestCacheGame(unittest.TestCase):
                 big_blind,
                 min_buy_in,
                 max_buy_in,
+                game_type=game_type,
             )
             before_total_bank_roll = 0
             for player in players:
@@ -78,15 +89,12 @@ class TestCacheGame(unittest.TestCase):
                     after_total_bank_roll = 0
                     for player in players:
                         after_total_bank_roll += player.bank_roll + player.stack
-                    self.assertTrue(
-                        np.allclose(before_total_bank_roll, after_total_bank_roll),
-                        (before_total_bank_roll, after_total_bank_roll),
-                    )
+                    self.assertEqual(before_total_bank_roll, after_total_bank_roll)
                     table_net_profit = 0
                     for player in players:
                         table_net_profit += player.net_profit()
                     # Check if zero-sum game
-                    self.assertTrue(np.isclose(table_net_profit, 0))
+                    self.assertEqual(table_net_profit, 0)
                 iter += 1
 
             if epoch % self.report_period == 0:
@@ -0,0 +1,76 @@
+import copy
+import pickle
+import unittest
+
+from math import comb
+
+from pokerguac.poker.components.card import PokerCard
+from pokerguac.poker.components.card_mask import CardMask
+
+
+class TestPokerCard(unittest.TestCase):
+    def test_interned(self):
+        card = PokerCard("a", "s")
+        self.assertIs(card, PokerCard.from_symbol("AS"))
+        self.assertIs(card, PokerCard.from_code(card.code))
+        self.assertIs(card, pickle.loads(pickle.dumps(card)))
+        self.assertIs(card, copy.deepcopy(card))
+        deck = PokerCard.deck()
+        self.assertEqual(len(deck), 52)
+        self.assertEqual(len({card.code for card in deck}), 52)
+        self.assertIsNot(deck, PokerCard.deck())
+        for card in deck:
+            self.assertIs(card, PokerCard.from_code(card.code))
+
+    def test_immutable(self):
+        card = PokerCard.from_symbol("td")
+        with self.assertRaises(AttributeError):
+            card._number = 3  # type: ignore
+        with self.assertRaises(AttributeError):
+            card.other = 3  # type: ignore
+        self.assertEqual((card.rank, card.suit_index, str(card)), (8, 1, "td"))
+
+    def test_number_equality(self):
+        ace_spade = PokerCard.from_symbol("as")
+        ace_diamond = PokerCard.from_symbol("ad")
+        self.assertEqual(ace_spade, ace_diamond)
+        self.assertFalse(ace_spade.equal(ace_diamond))
+        self.assertTrue(ace_spade.equal(PokerCard.from_symbol("as")))
+
+
+class TestCardMask(unittest.TestCase):
+    def test_set_operations(self):
+        cards = [PokerCard.from_symbol(symbol) for symbol in ["as", "kd", "2c"]]
+        mask = CardMask.from_cards(cards + [None])  # type: ignore
+        self.assertEqual(len(mask), 3)
+        self.assertIn(cards[0], mask)
+        self.assertIn(cards[1].code, mask)
+        self.assertNotIn(PokerCard.from_symbol("ad"), mask)
+        self.assertEqual(mask.cards(), sorted(cards, key=lambda card: card.code))
+        self.assertEqual(list(mask), mask.cards())
+
+        other = CardMask.from_codes([cards[0].code, PokerCard.from_symbol("3h").code])
+        self.assertEqual(
+            mask | other, CardMask.from_cards(cards + [PokerCard("3", "h")])
+        )
+        self.assertEqual((mask & other).cards(), [cards[0]])
+        self.assertEqual(len(mask - other), 2)
+        self.assertEqual(len(mask.complement()), 49)
+        self.assertFalse(mask & mask.complement())
+        self.assertEqual(mask | mask.complement(), CardMask.full())
+        self.assertEqual(mask.add(PokerCard("3", "h")), mask | other)
+
+    def test_combinations(self):
+        remain = CardMask.from_cards(PokerCard.deck()[:47]).complement()
+        self.assertEqual(len(list(remain.combinations(2))), comb(5, 2))
+        codes = remain.combination_codes(3)
+        self.assertEqual(codes.shape, (comb(5, 3), 3))
+        self.assertEqual(
+            codes.tolist(),
+            [[card.code for card in cards] for cards in remain.combinations(3)],
+        )
+        self.assertEqual(remain.combination_codes(0).shape, (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
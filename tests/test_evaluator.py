@@ -0,0 +1,317 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from typing import List, Tuple
+
+from pokerguac.poker.components.card import PokerCard, PokerHand, PokerHole
+from pokerguac.poker.components.constants import HandRanking
+from pokerguac.poker.components.evaluator import (
+    evaluate,
+    evaluate_batch,
+    evaluate_holes_batch,
+    EvaluatorState,
+    hand_ranking,
+    hand_ranking_batch,
+    strengths_to_ranks,
+    strengths_to_ranks_batch,
+    NUM_HAND_STRENGTHS,
+    EVALUATOR_TABLE_NAME,
+    get_table_path,
+    load_tables,
+    warm_up,
+)
+from pokerguac.poker.components.table_file import (
+    load_table_file,
+    save_table_file,
+    TableVersionError,
+)
+from pokerguac.poker.components.rules import (
+    rank_hands,
+    rank_hands_batch,
+    get_final_hand_made,
+    HANDRANKING_DICT,
+)
+
+
+def to_codes(symbols: str):
+    return [PokerCard.from_symbol(symbol).code for symbol in symbols.split()]
+
+
+def to_cards(symbols: str) -> List[PokerCard]:
+    return [PokerCard.from_symbol(symbol) for symbol in symbols.split()]
+
+
+def split_hand(cards: List[PokerCard]) -> Tuple[PokerHand, PokerHole]:
+    """
+    Five board cards and a hole from seven cards
+    """
+    first, second, third, fourth, fifth, sixth, seventh = cards
+    return (first, second, third, fourth, fifth), (sixth, seventh)
+
+
+def to_hand_and_hole(symbols: str) -> Tuple[PokerHand, PokerHole]:
+    return split_hand(to_cards(symbols))
+
+
+class TestEvaluator(unittest.TestCase):
+    def test_hand_rankings(self):
+        cases = {
+            "as ks qs js ts 2d 3c": HandRanking.ROYAL,
+            "9h 8h 7h 6h 5h ah kh": HandRanking.STRAIGHTFLUSH,
+            "5d 4d 3d 2d ad kc kh": HandRanking.STRAIGHTFLUSH,
+            "7c 7d 7h 7s 2c 2d 2h": HandRanking.QUADS,
+            "7c 7d 7h 2s 2c 3d 3h": HandRanking.FULLHOUSE,
+            "7c 7d 7h 2s 2c 2d 3h": HandRanking.FULLHOUSE,
+            "ac 9c 7c 5c 2c kd kh": HandRanking.FLUSH,
+            "8d 9c td 8h jc qs 2h": HandRanking.STRAIGHT,
+            "ac 2d 3h 4s 5c 5d kh": HandRanking.STRAIGHT,
+            "qc qd qh 2s 5c 9d kh": HandRanking.TRIPS,
+            "qc qd 2h 2s 5c 5d kh": HandRanking.TWOPAIR,
+            "qc qd 2h 3s 5c 9d kh": HandRanking.PAIR,
+            "qc td 2h 3s 5c 9d kh": HandRanking.HIGH,
+        }
+        for symbols, ranking in cases.items():
+            self.assertEqual(
+                hand_ranking(evaluate(to_codes(symbols))), ranking, symbols
+            )
+        strengths = evaluate_batch(np.array([to_codes(symbols) for symbols in cases]))
+        self.assertEqual(
+            hand_ranking_batch(strengths).tolist(),
+            [ranking.value for ranking in cases.values()],
+        )
+
+    def test_strength_order(self):
+        ordered = [
+            "7d 5c 4h 3s 2c",
+            "ad kd qd jd 9c",
+            "2c 2d 3h 4s 5c",
+            "ac ad kh qs jc",
+            "3c 3d 2h 2s ac",
+            "ac ad kh ks qc",
+            "2c 2d 2h 3s 4c",
+            "ac 2d 3h 4s 5c",
+            "ac kd qh js tc",
+            "7c 5c 4c 3c 2c",
+            "2c 2d 2h 3s 3c",
+            "2c 2d 2h 2s 3c",
+            "ac 2c 3c 4c 5c",
+            "kc qc jc tc 9c",
+            "ac kc qc jc tc",
+        ]
+        strengths = [evaluate(to_codes(symbols)) for symbols in ordered]
+        self.assertEqual(strengths, sorted(strengths))
+        self.assertEqual(len(set(strengths)), len(strengths))
+        self.assertEqual(strengths[0], 1)
+        self.assertEqual(strengths[-1], NUM_HAND_STRENGTHS)
+
+    def test_best_five_of_seven(self):
+        # Sixth and seventh kickers do not play
+        hand1 = evaluate(to_codes("ac ad kh qs jc 3d 2h"))
+        hand2 = evaluate(to_codes("ah as kd qc jd 4d 2c"))
+        self.assertEqual(hand1, hand2)
+        self.assertEqual(hand1, evaluate(to_codes("ac ad kh qs jc")))
+        # Third pair plays as kicker
+        hand1 = evaluate(to_codes("ac ad kh ks qc qd 2h"))
+        hand2 = evaluate(to_codes("ac ad kh ks jc jd qh"))
+        self.assertEqual(hand1, hand2)
+
+    def test_strengths_to_ranks(self):
+        self.assertEqual(strengths_to_ranks([9, 9, 5]), [0, 0, 2])
+        self.assertEqual(strengths_to_ranks([1, 5, 5, 7]), [3, 1, 1, 0])
+        self.assertEqual(strengths_to_ranks([3]), [0])
+
+    def test_rank_hands(self):
+        board = to_cards("8d 9c td 2h 2c")
+        holes = [
+            tuple(to_cards("jc qs")),
+            tuple(to_cards("8h 8s")),
+            tuple(to_cards("ac kc")),
+            tuple(to_cards("ah kh")),
+            tuple(to_cards("jd 7c")),
+        ]
+        ranks, final_hands = rank_hands(board, holes)
+        self.assertEqual(ranks, [1, 0, 3, 3, 2])
+        self.assertEqual(len(final_hands), len(holes))
+        self.assertEqual(final_hands[2], final_hands[3])
+        self.assertLess(final_hands[0], final_hands[1])
+        self.assertEqual(rank_hands(board, holes, rank_only=True), (ranks, []))
+
+    def test_hand_type_sort_key(self):
+        ordered = [
+            "qc td 2h 3s 5c 9d kh",
+            "qc qd 2h 3s 5c 9d kh",
+            "qc qd 2h 2s 5c 9d kh",
+            "kc kd 2h 2s 5c 9d qh",
+            "ac 2d 3h 4s 5c kd kh",
+            "9c td jh qs kc 2d 2h",
+            "7c 7d 7h 2s 2c 3d 3h",
+            "7c 7d 7h 7s 2c 2d ah",
+            "5d 4d 3d 2d ad kc kh",
+            "as ks qs js ts 2d 3c",
+        ]
+        hand_types = []
+        for symbols in ordered:
+            hand_type, final_hand = get_final_hand_made(*to_hand_and_hole(symbols))
+            hand_types.append(HANDRANKING_DICT[hand_type](final_hand, checked=True))
+            self.assertEqual(hand_types[-1], HANDRANKING_DICT[hand_type](final_hand))
+        self.assertEqual(sorted(hand_types, key=lambda x: x.sort_key), hand_types)
+        for weaker, stronger in zip(hand_types[:-1], hand_types[1:]):
+            self.assertLess(weaker, stronger)
+
+    def test_reference_cross_check(self):
+        # Paired cards inside a straight (2h 6d on 3c 5h 3h 6h 4s is a six high
+        # straight, not two pair)
+        board, hole = to_hand_and_hole("3c 5h 3h 6h 4s 2h 6d")
+        self.assertEqual(get_final_hand_made(board, hole)[0], HandRanking.STRAIGHT)
+        rng = np.random.default_rng(17)
+        strengths, hand_types = [], []
+        for _ in range(4000):
+            codes = rng.choice(52, 7, replace=False).tolist()
+            board, hole = split_hand([PokerCard.from_code(code) for code in codes])
+            hand_type, final_hand = get_final_hand_made(board, hole)
+            strength = evaluate(codes)
+            self.assertEqual(hand_ranking(strength), hand_type, (board, hole))
+            strengths.append(strength)
+            hand_types.append(HANDRANKING_DICT[hand_type](final_hand, checked=True))
+        # Same order and ties as the reference hand types
+        for i in rng.choice(len(strengths), (2000, 2)).tolist():
+            first, second = i
+            self.assertEqual(
+                strengths[first] < strengths[second],
+                hand_types[first] < hand_types[second],
+            )
+            self.assertEqual(
+                strengths[first] == strengths[second],
+                hand_types[first] == hand_types[second],
+            )
+
+    def test_evaluate_batch(self):
+        rng = np.random.default_rng(0)
+        for num_cards in range(5, 8):
+            cards = np.array([rng.permutation(52)[:num_cards] for _ in range(2000)])
+            expected = [evaluate(hand.tolist()) for hand in cards]
+            self.assertEqual(evaluate_batch(cards).tolist(), expected)
+
+        strengths = rng.integers(1, 20, size=(200, 6))
+        expected = [strengths_to_ranks(row.tolist()) for row in strengths]
+        self.assertEqual(strengths_to_ranks_batch(strengths).tolist(), expected)
+
+    def test_rank_hands_batch(self):
+        board = to_cards("8d 9c td 2h 2c")
+        holes = [to_cards("jc qs"), to_cards("8h 8s"), to_cards("ac kc")]
+        ranks, _ = rank_hands(board, [tuple(hole) for hole in holes])
+        board_codes = np.array([[card.code for card in board]] * 2)
+        hole_codes = np.array([[[card.code for card in hole] for hole in holes]] * 2)
+        strengths, batch_ranks = rank_hands_batch(board_codes, hole_codes)
+        self.assertEqual(strengths.shape, (2, 3))
+        self.assertEqual(batch_ranks.tolist(), [ranks, ranks])
+
+
+class TestEvaluatorState(unittest.TestCase):
+    def test_street_by_street(self):
+        rng = np.random.default_rng(7)
+        for _ in range(500):
+            cards = [int(code) for code in rng.choice(52, 9, replace=False)]
+            board, holes = cards[:5], [cards[5:7], cards[7:9]]
+            state = EvaluatorState(board[:3])
+            for street_end in [3, 4, 5]:
+                if street_end > 3:
+                    state = state.add(board[street_end - 1])
+                for hole in holes:
+                    self.assertEqual(
+                        state.evaluate(hole), evaluate(board[:street_end] + hole)
+                    )
+
+    def test_flush_and_straight_on_board(self):
+        state = EvaluatorState(to_codes("2h 7h 9h"))
+        self.assertEqual(state.rank_mask, 0b10100001)
+        self.assertEqual(state.suit_counts[2], 3)
+        river_state = state.add(to_codes("th")[0]).add(to_codes("8c")[0])
+        fresh_state = EvaluatorState(to_codes("2h 7h 9h th 8c"))
+        self.assertEqual(river_state.rank_counts, fresh_state.rank_counts)
+        self.assertEqual(river_state.suit_masks, fresh_state.suit_masks)
+        self.assertEqual(river_state.suit_counts, fresh_state.suit_counts)
+        self.assertEqual(state.codes, tuple(to_codes("2h 7h 9h")))
+        self.assertEqual(state.suit_counts[2], 3)
+        for hole in ["jh 3c", "jc 6d", "ah ad", "4c 4d"]:
+            self.assertEqual(
+                river_state.evaluate(to_codes(hole)),
+                evaluate(to_codes("2h 7h 9h th 8c " + hole)),
+            )
+
+    def test_evaluate_holes_batch(self):
+        rng = np.random.default_rng(8)
+        for num_board_cards in [3, 4, 5]:
+            boards = np.array(
+                [rng.choice(52, num_board_cards, replace=False) for _ in range(50)]
+            )
+            holes = np.array([rng.choice(52, 2, replace=False) for _ in range(60)])
+            strengths = evaluate_holes_batch(boards, holes)
+            self.assertEqual(strengths.shape, (50, 60))
+            for i, board in enumerate(boards):
+                for j, hole in enumerate(holes):
+                    if set(board) & set(hole):
+                        continue
+                    self.assertEqual(
+                        strengths[i, j], evaluate(list(board) + list(hole))
+                    )
+
+
+class TestEvaluatorTables(unittest.TestCase):
+    def test_table_file_round_trip(self):
+        arrays = {
+            "a": np.arange(10, dtype=np.uint16),
+            "b": np.arange(12, dtype=np.int64).reshape(3, 4),
+        }
+        with tempfile.TemporaryDirectory() as table_dir:
+            path = os.path.join(table_dir, "test.bin")
+            save_table_file(path, "test", 2, arrays, meta={"note": "x"})
+            tables = load_table_file(path, "test", 2)
+            self.assertEqual(tables.meta, {"note": "x"})
+            for name, array in arrays.items():
+                np.testing.assert_array_equal(tables[name], array)
+                self.assertFalse(tables[name].flags.writeable)
+            with self.assertRaises(TableVersionError):
+                load_table_file(path, "test", 3)
+
+    def test_load_tables_rebuilds_stale_file(self):
+        default_tables = load_tables()
+        with tempfile.TemporaryDirectory() as table_dir:
+            path = get_table_path(table_dir)
+            save_table_file(path, EVALUATOR_TABLE_NAME, 0, {"a": np.zeros(1)})
+            tables = load_tables(table_dir)
+            self.assertEqual(load_table_file(path).version, tables.version)
+            for name in ["unsuited", "flush", "category_starts"]:
+                np.testing.assert_array_equal(tables[name], default_tables[name])
+
+    def test_load_tables_rebuilds_truncated_file(self):
+        default_tables = load_tables()
+        with tempfile.TemporaryDirectory() as table_dir:
+            path = get_table_path(table_dir)
+            save_table_file(
+                path,
+                EVALUATOR_TABLE_NAME,
+                default_tables.version,
+                {name: default_tables[name] for name in default_tables.arrays},
+            )
+            with open(path, "rb") as f:
+                data = f.read()
+            for size in [0, 10, 40, len(data) // 2]:
+                with open(path, "wb") as f:
+                    f.write(data[:size])
+                with self.assertRaises(TableVersionError):
+                    load_table_file(path)
+                tables = load_tables(table_dir)
+                for name in ["unsuited", "flush", "category_starts"]:
+                    np.testing.assert_array_equal(tables[name], default_tables[name])
+
+    def test_background_warm_up(self):
+        thread = warm_up(background=True)
+        assert thread is not None
+        thread.join()
+        self.assertEqual(evaluate(to_codes("as ks qs js ts")), NUM_HAND_STRENGTHS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import unittest
+import tempfile
+import itertools
+import numpy as np
+from typing import List
+from unittest import mock
+
+from pokerguac.poker.components.card import PokerCard, PokerHole, PokerBoard
+from pokerguac.poker.components.table_file import save_table_file
+from pokerguac.poker.gto import flop_equity as flop_equity_module
+from pokerguac.poker.gto.flop_equity import (
+    FLOP_EQUITY_TABLE_NAME,
+    FLOP_EQUITY_TABLE_VERSION,
+    FLOP_ONLY_INDEXER,
+    flop_equity,
+    generate_flop_equity,
+    load_flop_equity,
+)
+from pokerguac.poker.gto.probabilities import compute_hand_strength
+
+
+def to_hole(codes: List[int]) -> PokerHole:
+    first, second = codes
+    return PokerCard.from_code(first), PokerCard.from_code(second)
+
+
+def to_board(codes: List[int]) -> PokerBoard:
+    board: PokerBoard = [PokerCard.from_code(code) for code in codes]
+    return board + [None] * (5 - len(board))
+
+
+class TestFlopEquity(unittest.TestCase):
+    def test_generate_and_lookup(self):
+        flop_index = 700
+        flop = FLOP_ONLY_INDEXER.unindex(flop_index)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "flop_equity.bin")
+            work_dir = os.path.join(tmp_dir, "work")
+            self.assertFalse(
+                generate_flop_equity(path, work_dir, flop_indices=[flop_index])
+            )
+            # Finished flops are not computed again
+            with mock.patch.object(
+                flop_equity_module, "_flop_values", side_effect=AssertionError
+            ):
+                self.assertFalse(
+                    generate_flop_equity(path, work_dir, flop_indices=[flop_index])
+                )
+            values = np.load(os.path.join(work_dir, "values.npy"))
+            save_table_file(
+                path,
+                FLOP_EQUITY_TABLE_NAME,
+                FLOP_EQUITY_TABLE_VERSION,
+                {"values": values},
+            )
+            load_flop_equity(path)
+            self.addCleanup(setattr, flop_equity_module, "_TABLE", None)
+
+            rng = np.random.default_rng(31)
+            holes = [
+                hole
+                for hole in itertools.combinations(range(52), 2)
+                if not set(hole) & set(flop)
+            ]
+            for i in rng.choice(len(holes), 5, replace=False):
+                # Same situation with clubs / hearts and diamonds / spades swapped
+                codes = [code ^ 2 for code in holes[i] + tuple(flop)]
+                hole, board = to_hole(codes[:2]), to_board(codes[2:])
+                win, tie, ehs, ehs2 = flop_equity(hole, board)
+                expected_win, expected_tie, _ = compute_hand_strength(hole, board)
+                self.assertAlmostEqual(win, expected_win, places=6)
+                self.assertAlmostEqual(tie, expected_tie, places=6)
+                self.assertAlmostEqual(ehs, win + tie / 2, places=6)
+                self.assertGreaterEqual(ehs2, ehs**2 - 1e-6)
+                self.assertLessEqual(ehs2, ehs + 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
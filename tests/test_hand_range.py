@@ -0,0 +1,139 @@
+import unittest
+import numpy as np
+from typing import List
+
+from pokerguac.poker.components.card import PokerCard, PokerHole, PokerBoard
+from pokerguac.poker.components.card_mask import CardMask
+from pokerguac.poker.gto.hand_range import (
+    _parse_notation,
+    hole_index,
+    HOLE_CODES,
+    NUM_HOLES,
+    Range,
+    range_equity,
+    river_showdown,
+)
+from pokerguac.poker.components.evaluator import evaluate
+from pokerguac.poker.gto.probabilities import compute_hand_strength
+
+
+def to_cards(symbols: str) -> List[PokerCard]:
+    return [PokerCard.from_symbol(symbol) for symbol in symbols.split()]
+
+
+def to_hole(symbols: str) -> PokerHole:
+    first, second = to_cards(symbols)
+    return first, second
+
+
+def to_board(symbols: str) -> PokerBoard:
+    board: PokerBoard = list(to_cards(symbols))
+    return board + [None] * (5 - len(board))
+
+
+class TestRange(unittest.TestCase):
+    def test_notation(self):
+        num_combos = {
+            "QQ": 6,
+            "TT+": 30,
+            "99-66": 24,
+            "AKs": 4,
+            "ATs+": 16,
+            "A5s-A2s": 16,
+            "KQo": 12,
+            "K9o+": 48,
+            "AK": 16,
+            "AhKh": 1,
+            "TT+, AKs, KQo": 46,
+        }
+        for notation, expected in num_combos.items():
+            self.assertEqual(len(Range.from_notation(notation)), expected, notation)
+        self.assertEqual(
+            Range.from_notation("ak, 22+"), Range.from_notation("AK,22-AA")
+        )
+        self.assertEqual(Range.from_notation("AKs:0.5, QQ").num_combos(), 8)
+        self.assertEqual(len(Range()), NUM_HOLES)
+        self.assertIn(tuple(to_cards("kh ah")), Range.from_notation("AKs"))
+        self.assertNotIn(tuple(to_cards("kh ad")), Range.from_notation("AKs"))
+        # Expansions are cached and ranges get their own copy
+        _parse_notation.cache_clear()
+        Range.from_notation("TT+").weights[:] = 0
+        self.assertEqual(len(Range.from_notation("TT+")), 30)
+        self.assertEqual(_parse_notation.cache_info().hits, 1)
+
+    def test_block(self):
+        board = to_cards("ah 2c 3d")
+        blocked = Range.from_notation("TT+, AKs").block(board)
+        self.assertEqual(len(blocked), 30)
+        self.assertEqual(
+            blocked, Range.from_notation("TT+, AKs").block(CardMask.from_cards(board))
+        )
+        board_codes = {card.code for card in board}
+        for hole, _ in blocked.holes():
+            self.assertFalse({card.code for card in hole} & board_codes)
+        self.assertEqual(
+            [HOLE_CODES[hole_index(hole)].tolist() for hole, _ in blocked.holes()],
+            [sorted(card.code for card in hole) for hole, _ in blocked.holes()],
+        )
+
+    def test_range_equity(self):
+        hole = to_hole("ah kh")
+        for board in [to_board("2h 7h 9c td 2d"), to_board("2h 7h 9c")]:
+            win, draw, _ = compute_hand_strength(hole, board)
+            self.assertAlmostEqual(
+                range_equity(Range.from_holes([hole]), Range(), board),
+                win + draw / 2,
+            )
+        board = to_board("2h 7h 9c td")
+        hero = Range.from_notation("TT+, AKs, AKo")
+        villain = Range.from_notation("22+, A2s+, KTs+, QJs:0.5")
+        self.assertAlmostEqual(
+            range_equity(hero, villain, board) + range_equity(villain, hero, board), 1
+        )
+        self.assertAlmostEqual(range_equity(Range(), Range(), board), 0.5)
+        # Preflop samples runouts
+        equity = range_equity(Range.from_notation("AA"), Range(), [None] * 5, seed=1)
+        self.assertAlmostEqual(equity, 0.85, delta=0.01)
+
+    def test_river_showdown(self):
+        board = to_board("2h 7h 9c td 2d")
+        board_codes = [card.code for card in board if card is not None]
+        wins, draws, losses = river_showdown(board, Range())
+        for symbols in ["ah kh", "9s 9d", "3c 4c"]:
+            hole = to_hole(symbols)
+            index = hole_index(hole)
+            self.assertEqual(
+                (wins[index], draws[index], losses[index]),
+                compute_hand_strength(hole, board),
+            )
+        # Weighted range against pairwise comparisons
+        villain = Range.from_notation("TT+:0.5, A2s+, KTs+, QJo, 72o:2")
+        wins, draws, losses = river_showdown(board, villain)
+        rng = np.random.default_rng(41)
+        for index in rng.choice(NUM_HOLES, 50, replace=False):
+            hole_codes = HOLE_CODES[index].tolist()
+            if set(hole_codes) & set(board_codes):
+                self.assertEqual(wins[index] + draws[index] + losses[index], 0)
+                continue
+            strength = evaluate(board_codes + hole_codes)
+            outcomes = np.zeros(3)
+            for villain_hole, weight in villain.holes():
+                villain_codes = [card.code for card in villain_hole]
+                if set(villain_codes) & set(board_codes + hole_codes):
+                    continue
+                villain_strength = evaluate(board_codes + villain_codes)
+                outcomes[
+                    [
+                        strength > villain_strength,
+                        strength == villain_strength,
+                        strength < villain_strength,
+                    ].index(True)
+                ] += weight
+            outcomes /= outcomes.sum()
+            self.assertTrue(
+                np.allclose([wins[index], draws[index], losses[index]], outcomes)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
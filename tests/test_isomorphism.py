@@ -0,0 +1,106 @@
+import unittest
+import itertools
+import numpy as np
+from typing import List
+
+from pokerguac.poker.components.card import PokerCard, PokerHole, PokerBoard
+from pokerguac.poker.gto.isomorphism import (
+    canonical_index,
+    FLOP_INDEXER,
+    NUM_PREFLOP_CLASSES,
+    preflop_class_holes,
+    preflop_class_name,
+    preflop_index,
+    PREFLOP_INDEXER,
+    RIVER_INDEXER,
+    TURN_INDEXER,
+)
+from pokerguac.poker.gto.probabilities import compute_hand_strength
+
+
+def to_cards(symbols: str) -> List[PokerCard]:
+    return [PokerCard.from_symbol(symbol) for symbol in symbols.split()]
+
+
+def to_hole(symbols: str) -> PokerHole:
+    first, second = to_cards(symbols)
+    return first, second
+
+
+def to_board(symbols: str) -> PokerBoard:
+    board: PokerBoard = list(to_cards(symbols))
+    return board + [None] * (5 - len(board))
+
+
+def relabel(codes, permutation):
+    return [code & ~3 | permutation[code & 3] for code in codes]
+
+
+class TestHandIndexer(unittest.TestCase):
+    def test_sizes(self):
+        self.assertEqual(PREFLOP_INDEXER.size, 169)
+        self.assertEqual(FLOP_INDEXER.size, 1286792)
+        self.assertEqual(TURN_INDEXER.size, 55190538)
+        self.assertEqual(RIVER_INDEXER.size, 2428287420)
+        # Every preflop hole lands in a dense class of the right multiplicity
+        counts = np.zeros(PREFLOP_INDEXER.size, dtype=int)
+        for hole in itertools.combinations(range(52), 2):
+            counts[PREFLOP_INDEXER.index(hole)] += 1
+        self.assertEqual(sorted(set(np.unique(counts).tolist())), [4, 6, 12])
+
+    def test_suit_permutations(self):
+        rng = np.random.default_rng(21)
+        permutations = list(itertools.permutations(range(4)))
+        for indexer in [PREFLOP_INDEXER, FLOP_INDEXER, TURN_INDEXER, RIVER_INDEXER]:
+            for _ in range(200):
+                cards = [int(code) for code in rng.choice(52, indexer.num_cards, False)]
+                index = indexer.index(cards)
+                self.assertTrue(0 <= index < indexer.size)
+                for permutation in permutations:
+                    self.assertEqual(indexer.index(relabel(cards, permutation)), index)
+                # Hole and board cards are order free within their rounds
+                shuffled = sorted(cards[:2], reverse=True) + sorted(cards[2:5])
+                shuffled += cards[5:]
+                self.assertEqual(indexer.index(shuffled), index)
+                canonical, permutation = indexer.canonicalize(cards)
+                self.assertEqual(canonical, indexer.unindex(index))
+                self.assertEqual(
+                    sorted(relabel(cards[:2], permutation)), sorted(canonical[:2])
+                )
+
+    def test_unindex(self):
+        rng = np.random.default_rng(22)
+        for indexer in [PREFLOP_INDEXER, FLOP_INDEXER, TURN_INDEXER, RIVER_INDEXER]:
+            for index in rng.choice(indexer.size, min(indexer.size, 500), False):
+                self.assertEqual(indexer.index(indexer.unindex(int(index))), index)
+
+    def test_canonical_index(self):
+        hole = to_hole("ah kh")
+        board = to_board("2c 7c 9d")
+        same = canonical_index(to_hole("as ks"), to_board("2d 7d 9h"))
+        self.assertEqual(canonical_index(hole, board), same)
+        self.assertNotEqual(canonical_index(hole, to_board("2h 7c 9d")), same)
+        self.assertAlmostEqual(sum(compute_hand_strength(hole, board)), 1)
+
+
+class TestPreflopClasses(unittest.TestCase):
+    def test_preflop_classes(self):
+        self.assertEqual(preflop_class_name(0), "AA")
+        self.assertEqual(preflop_class_name(1), "AKs")
+        self.assertEqual(preflop_class_name(13), "AKo")
+        self.assertEqual(preflop_class_name(NUM_PREFLOP_CLASSES - 1), "22")
+        num_holes = 0
+        for index in range(NUM_PREFLOP_CLASSES):
+            holes = preflop_class_holes(index)
+            num_holes += len(holes)
+            for hole in holes:
+                self.assertEqual(preflop_index(hole), index)
+                self.assertEqual(
+                    PREFLOP_INDEXER.index(hole),
+                    PREFLOP_INDEXER.index(preflop_class_holes(index)[0]),
+                )
+        self.assertEqual(num_holes, 52 * 51 // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+import itertools
+import numpy as np
+
+from pokerguac.poker.components.card import PokerCard
+from pokerguac.poker.components.evaluator import evaluate, hand_ranking
+from pokerguac.poker.components.constants import HandRanking
+from pokerguac.poker.components.omaha import (
+    evaluate_omaha,
+    evaluate_omaha_batch,
+    evaluate_omaha_low,
+    evaluate_omaha_hilo,
+    evaluate_omaha_hilo_batch,
+    NUM_LOW_STRENGTHS,
+    rank_omaha_hands,
+    rank_omaha_hands_batch,
+)
+
+
+def to_codes(symbols: str):
+    return [PokerCard.from_symbol(symbol).code for symbol in symbols.split()]
+
+
+def brute_force_omaha(board, hole):
+    return max(
+        evaluate(list(hole_cards) + list(board_cards))
+        for hole_cards in itertools.combinations(hole, 2)
+        for board_cards in itertools.combinations(board, 3)
+    )
+
+
+class TestOmahaEvaluator(unittest.TestCase):
+    def test_exactly_two_hole_cards(self):
+        board = to_codes("as ks qs js 2d")
+        # A single hole card cannot complete the royal flush or the straight
+        self.assertEqual(
+            hand_ranking(evaluate_omaha(board, to_codes("ts 3c 4d 7h"))),
+            HandRanking.HIGH,
+        )
+        self.assertEqual(
+            hand_ranking(evaluate_omaha(board, to_codes("ts 9s 4d 7h"))),
+            HandRanking.STRAIGHTFLUSH,
+        )
+        # Four of a kind on the board plays only one of its cards
+        board = to_codes("9c 9d 9h 9s 2c")
+        self.assertEqual(
+            hand_ranking(evaluate_omaha(board, to_codes("ac kd 3h 4s"))),
+            HandRanking.TRIPS,
+        )
+        # Three of a kind in the hole only plays as a pair
+        board = to_codes("2c 7d jh 4s 3c")
+        self.assertEqual(
+            hand_ranking(evaluate_omaha(board, to_codes("ac ad ah ks"))),
+            HandRanking.PAIR,
+        )
+        self.assertEqual(
+            hand_ranking(evaluate_omaha(board, to_codes("5c 6c kh ks"))),
+            HandRanking.STRAIGHT,
+        )
+
+    def test_random_hands(self):
+        rng = np.random.default_rng(11)
+        for num_board_cards in [3, 4, 5]:
+            boards, holes = [], []
+            for _ in range(100):
+                cards = [
+                    int(code) for code in rng.choice(52, num_board_cards + 12, False)
+                ]
+                board = cards[:num_board_cards]
+                hands = [cards[num_board_cards + 4 * i :][:4] for i in range(3)]
+                for hole in hands:
+                    self.assertEqual(
+                        evaluate_omaha(board, hole), brute_force_omaha(board, hole)
+                    )
+                boards.append(board)
+                holes.append(hands)
+            strengths = evaluate_omaha_batch(np.array(boards), np.array(holes))
+            for i, (board, hands) in enumerate(zip(boards, holes)):
+                for j, hole in enumerate(hands):
+                    self.assertEqual(strengths[i, j], brute_force_omaha(board, hole))
+
+    def test_flushes(self):
+        rng = np.random.default_rng(12)
+        for _ in range(300):
+            suit = int(rng.integers(4))
+            suited = [int(rank) * 4 + suit for rank in rng.choice(13, 6, False)]
+            others = [code for code in range(52) if code & 3 != suit]
+            rest = [int(code) for code in rng.choice(others, 5, False)]
+            board = suited[:3] + rest[:2]
+            hole = suited[3:5] + rest[2:3] + suited[5:6]
+            expected = brute_force_omaha(board, hole)
+            self.assertEqual(evaluate_omaha(board, hole), expected)
+            self.assertEqual(
+                evaluate_omaha_batch(np.array([board]), np.array([[hole]]))[0, 0],
+                expected,
+            )
+
+    def test_rank_omaha_hands(self):
+        board = to_codes("as ks qs 7d 2c")
+        holes = [
+            to_codes("js ts 3c 4c"),  # royal flush
+            to_codes("ad ac 8c 9d"),  # trip aces
+            to_codes("ah ac 8d 9h"),  # same trip aces
+            to_codes("7c 7h 3d 3h"),  # trip sevens
+        ]
+        self.assertEqual(rank_omaha_hands(board, holes), [0, 1, 1, 3])
+        ranks = rank_omaha_hands_batch(np.array([board]), np.array([holes]))
+        self.assertEqual(ranks.tolist(), [[0, 1, 1, 3]])
+
+
+class TestOmahaLowEvaluator(unittest.TestCase):
+    def test_low_hands(self):
+        # 7-4-3-2-A is beaten by the wheel and the five 6 high lows
+        board = to_codes("2c 4d 7h kc qs")
+        self.assertEqual(
+            evaluate_omaha_low(board, to_codes("ac 3d kd ks")), NUM_LOW_STRENGTHS - 6
+        )
+        # Best low is 5-4-3-2-A
+        board = to_codes("2c 4d 5h kc qs")
+        self.assertEqual(
+            evaluate_omaha_low(board, to_codes("ac 3d kd ks")), NUM_LOW_STRENGTHS
+        )
+        # Worst low is 8-7-6-5-4
+        board = to_codes("4c 5d 6h kc qs")
+        self.assertEqual(evaluate_omaha_low(board, to_codes("7c 8d kd ks")), 1)
+        # Needs two different low hole cards and three different low board cards
+        self.assertEqual(evaluate_omaha_low(board, to_codes("7c kd kh ks")), 0)
+        self.assertEqual(evaluate_omaha_low(board, to_codes("7c 7d kh ks")), 0)
+        board = to_codes("4c 4d 6h kc qs")
+        self.assertEqual(evaluate_omaha_low(board, to_codes("ac 2d 3d ks")), 0)
+
+    def test_low_order(self):
+        board = to_codes("2c 4d 7h 8c qs")
+        lows = [
+            evaluate_omaha_low(board, to_codes(hole))
+            for hole in ["ac 3d kd ks", "ac 5d kd ks", "3c 5d kd ks", "ac 6d kd ks"]
+        ]
+        # 7-4-3-2-A < 7-5-4-2-A < 7-5-4-3-2 < 7-6-4-2-A
+        self.assertEqual(lows, sorted(lows, reverse=True))
+        self.assertEqual(len(set(lows)), len(lows))
+
+    def test_hilo_batch(self):
+        rng = np.random.default_rng(13)
+        cards = np.array([rng.choice(52, 21, replace=False) for _ in range(200)])
+        boards, holes = cards[:, :5], cards[:, 5:].reshape(-1, 4, 4)
+        highs, lows = evaluate_omaha_hilo_batch(boards, holes)
+        for i in range(len(cards)):
+            expected_highs, expected_lows = evaluate_omaha_hilo(
+                boards[i].tolist(), holes[i].tolist()
+            )
+            self.assertEqual(highs[i].tolist(), expected_highs)
+            self.assertEqual(lows[i].tolist(), expected_lows)
+            for hole, high in zip(holes[i].tolist(), expected_highs):
+                self.assertEqual(high, brute_force_omaha(boards[i].tolist(), hole))
+
+
+if __name__ == "__main__":
+    unittest.main()
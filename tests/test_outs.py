@@ -0,0 +1,65 @@
+import unittest
+
+from pokerguac.poker.components.card import PokerCard
+from pokerguac.poker.components.constants import HandRanking
+from pokerguac.poker.components.evaluator import evaluate, hand_ranking
+from pokerguac.poker.gto.hand_range import Range
+from pokerguac.poker.gto.outs import compute_outs
+
+
+def to_cards(symbols: str):
+    return [PokerCard.from_symbol(symbol) for symbol in symbols.split()]
+
+
+class TestOuts(unittest.TestCase):
+    def test_flush_draw_outs(self):
+        hole = tuple(to_cards("ah 5h"))
+        board = to_cards("kh 9h 2c") + [None, None]
+        outs = compute_outs(hole, board)  # type: ignore
+        self.assertEqual(len(outs.cards), 47)
+        self.assertEqual(outs.ranking, HandRanking.HIGH)
+        board_codes = [card.code for card in board if card is not None]
+        hole_codes = [card.code for card in hole]
+        for card, ranking in zip(outs.cards, outs.rankings):
+            self.assertEqual(
+                ranking, hand_ranking(evaluate(board_codes + [card.code] + hole_codes))
+            )
+        groups = outs.by_ranking()
+        self.assertEqual(len(groups[HandRanking.FLUSH]), 9)
+        # Non heart aces, fives, kings, nines and deuces make a pair (the board
+        # pairing ones too), a 3 or a 4 does not improve
+        self.assertEqual(len(groups[HandRanking.PAIR]), 14)
+        self.assertEqual(len(outs.improving), 23)
+        # Any heart makes the nut flush a favorite over a random hand
+        hearts = [card for card in outs.cards if card.code % 4 == 2]
+        for card in hearts:
+            self.assertIn(card, outs.favorite)
+
+    def test_turn_equities_against_range(self):
+        hole = tuple(to_cards("jc tc"))
+        board = to_cards("9c 8d 2h 2s") + [None]
+        villain = Range.from_notation("QQ+, 98s")
+        outs = compute_outs(hole, board, villain)  # type: ignore
+        hole_codes = [card.code for card in hole]
+        board_codes = [card.code for card in board if card is not None]
+        for card, equity in zip(outs.cards, outs.equities.tolist()):
+            river_board = board_codes + [card.code]
+            share, total = 0.0, 0.0
+            for villain_hole, weight in villain.holes():
+                villain_codes = [villain_card.code for villain_card in villain_hole]
+                if set(villain_codes) & set(river_board + hole_codes):
+                    continue
+                hero = evaluate(river_board + hole_codes)
+                other = evaluate(river_board + villain_codes)
+                share += weight * ((hero > other) + 0.5 * (hero == other))
+                total += weight
+            self.assertAlmostEqual(equity, share / total)
+        # Straight cards make hero the favorite over the overpairs, blanks do not
+        favorite = {card.code for card in outs.favorite}
+        self.assertIn(PokerCard.from_symbol("qh").code, favorite)
+        self.assertIn(PokerCard.from_symbol("7h").code, favorite)
+        self.assertNotIn(PokerCard.from_symbol("3d").code, favorite)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+
+from pokerguac.poker.components.pot import side_pots, split_pots
+
+
+class TestSidePots(unittest.TestCase):
+    def test_side_pots(self):
+        # Seat 1 is all in for 20, seat 3 folded after betting 10
+        bets = [50, 20, 50, 10]
+        pots = side_pots(bets, [0, 1, 2])
+        self.assertEqual(pots, [(70, [0, 1, 2]), (60, [0, 2])])
+
+    def test_folded_excess(self):
+        pots = side_pots([10, 10, 30], [0, 1])
+        self.assertEqual(pots, [(50, [0, 1])])
+
+    def test_matches_bet_levels(self):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            num_seats = int(rng.integers(2, 10))
+            bets = rng.integers(0, 6, size=num_seats).tolist()
+            contenders = sorted(
+                rng.choice(num_seats, rng.integers(1, num_seats + 1), replace=False)
+            )
+            pots = side_pots(bets, contenders)
+            self.assertEqual(sum(pot.amount for pot in pots), sum(bets))
+            levels = sorted(set(bets[seat] for seat in contenders))
+            for level, pot in zip(levels, pots):
+                self.assertEqual(
+                    pot.eligible, [seat for seat in contenders if bets[seat] >= level]
+                )
+
+
+class TestSplitPots(unittest.TestCase):
+    def test_high_only(self):
+        bets = [50, 20, 50, 10]
+        payouts = split_pots(bets, {0: 100, 1: 300, 2: 200})
+        np.testing.assert_array_equal(payouts, [0, 70, 60, 0])
+        payouts = split_pots(bets, {0: 300, 1: 300, 2: 200})
+        np.testing.assert_array_equal(payouts, [95, 35, 0, 0])
+
+    def test_hilo_halves_and_quarters(self):
+        bets = [40, 40, 40]
+        payouts = split_pots(bets, {0: 500, 1: 100, 2: 90}, {0: 0, 1: 10, 2: 20})
+        np.testing.assert_array_equal(payouts, [60, 0, 60])
+        # Tied lows split the low half into quarters
+        payouts = split_pots(bets, {0: 500, 1: 100, 2: 90}, {0: 0, 1: 20, 2: 20})
+        np.testing.assert_array_equal(payouts, [60, 30, 30])
+        # No low, high scoops
+        payouts = split_pots(bets, {0: 500, 1: 100, 2: 90}, {0: 0, 1: 0, 2: 0})
+        np.testing.assert_array_equal(payouts, [120, 0, 0])
+
+    def test_hilo_side_pot(self):
+        # Seat 2 is all in for 10 with the only low
+        bets = [30, 30, 10]
+        payouts = split_pots(bets, {0: 500, 1: 100, 2: 90}, {0: 0, 1: 0, 2: 20})
+        np.testing.assert_array_equal(payouts, [55, 0, 15])
+        self.assertEqual(payouts.sum(), sum(bets))
+
+    def test_odd_chips(self):
+        # 25 chips split three ways, the odd chips go to the first seats left of
+        # the button
+        bets = [5, 5, 5, 5, 5]
+        strengths = {0: 100, 1: 300, 3: 300, 4: 300}
+        payouts = split_pots(bets, strengths, seat_order=[3, 4, 0, 1, 2])
+        np.testing.assert_array_equal(payouts, [0, 8, 0, 9, 8])
+        payouts = split_pots(bets, strengths)
+        np.testing.assert_array_equal(payouts, [0, 9, 0, 8, 8])
+        self.assertEqual(payouts.dtype, np.int64)
+
+    def test_hilo_odd_chip(self):
+        # The high half takes the odd chip of an odd pot
+        payouts = split_pots([7, 7, 7], {0: 500, 1: 100, 2: 90}, {0: 0, 1: 0, 2: 20})
+        np.testing.assert_array_equal(payouts, [11, 0, 10])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from typing import List
+
+from pokerguac.poker.components.card import PokerCard, PokerHole, PokerBoard
+from pokerguac.poker.gto.isomorphism import NUM_PREFLOP_CLASSES, preflop_index
+from pokerguac.poker.gto.preflop_equity import (
+    _matchup_holes,
+    load_preflop_equity,
+    MAX_NUM_OPPONENTS,
+    preflop_equity,
+    preflop_matchup_equity,
+)
+from pokerguac.poker.gto.probabilities import estimate_hand_strength
+
+
+def to_cards(symbols: str) -> List[PokerCard]:
+    return [PokerCard.from_symbol(symbol) for symbol in symbols.split()]
+
+
+def to_hole(symbols: str) -> PokerHole:
+    first, second = to_cards(symbols)
+    return first, second
+
+
+class TestPreflopEquity(unittest.TestCase):
+    def test_table(self):
+        table = load_preflop_equity()
+        heads_up, vs_random = table["heads_up"], table["vs_random"]
+        self.assertEqual(heads_up.shape, (NUM_PREFLOP_CLASSES, NUM_PREFLOP_CLASSES))
+        self.assertEqual(vs_random.shape, (NUM_PREFLOP_CLASSES, MAX_NUM_OPPONENTS))
+        self.assertTrue(np.allclose(heads_up + heads_up.T, 1))
+        # Equity drops with every additional opponent
+        self.assertTrue(np.all(np.diff(vs_random, axis=1) < 0))
+        # Against one random hand is the combo weighted average of the matchups
+        num_matchups = np.array(
+            [
+                [
+                    len(_matchup_holes(index, villain))
+                    for villain in range(NUM_PREFLOP_CLASSES)
+                ]
+                for index in range(NUM_PREFLOP_CLASSES)
+            ]
+        )
+        expected = (heads_up * num_matchups).sum(axis=1) / num_matchups.sum(axis=1)
+        self.assertTrue(np.allclose(vs_random[:, 0], expected, atol=0.005))
+
+    def test_lookup(self):
+        aces, kings = to_hole("ah as"), to_hole("kd kc")
+        self.assertAlmostEqual(preflop_matchup_equity(aces, kings), 0.82, delta=0.01)
+        self.assertAlmostEqual(
+            preflop_matchup_equity(aces, kings) + preflop_matchup_equity(kings, aces),
+            1,
+        )
+        preflop: PokerBoard = [None] * 5
+        for symbols in ["ah kh", "7c 2d", "9s 9d"]:
+            hole = to_hole(symbols)
+            estimate = estimate_hand_strength(
+                hole, preflop, max_samples=1 << 16, seed=5
+            )
+            low, high = estimate.confidence_interval(z=4)
+            self.assertTrue(low - 0.005 <= preflop_equity(hole) <= high + 0.005)
+        self.assertEqual(
+            preflop_equity(to_hole("ah kh"), 3),
+            load_preflop_equity()["vs_random"][preflop_index([50, 46]), 2],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
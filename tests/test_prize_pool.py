@@ -0,0 +1,31 @@
+import unittest
+
+from pokerguac.manager.blind_manager import HandBlindManager
+from pokerguac.manager.prize_pool import get_prize_pool, split_by_largest_remainder
+
+
+class TestPrizePool(unittest.TestCase):
+    def test_largest_remainder(self):
+        self.assertEqual(split_by_largest_remainder(10, [1, 1, 1]), [4, 3, 3])
+        self.assertEqual(split_by_largest_remainder(10, [0.5, 0.3, 0.2]), [5, 3, 2])
+        self.assertEqual(split_by_largest_remainder(7, [2, 1, 1]), [3, 2, 2])
+
+    def test_prizes_are_exact_chips(self):
+        for total_prize_pool in [1350, 9999, 100000, 123457]:
+            prizes = get_prize_pool(total_prize_pool, 100, 50)
+            self.assertTrue(all(isinstance(prize, int) for prize in prizes))
+            self.assertEqual(sum(prizes), total_prize_pool)
+            self.assertEqual(prizes, sorted(prizes, reverse=True))
+
+    def test_blinds_are_chips(self):
+        blind_manager = HandBlindManager(100, 9, 10)
+        for _ in range(10):
+            big_blind, small_blind = blind_manager.next_blind()
+            blind_manager.update_blind()
+            self.assertIsInstance(blind_manager.blind, int)
+            self.assertEqual(blind_manager.blind, big_blind)
+            self.assertEqual(small_blind, big_blind // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
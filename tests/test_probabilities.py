@@ -0,0 +1,219 @@
+import unittest
+import itertools
+import numpy as np
+from typing import List
+
+from pokerguac.poker.components.card import PokerCard, PokerHole, PokerBoard
+from pokerguac.poker.components.evaluator import evaluate
+from pokerguac.poker.gto.hand_range import Range
+from pokerguac.poker.gto.probabilities import (
+    compute_hand_strength,
+    compute_multiway_equity,
+    estimate_hand_strength,
+)
+
+
+def to_cards(symbols: str) -> List[PokerCard]:
+    return [PokerCard.from_symbol(symbol) for symbol in symbols.split()]
+
+
+def to_hole(symbols: str) -> PokerHole:
+    first, second = to_cards(symbols)
+    return first, second
+
+
+def to_board(symbols: str = "") -> PokerBoard:
+    board: PokerBoard = list(to_cards(symbols))
+    return board + [None] * (5 - len(board))
+
+
+def brute_force_hand_strength(hole, board):
+    hole_codes = [card.code for card in hole]
+    board_codes = [card.code for card in board if card is not None]
+    remain = [code for code in range(52) if code not in hole_codes + board_codes]
+    wins, draws, losses = 0, 0, 0
+    for runout in itertools.combinations(remain, 5 - len(board_codes)):
+        simul_board = board_codes + list(runout)
+        my_strength = evaluate(simul_board + hole_codes)
+        villain_cards = [code for code in remain if code not in runout]
+        for villain_hole in itertools.combinations(villain_cards, 2):
+            villain_strength = evaluate(simul_board + list(villain_hole))
+            wins += my_strength > villain_strength
+            draws += my_strength == villain_strength
+            losses += my_strength < villain_strength
+    num_cases = wins + draws + losses
+    return wins / num_cases, draws / num_cases, losses / num_cases
+
+
+class TestProbabilities(unittest.TestCase):
+    def test_compute_hand_strength(self):
+        hole = to_hole("ah kh")
+        for board in [to_board("2h 7h 9c td 2d"), to_board("2h 7h 9c td")]:
+            expected = brute_force_hand_strength(hole, board)
+            result = compute_hand_strength(hole, board)
+            for prob, expected_prob in zip(result, expected):
+                self.assertAlmostEqual(prob, expected_prob)
+            self.assertAlmostEqual(sum(result), 1)
+
+    def test_parallel_hand_strength(self):
+        hole = to_hole("qc jc")
+        for board in [
+            to_board("2h 7h 9c"),
+            to_board("2h 7h 9c td"),
+        ]:
+            self.assertEqual(
+                compute_hand_strength(hole, board, num_workers=2),
+                compute_hand_strength(hole, board),
+            )
+
+    def test_estimate_hand_strength(self):
+        hole = to_hole("ah kh")
+        board = to_board("2h 7h 9c")
+        exact = compute_hand_strength(hole, board)
+        estimate = estimate_hand_strength(hole, board, max_samples=100000, seed=3)
+        self.assertEqual(estimate.num_samples, 100000)
+        for value, exact_prob in zip(["win", "draw", "loss"], exact):
+            low, high = estimate.confidence_interval(value, z=4)
+            self.assertTrue(low <= exact_prob <= high, (value, exact_prob, low, high))
+        low, high = estimate.confidence_interval(z=4)
+        self.assertTrue(low <= exact[0] + exact[1] / 2 <= high)
+        # Same seed, same samples
+        self.assertEqual(
+            estimate,
+            estimate_hand_strength(hole, board, max_samples=100000, seed=3),
+        )
+
+    def test_estimate_early_stopping(self):
+        hole = to_hole("7c 2d")
+        board = to_board()
+        estimate = estimate_hand_strength(hole, board, target_std_error=0.01, seed=4)
+        self.assertLessEqual(estimate.equity_std_error, 0.01)
+        self.assertLess(estimate.num_samples, 10000)
+        self.assertAlmostEqual(estimate.equity, 0.35, delta=0.04)
+
+    def test_estimate_sampling_methods(self):
+        hole = to_hole("ah kh")
+        board = to_board("2h 7h 9c")
+        win, draw, _ = compute_hand_strength(hole, board)
+        for method in ["stratified", "quasi"]:
+            estimate = estimate_hand_strength(
+                hole, board, max_samples=20000, seed=5, method=method
+            )
+            self.assertEqual(estimate.num_samples, 20000)
+            low, high = estimate.confidence_interval(z=4)
+            self.assertTrue(low <= win + draw / 2 <= high, (method, low, high))
+            low, high = estimate.confidence_interval("win", z=4)
+            self.assertTrue(low <= win <= high, (method, low, high))
+            self.assertEqual(
+                estimate,
+                estimate_hand_strength(
+                    hole, board, max_samples=20000, seed=5, method=method
+                ),
+            )
+        # Preflop (AKs wins 67.0% against a random hand) and river deals
+        estimate = estimate_hand_strength(
+            hole, to_board(), max_samples=20000, seed=6, method="quasi"
+        )
+        self.assertAlmostEqual(estimate.equity, 0.670, delta=0.02)
+        board = to_board("2h 7h 9c td 2d")
+        win, draw, _ = compute_hand_strength(hole, board)
+        estimate = estimate_hand_strength(
+            hole, board, max_samples=20000, seed=6, method="quasi"
+        )
+        self.assertAlmostEqual(
+            estimate.equity, win + draw / 2, delta=4 * estimate.equity_std_error
+        )
+
+    def test_sampling_variance_benchmark(self):
+        # Drawing hand on the turn: squared error of 40 estimates per method
+        hole = to_hole("7c 6c")
+        board = to_board("8d 9s kh 2c")
+        win, draw, _ = compute_hand_strength(hole, board)
+        squared_errors = {}
+        for method in ["random", "stratified", "quasi"]:
+            squared_errors[method] = np.mean(
+                [
+                    (
+                        estimate_hand_strength(
+                            hole, board, max_samples=4096, seed=seed, method=method
+                        ).equity
+                        - win
+                        - draw / 2
+                    )
+                    ** 2
+                    for seed in range(40)
+                ]
+            )
+        self.assertLess(squared_errors["stratified"], squared_errors["random"] / 1.5)
+        self.assertLess(squared_errors["quasi"], squared_errors["random"] / 2)
+        # Same target precision with fewer evaluations
+        num_samples = {
+            method: estimate_hand_strength(
+                hole,
+                board,
+                target_std_error=0.002,
+                batch_size=1024,
+                min_samples=8192,
+                seed=7,
+                method=method,
+            ).num_samples
+            for method in ["random", "quasi"]
+        }
+        self.assertLess(num_samples["quasi"], num_samples["random"] / 2)
+
+    def test_multiway_equity(self):
+        hole = to_hole("ah kh")
+        board = to_board("2h 7h 9c td")
+        win, draw, _ = compute_hand_strength(hole, board)
+        heads_up = compute_multiway_equity(hole, board, num_opponents=1)
+        self.assertTrue(heads_up.exact)
+        self.assertAlmostEqual(heads_up.equity, win + draw / 2)
+
+        # Brute force pot shares against two small ranges
+        ranges = [Range.from_notation("QQ+, 99"), Range.from_notation("AQs+, JTs")]
+        hole_codes = [card.code for card in hole]
+        board_codes = [card.code for card in board if card is not None]
+        total_share, num_deals = 0.0, 0
+        for first, _ in ranges[0].holes():
+            for second, _ in ranges[1].holes():
+                villains = [
+                    [card.code for card in first],
+                    [card.code for card in second],
+                ]
+                for river in range(52):
+                    cards = (
+                        hole_codes + board_codes + villains[0] + villains[1] + [river]
+                    )
+                    if len(set(cards)) < len(cards):
+                        continue
+                    strengths = [
+                        evaluate(board_codes + [river] + codes)
+                        for codes in [hole_codes] + villains
+                    ]
+                    if strengths[0] == max(strengths):
+                        total_share += 1 / strengths.count(strengths[0])
+                    num_deals += 1
+        exact = compute_multiway_equity(hole, board, villain_ranges=ranges)
+        self.assertTrue(exact.exact)
+        self.assertAlmostEqual(exact.equity, total_share / num_deals)
+
+        # Sampled estimates agree within their error bound
+        for kwargs, expected in [
+            (dict(villain_ranges=ranges), exact.equity),
+            (
+                dict(num_opponents=2),
+                compute_multiway_equity(hole, board, num_opponents=2).equity,
+            ),
+        ]:
+            sampled = compute_multiway_equity(
+                hole, board, max_exact_cases=0, seed=6, **kwargs
+            )
+            self.assertFalse(sampled.exact)
+            self.assertLessEqual(sampled.std_error, 0.5 / np.sqrt(sampled.num_cases))
+            self.assertAlmostEqual(
+                sampled.equity, expected, delta=4 * sampled.std_error
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
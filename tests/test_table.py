@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+
+from pokerguac.poker import (
+    ALL_AGENT_TYPES,
+    PokerGameType,
+    poker_cache_game_init,
+)
+from pokerguac.poker.components.seat_state import SeatState
+from pokerguac.poker.components.constants import (
+    MAX_NUM_PLAYERS,
+    MIN_NUM_PLAYERS,
+    PokerTableState,
+)
+
+
+NUM_TEST_HANDS = 100
+
+
+def _play_hand_steps(game_type: PokerGameType = PokerGameType.HOLDEM):
+    """
+    Yield a freshly activated table after every step of its first hand
+    """
+    num_players = np.random.randint(MIN_NUM_PLAYERS, MAX_NUM_PLAYERS + 1)
+    table, players = poker_cache_game_init(
+        [f"player{i}" for i in range(num_players)],
+        np.random.randint(100, 900, size=num_players).tolist(),
+        list(np.random.choice(ALL_AGENT_TYPES, num_players, replace=True)),
+        num_players,
+        game_type=game_type,
+    )
+    for player in players:
+        player.join_next_hand()
+    table.activate_table()
+    while True:
+        end_round = table.state == PokerTableState.END_ROUND
+        table.step()
+        yield table
+        if end_round:
+            break
+
+
+class TestTableBets(unittest.TestCase):
+    def test_running_bets(self):
+        for _ in range(NUM_TEST_HANDS):
+            for table in _play_hand_steps():
+                per_player_bet = table.action_log.per_player_bet(table.num_players)
+                np.testing.assert_array_equal(table.per_player_bet, per_player_bet)
+                self.assertEqual(table.get_pot_size(), per_player_bet.sum())
+                self.assertEqual(table.max_bet, per_player_bet.max())
+                np.testing.assert_array_equal(
+                    table.per_stage_bet,
+                    table.action_log.per_stage_bet(table.num_players),
+                )
+
+    def test_seat_state(self):
+        for _ in range(NUM_TEST_HANDS):
+            for table in _play_hand_steps():
+                seated = [player for player in table.players if player is not None]
+                self.assertEqual(
+                    table.get_num_empty_seats(), table.num_players - len(seated)
+                )
+                self.assertEqual(
+                    table.get_num_active_players(),
+                    sum(player.is_active() for player in seated),
+                )
+                self.assertEqual(
+                    table.get_num_alive_players(),
+                    sum(player.is_alive() for player in seated),
+                )
+                self.assertEqual(
+                    table.get_num_hand_players(),
+                    sum(player.is_joining() for player in seated),
+                )
+                self.assertEqual(
+                    table.get_num_living_players(),
+                    sum(not player.is_eliminated() for player in seated),
+                )
+
+    def test_next_seat(self):
+        seat_state = SeatState(6)
+        bits = 0b100101
+        self.assertEqual(list(SeatState.seats(bits)), [0, 2, 5])
+        self.assertEqual(seat_state.next_seat(bits, 0), 2)
+        self.assertEqual(seat_state.next_seat(bits, 3), 5)
+        self.assertEqual(seat_state.next_seat(bits, 5), 0)
+        self.assertEqual(seat_state.next_seat(0b100, 2), 2)
+        self.assertIsNone(seat_state.next_seat(0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
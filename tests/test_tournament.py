@@ -74,15 +74,12 @@ class TestTournament(unittest.TestCase):
                 after_total_bank_roll = 0
                 for player in players:
                     after_total_bank_roll += player.bank_roll + player.stack
-                self.assertTrue(
-                    np.allclose(before_total_bank_roll, after_total_bank_roll),
-                    (before_total_bank_roll, after_total_bank_roll),
-                )
+                self.assertEqual(before_total_bank_roll, after_total_bank_roll)
                 table_net_profit = 0
                 for player in players:
                     table_net_profit += player.net_profit()
                 # Check if zero-sum game
-                self.assertTrue(np.isclose(table_net_profit, 0))
+                self.assertEqual(table_net_profit, 0)
                 iter += 1
 
             if epoch % self.report_period == 0: